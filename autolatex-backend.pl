@@ -27,6 +27,7 @@ use File::Spec ;
 use File::Temp qw/ :POSIX / ;
 use Config::Simple;
 use Carp;
+use JSON::PP;
 
 #------------------------------------------------------
 #
@@ -74,18 +75,53 @@ use AutoLaTeX::Core::IntUtils;
 push @INC, File::Spec->catfile(getUserConfigDirectory(),"translators");
 
 
+# Marker that is closing a block of data in the server mode.
+my $SERVER_END_MARKER = '<<<<end>>>>';
+
+# Marker that is starting a part of the output of the 'get bundle' command.
+my $BUNDLE_PART_MARKER = '<<<<part>>>>';
+
+# Indicates if the backend is running in server mode.
+my $isServerMode = 0;
+
+# Data of the current command that was read from STDIN in server mode.
+my $serverInput = undef;
+
+my %currentConfiguration = ();
+my %systemConfiguration = ();
+my %userConfiguration = ();
+my %projectConfiguration = ();
+my @projectConfigurationPath = ();
+
 sub killMe($) {
+	if ($isServerMode) {
+		die($_[0]."\n");
+	}
 	print STDERR $_[0]."\n";
 	exit(255);
 }
 
+# Read the raw data from STDIN. In server mode,
+# the data is terminated by the end marker.
+sub readStdinText() {
+	if (defined($serverInput)) {
+		my $text = $serverInput;
+		$serverInput = undef;
+		return $text;
+	}
+	my $text = '';
+	while (my $line = <STDIN>) {
+		last if ($isServerMode && $line =~ /^\Q$SERVER_END_MARKER\E\s*$/);
+		$text .= $line;
+	}
+	return $text;
+}
+
 sub readStdin() {
 	my $tmpfile = tmpnam();
 	local *OUTFILE;
 	open(*OUTFILE, ">$tmpfile") or killMe("$tmpfile: $!");
-	while (my $line = <STDIN>) {
-		print OUTFILE $line;
-	}
+	print OUTFILE readStdinText();
 	close(*OUTFILE);
 	my $cfgReader = new Config::Simple("$tmpfile");
 	my %cfg = $cfgReader->vars();
@@ -114,327 +150,510 @@ sub printComment($$) {
 	print STDERR "$text\n\n";
 }
 
-setDebugLevel(0);
-
-initTextDomain('autolatex', File::Spec->catfile(getAutoLaTeXDir(), 'po'), 'UTF-8');
+# Read the configurations from the files.
+# This function is invoked for each command, so that
+# a server always replies up-to-date data.
+sub loadConfigurations() {
+	local @ARGV = ();
 
-my %currentConfiguration = mainProgram(0);
+	%currentConfiguration = mainProgram(0);
 
-my %systemConfiguration = readOnlySystemConfiguration();
-my %userConfiguration = readOnlyUserConfiguration();
-my %projectConfiguration = ();
-my @projectConfigurationPath = ();
+	%systemConfiguration = readOnlySystemConfiguration();
+	%userConfiguration = readOnlyUserConfiguration();
+	%projectConfiguration = ();
+	@projectConfigurationPath = ();
 
-if ($currentConfiguration{'__private__'}{'input.project directory'}) {
-	@projectConfigurationPath = File::Spec->splitdir($currentConfiguration{'__private__'}{'input.project directory'});
-	my $cfg = readOnlyProjectConfiguration(@projectConfigurationPath);
-	if ($cfg && isHash($cfg)) {
-		%projectConfiguration = %{$cfg};
+	if ($currentConfiguration{'__private__'}{'input.project directory'}) {
+		@projectConfigurationPath = File::Spec->splitdir($currentConfiguration{'__private__'}{'input.project directory'});
+		my $cfg = readOnlyProjectConfiguration(@projectConfigurationPath);
+		if ($cfg && isHash($cfg)) {
+			%projectConfiguration = %{$cfg};
+		}
 	}
 }
 
-my $a1 = $ARGV[0] || '';
-my $a2 = $ARGV[1] || '';
-my $a3 = $ARGV[2] || '';
-my $a4 = $ARGV[3] || '';
-
-if ($a1 eq 'get') {
-	if ($a2 eq 'config') {
-		my $tmpfile = tmpnam();
-		my %cfgOutput = ();
-		my %cfgInhOutput = ();
-		if ($a3 eq 'project') {
-			%cfgOutput = %projectConfiguration;
-			%cfgInhOutput = %systemConfiguration;
-			while (my ($k,$v) = each(%userConfiguration)) {
-				$cfgInhOutput{$k} = $v;
+# Convert a configuration into a data structure for JSON,
+# in which the values are grouped by section.
+sub configToJson(\%) {
+	my $cfg = shift;
+	my %json = ();
+	while (my ($attr, $value) = each(%{$cfg})) {
+		if ($value && $attr ne '__private__') {
+			$value = AutoLaTeX::Core::Config::serializeConfigValue($attr, $value);
+			if ($value) {
+				my ($section, $key) = ('default', $attr);
+				if ($attr =~ /^([^.]+)\.(.+)$/) {
+					($section, $key) = ($1, $2);
+				}
+				$json{$section}{$key} = "$value";
 			}
 		}
-		elsif ($a3 eq 'user') {
-			%cfgOutput = %userConfiguration;
-			%cfgInhOutput = %systemConfiguration;
-		}
-		elsif ($a3 eq 'system') {
-			%cfgOutput = %systemConfiguration;
-		}
-		elsif (!$a3 || $a3 eq 'all') {
-			# Reinject the main file because it was removed by the reading functions.
-			if ($projectConfiguration{'generation.main file'}) {
-				$currentConfiguration{'generation.main file'} = $projectConfiguration{'generation.main file'};
-			}
-			%cfgOutput = %currentConfiguration;
+	}
+	return \%json;
+}
+
+# Output the given data structure with the JSON format.
+sub printJson($) {
+	my $json = JSON::PP->new->canonical(1);
+	print STDOUT $json->encode($_[0])."\n";
+}
+
+sub getConfig($$$) {
+	my $a3 = shift;
+	my $a4 = shift;
+	my $format = shift;
+	my %cfgOutput = ();
+	my %cfgInhOutput = ();
+	if ($a3 eq 'project') {
+		%cfgOutput = %projectConfiguration;
+		%cfgInhOutput = %systemConfiguration;
+		while (my ($k,$v) = each(%userConfiguration)) {
+			$cfgInhOutput{$k} = $v;
 		}
-		else {
-			killMe("illegal command line");
+	}
+	elsif ($a3 eq 'user') {
+		%cfgOutput = %userConfiguration;
+		%cfgInhOutput = %systemConfiguration;
+	}
+	elsif ($a3 eq 'system') {
+		%cfgOutput = %systemConfiguration;
+	}
+	elsif (!$a3 || $a3 eq 'all') {
+		# Reinject the main file because it was removed by the reading functions.
+		if ($projectConfiguration{'generation.main file'}) {
+			$currentConfiguration{'generation.main file'} = $projectConfiguration{'generation.main file'};
 		}
-		if ($a4) {
-			if ($a4 eq '__private__') {
-				%cfgOutput =  %{$cfgOutput{'__private__'}};
-				if ($cfgOutput{'internationalization'}) {
-					$cfgOutput{'internationalization.locale'} = $cfgOutput{'internationalization'}{'locale'} || '';
-					$cfgOutput{'internationalization.language'} = $cfgOutput{'internationalization'}{'language'} || '';
-					$cfgOutput{'internationalization.codeset'} = $cfgOutput{'internationalization'}{'codeset'} || '';
-					$cfgOutput{'internationalization.domains'} = join(',',@{$cfgOutput{'internationalization'}{'domains'}});
-					delete $cfgOutput{'internationalization'}
-				}
-				foreach my $k (keys %cfgOutput) {
-					unless (defined($cfgOutput{$k})) {
-						$cfgOutput{$k} = ''
-					}
-				}
-				while (my ($k,$v) = each(%cfgInhOutput)) {
-					$cfgOutput{"$k\_INHERITED"} = $v; 
-				}
+		%cfgOutput = %currentConfiguration;
+	}
+	else {
+		killMe("illegal command line");
+	}
+	if ($a4) {
+		if ($a4 eq '__private__') {
+			%cfgOutput =  %{$cfgOutput{'__private__'}};
+			if ($cfgOutput{'internationalization'}) {
+				$cfgOutput{'internationalization.locale'} = $cfgOutput{'internationalization'}{'locale'} || '';
+				$cfgOutput{'internationalization.language'} = $cfgOutput{'internationalization'}{'language'} || '';
+				$cfgOutput{'internationalization.codeset'} = $cfgOutput{'internationalization'}{'codeset'} || '';
+				$cfgOutput{'internationalization.domains'} = join(',',@{$cfgOutput{'internationalization'}{'domains'}});
+				delete $cfgOutput{'internationalization'}
 			}
-			else {
-				foreach my $k (keys %cfgOutput) {
-					if ($k !~ /^\Q$a4.\E/) {
-						delete $cfgOutput{$k};
-					}
-				}
-				while (my ($k,$v) = each(%cfgInhOutput)) {
-					if ($k =~ /^\Q$a4.\E/) {
-						$cfgOutput{"$k\_INHERITED"} = $v; 
-					}
+			foreach my $k (keys %cfgOutput) {
+				unless (defined($cfgOutput{$k})) {
+					$cfgOutput{$k} = ''
 				}
 			}
-		}
-		else {
 			while (my ($k,$v) = each(%cfgInhOutput)) {
 				$cfgOutput{"$k\_INHERITED"} = $v; 
 			}
 		}
-		writeConfigFile($tmpfile, %cfgOutput, 0);
-		local *INFILE;
-		open(*INFILE, "<$tmpfile") or killMe("$tmpfile: $!");
-		while (my $line = <INFILE>) {
-			print STDOUT $line;
-		}
-		close(*INFILE);
-		unlink("$tmpfile");
-	}
-	elsif ($a2 eq 'translators') {
-		my %translators = getTranslatorList(%currentConfiguration);
-		my @keys = sort keys %translators;
-		foreach my $name (@keys) {
-			my $v = $translators{$name};
-			print STDOUT "[$name]\n";
-			while (my ($k, $kv) = each(%{$v})) {
-				print STDOUT "$k=$kv\n";
+		else {
+			foreach my $k (keys %cfgOutput) {
+				if ($k !~ /^\Q$a4.\E/) {
+					delete $cfgOutput{$k};
+				}
+			}
+			while (my ($k,$v) = each(%cfgInhOutput)) {
+				if ($k =~ /^\Q$a4.\E/) {
+					$cfgOutput{"$k\_INHERITED"} = $v; 
+				}
 			}
-			print STDOUT "\n";
 		}
 	}
-	elsif ($a2 eq 'conflicts') {
-		my %translators = getTranslatorList(%currentConfiguration);
-		if ($a3 eq 'resolved') {
-			setInclusionFlags(%translators,
-					%systemConfiguration,
-					%userConfiguration,
-					%projectConfiguration);
-		}
-		elsif ($a3) {
-			killMe("illegal command line");
+	else {
+		while (my ($k,$v) = each(%cfgInhOutput)) {
+			$cfgOutput{"$k\_INHERITED"} = $v; 
 		}
-		my %conflicts = detectConflicts(%translators);
-		foreach my $k (keys %conflicts) {
-			print STDOUT "[$k]\n";
-			foreach my $source (keys %{$conflicts{$k}}) {
-				foreach my $t (keys %{$conflicts{$k}{$source}}) {
-					print STDOUT "$source=$t\n";
-				}
-			}
-			print STDOUT "\n";
+	}
+	if ($format eq 'json') {
+		return configToJson(%cfgOutput);
+	}
+	my $tmpfile = tmpnam();
+	writeConfigFile($tmpfile, %cfgOutput, 0);
+	local *INFILE;
+	open(*INFILE, "<$tmpfile") or killMe("$tmpfile: $!");
+	while (my $line = <INFILE>) {
+		print STDOUT $line;
+	}
+	close(*INFILE);
+	unlink("$tmpfile");
+	return undef;
+}
+
+sub getTranslators($) {
+	my $format = shift;
+	my %translators = getTranslatorList(%currentConfiguration);
+	if ($format eq 'json') {
+		return \%translators;
+	}
+	my @keys = sort keys %translators;
+	foreach my $name (@keys) {
+		my $v = $translators{$name};
+		print STDOUT "[$name]\n";
+		while (my ($k, $kv) = each(%{$v})) {
+			print STDOUT "$k=$kv\n";
 		}
+		print STDOUT "\n";
 	}
-	elsif ($a2 eq 'loads') {
-		my %translators = getTranslatorList(%currentConfiguration);
+	return undef;
+}
 
+sub getConflicts($$) {
+	my $a3 = shift;
+	my $format = shift;
+	my %translators = getTranslatorList(%currentConfiguration);
+	if ($a3 eq 'resolved') {
 		setInclusionFlags(%translators,
 				%systemConfiguration,
 				%userConfiguration,
 				%projectConfiguration);
+	}
+	elsif ($a3) {
+		killMe("illegal command line");
+	}
+	my %conflicts = detectConflicts(%translators);
+	if ($format eq 'json') {
+		my %json = ();
+		foreach my $k (keys %conflicts) {
+			foreach my $source (keys %{$conflicts{$k}}) {
+				$json{$k}{$source} = [ sort keys %{$conflicts{$k}{$source}} ];
+			}
+		}
+		return \%json;
+	}
+	foreach my $k (keys %conflicts) {
+		print STDOUT "[$k]\n";
+		foreach my $source (keys %{$conflicts{$k}}) {
+			foreach my $t (keys %{$conflicts{$k}{$source}}) {
+				print STDOUT "$source=$t\n";
+			}
+		}
+		print STDOUT "\n";
+	}
+	return undef;
+}
+
+sub getLoads($) {
+	my $format = shift;
+	my %translators = getTranslatorList(%currentConfiguration);
+
+	setInclusionFlags(%translators,
+			%systemConfiguration,
+			%userConfiguration,
+			%projectConfiguration);
 
+	if ($format eq 'json') {
+		my %json = ();
 		foreach my $level (@ALL_LEVELS) {
-			print STDOUT "[$level]\n";
+			$json{$level} = {};
 			while (my ($transName,$data) = each(%translators)) {
 				if (defined($data->{'included'}{$level})) {
-					my $val = cfgToBoolean($data->{'included'}{$level});
-					print STDOUT "$transName=$val\n";
+					$json{$level}{$transName} = ($data->{'included'}{$level} ? JSON::PP::true : JSON::PP::false);
 				}
 			}
-			print STDOUT "\n";
-		}
-	}
-	elsif ($a2 eq 'images') {
-		my %autolatexData = ();
-		loadTranslatorsFromConfiguration(%currentConfiguration,%autolatexData);
-		loadTranslatableImageList(%currentConfiguration,%autolatexData,1);
-		# Convert 'files to convert' from scalar to array
-		my $separator = getPathListSeparator();
-		my %files_to_convert = ();
-		foreach my $key (keys %currentConfiguration) {
-			if ($key =~ /^(.+)\.files\s+to\s+convert$/) {
-				my $trans = $1;
-				my @f = split(/\s*\Q$separator\E\s*/, $currentConfiguration{$key});
-				foreach my $f (@f) {
-					$f = File::Spec->rel2abs($f, $currentConfiguration{'__private__'}{'input.project directory'});
-					$files_to_convert{$f} = $trans;
-				}
+		}
+		return \%json;
+	}
+
+	foreach my $level (@ALL_LEVELS) {
+		print STDOUT "[$level]\n";
+		while (my ($transName,$data) = each(%translators)) {
+			if (defined($data->{'included'}{$level})) {
+				my $val = cfgToBoolean($data->{'included'}{$level});
+				print STDOUT "$transName=$val\n";
 			}
 		}
-		# Build the data for each translator
-		my %translators = ();
-		my %reinjected_files = ();
-		foreach my $value (values %{$autolatexData{'imageDatabase'}}) {
-			if (exists $value->{'files'} && $value->{'translator'}) {
-				if (!$translators{$value->{'translator'}}{'automatic assignment'}) {
-					$translators{$value->{'translator'}}{'automatic assignment'} = [];
-				}
-				if (!$translators{$value->{'translator'}}{'overriden assignment'}) {
-					$translators{$value->{'translator'}}{'overriden assignment'} = [];
-				}
-				foreach my $file (@{$value->{'files'}}) {
-					my $absfile = File::Spec->rel2abs($file, $currentConfiguration{'__private__'}{'input.project directory'});
-					my $relfile = File::Spec->abs2rel($absfile, $currentConfiguration{'__private__'}{'input.project directory'});
-					if ($files_to_convert{$absfile}) {
-						if (!$reinjected_files{$files_to_convert{$absfile}}) {
-							$reinjected_files{$files_to_convert{$absfile}} = [];
-						}
-						push @{$translators{$value->{'translator'}}{'overriden assignment'}}, $relfile;
-						push @{$reinjected_files{$files_to_convert{$absfile}}}, $relfile;
-					}
-					else {
-						push @{$translators{$value->{'translator'}}{'automatic assignment'}}, $relfile;
+		print STDOUT "\n";
+	}
+	return undef;
+}
+
+sub getImages($) {
+	my $format = shift;
+	my %autolatexData = ();
+	loadTranslatorsFromConfiguration(%currentConfiguration,%autolatexData);
+	loadTranslatableImageList(%currentConfiguration,%autolatexData,1);
+	# Convert 'files to convert' from scalar to array
+	my $separator = getPathListSeparator();
+	my %files_to_convert = ();
+	foreach my $key (keys %currentConfiguration) {
+		if ($key =~ /^(.+)\.files\s+to\s+convert$/) {
+			my $trans = $1;
+			my @f = split(/\s*\Q$separator\E\s*/, $currentConfiguration{$key});
+			foreach my $f (@f) {
+				$f = File::Spec->rel2abs($f, $currentConfiguration{'__private__'}{'input.project directory'});
+				$files_to_convert{$f} = $trans;
+			}
+		}
+	}
+	# Build the data for each translator
+	my %translators = ();
+	my %reinjected_files = ();
+	foreach my $value (values %{$autolatexData{'imageDatabase'}}) {
+		if (exists $value->{'files'} && $value->{'translator'}) {
+			if (!$translators{$value->{'translator'}}{'automatic assignment'}) {
+				$translators{$value->{'translator'}}{'automatic assignment'} = [];
+			}
+			if (!$translators{$value->{'translator'}}{'overriden assignment'}) {
+				$translators{$value->{'translator'}}{'overriden assignment'} = [];
+			}
+			foreach my $file (@{$value->{'files'}}) {
+				my $absfile = File::Spec->rel2abs($file, $currentConfiguration{'__private__'}{'input.project directory'});
+				my $relfile = File::Spec->abs2rel($absfile, $currentConfiguration{'__private__'}{'input.project directory'});
+				if ($files_to_convert{$absfile}) {
+					if (!$reinjected_files{$files_to_convert{$absfile}}) {
+						$reinjected_files{$files_to_convert{$absfile}} = [];
 					}
+					push @{$translators{$value->{'translator'}}{'overriden assignment'}}, $relfile;
+					push @{$reinjected_files{$files_to_convert{$absfile}}}, $relfile;
+				}
+				else {
+					push @{$translators{$value->{'translator'}}{'automatic assignment'}}, $relfile;
 				}
 			}
 		}
-		# Reinject the manually selected files
-		while (my ($translator, $desc) = each(%reinjected_files)) {
-			if (!$translators{$translator}{'files to convert'}) {
-				$translators{$translator}{'files to convert'} = [];
+	}
+	# Reinject the manually selected files
+	while (my ($translator, $desc) = each(%reinjected_files)) {
+		if (!$translators{$translator}{'files to convert'}) {
+			$translators{$translator}{'files to convert'} = [];
+		}
+		push @{$translators{$translator}{'files to convert'}}, @{$desc};
+	}
+	if ($format eq 'json') {
+		foreach my $desc (values %translators) {
+			foreach my $key (keys %{$desc}) {
+				delete $desc->{$key} unless ($desc->{$key} && @{$desc->{$key}});
 			}
-			push @{$translators{$translator}{'files to convert'}}, @{$desc};
-		}
-		# Output the data for each translator
-		while (my ($translator, $desc) = each(%translators)) {
-			print STDOUT "[$translator]\n";
-			while (my ($key, $files) = each(%{$desc})) {
-				if ($files && @{$files}) {
-					print STDOUT "$key=";
-					print STDOUT join($separator,@{$files});
-					print STDOUT "\n";
-				}
+		}
+		return \%translators;
+	}
+	# Output the data for each translator
+	while (my ($translator, $desc) = each(%translators)) {
+		print STDOUT "[$translator]\n";
+		while (my ($key, $files) = each(%{$desc})) {
+			if ($files && @{$files}) {
+				print STDOUT "$key=";
+				print STDOUT join($separator,@{$files});
+				print STDOUT "\n";
 			}
-			print STDOUT "\n";
 		}
+		print STDOUT "\n";
 	}
-	else {
-		killMe("illegal command line");
+	return undef;
+}
+
+sub getBundle($@) {
+	my $format = shift;
+	my %json = ();
+	foreach my $part (@_) {
+		my ($kind, @params) = split(/:/, $part, -1);
+		$kind = '' unless ($kind);
+		my $data;
+		print STDOUT "$BUNDLE_PART_MARKER $part\n" unless ($format eq 'json');
+		if ($kind eq 'config') {
+			if (@params>1) {
+				$data = getConfig($params[0] || '', $params[1] || '', $format);
+			}
+			else {
+				$data = getConfig('all', $params[0] || '', $format);
+			}
+		}
+		elsif ($kind eq 'translators') {
+			$data = getTranslators($format);
+		}
+		elsif ($kind eq 'conflicts') {
+			$data = getConflicts($params[0] || '', $format);
+		}
+		elsif ($kind eq 'loads') {
+			$data = getLoads($format);
+		}
+		elsif ($kind eq 'images') {
+			$data = getImages($format);
+		}
+		else {
+			killMe("illegal command line");
+		}
+		$json{$part} = $data;
+	}
+	if ($format eq 'json') {
+		return \%json;
 	}
+	return undef;
 }
-elsif ($a1 eq 'set') {
-	if ($a2 eq 'loads') {
-		my %new_config = readStdin();
-		foreach my $k (keys %userConfiguration) {
+
+# Write the configuration in a temporary file, and rename it into
+# the given file. The configuration file is never half-written.
+sub saveConfigFile($\%) {
+	my $filename = shift;
+	my $config = shift;
+	my $tmpfile = "$filename.$$.tmp";
+	writeConfigFile($tmpfile, %{$config});
+	if (!rename($tmpfile, $filename)) {
+		my $error = "$!";
+		unlink($tmpfile);
+		killMe("$filename: $error");
+	}
+}
+
+sub setLoads() {
+	my %new_config = readStdin();
+	foreach my $k (keys %userConfiguration) {
+		if ($k =~ /\.include module$/) {
+			delete $userConfiguration{$k};
+		}
+	}
+	if ($new_config{'user'}) {
+		while (my ($translator, $inc) = each(%{$new_config{'user'}})) {
+			$userConfiguration{"$translator.include module"} = (cfgBoolean($inc) ? 'true' : 'false');
+		}
+	}
+	my $userFile = getUserConfigFilename();
+	saveConfigFile($userFile, %userConfiguration);
+	if (@projectConfigurationPath) {
+		foreach my $k (keys %projectConfiguration) {
 			if ($k =~ /\.include module$/) {
-				delete $userConfiguration{$k};
+				delete $projectConfiguration{$k};
 			}
 		}
-		if ($new_config{'user'}) {
-			while (my ($translator, $inc) = each(%{$new_config{'user'}})) {
-				$userConfiguration{"$translator.include module"} = (cfgBoolean($inc) ? 'true' : 'false');
+		if ($new_config{'project'}) {
+			while (my ($translator, $inc) = each(%{$new_config{'project'}})) {
+				$projectConfiguration{"$translator.include module"} = (cfgBoolean($inc) ? 'true' : 'false');
 			}
 		}
-		my $userFile = getUserConfigFilename();
-		writeConfigFile($userFile, %userConfiguration);
-		if (@projectConfigurationPath) {
-			foreach my $k (keys %projectConfiguration) {
-				if ($k =~ /\.include module$/) {
-					delete $projectConfiguration{$k};
-				}
-			}
-			if ($new_config{'project'}) {
-				while (my ($translator, $inc) = each(%{$new_config{'project'}})) {
-					$projectConfiguration{"$translator.include module"} = (cfgBoolean($inc) ? 'true' : 'false');
+		my $projectFile = getProjectConfigFilename(@projectConfigurationPath);
+		saveConfigFile($projectFile, %projectConfiguration);
+	}
+}
+
+sub setConfig($$) {
+	my $a3 = shift;
+	my $a4 = shift;
+	my %new_config = readStdin();
+	if ($a3 eq 'user') {
+		if ($a4 eq 'true') {
+			%userConfiguration = ();
+		}
+		while (my ($section, $v) = each(%new_config)) {
+			while (my ($key, $value) = each(%{$v})) {
+				if ($key !~ /\_INHERITED$/i) {
+					$userConfiguration{"$section.$key"} = rebuiltConfigValue("$section.$key",$value);
 				}
 			}
-			my $projectFile = getProjectConfigFilename(@projectConfigurationPath);
-			writeConfigFile($projectFile, %projectConfiguration);
 		}
+		my $userFile = getUserConfigFilename();
+		saveConfigFile($userFile, %userConfiguration);
 	}
-	elsif ($a2 eq 'config') {
-		my %new_config = readStdin();
-		if ($a3 eq 'user') {
+	elsif ($a3 eq 'project') {
+		if (@projectConfigurationPath) {
 			if ($a4 eq 'true') {
-				%userConfiguration = ();
+				%projectConfiguration = ();
 			}
 			while (my ($section, $v) = each(%new_config)) {
 				while (my ($key, $value) = each(%{$v})) {
 					if ($key !~ /\_INHERITED$/i) {
-						$userConfiguration{"$section.$key"} = rebuiltConfigValue("$section.$key",$value);
-					}
-				}
-			}
-			my $userFile = getUserConfigFilename();
-			writeConfigFile($userFile, %userConfiguration);
-		}
-		elsif ($a3 eq 'project') {
-			if (@projectConfigurationPath) {
-				if ($a4 eq 'true') {
-					%projectConfiguration = ();
-				}
-				while (my ($section, $v) = each(%new_config)) {
-					while (my ($key, $value) = each(%{$v})) {
-						if ($key !~ /\_INHERITED$/i) {
-							$projectConfiguration{"$section.$key"} = rebuiltConfigValue("$section.$key",$value);
-						}
+						$projectConfiguration{"$section.$key"} = rebuiltConfigValue("$section.$key",$value);
 					}
 				}
-				my $projectFile = getProjectConfigFilename(@projectConfigurationPath);
-				writeConfigFile($projectFile, %projectConfiguration);
-			}
-			else {
-				killMe("no path to the project");
 			}
+			my $projectFile = getProjectConfigFilename(@projectConfigurationPath);
+			saveConfigFile($projectFile, %projectConfiguration);
 		}
 		else {
-			killMe('illegal command line');
+			killMe("no path to the project");
 		}
 	}
-	elsif ($a2 eq 'images') {
-		if (@projectConfigurationPath) {
-			my %new_config = readStdin();
-			my @keys = keys %projectConfiguration;
-			foreach my $key (@keys) {
-				if ($key =~ /^[^2]+2[^+_]+(?:\+[^+_]+)*(?:_[^.]+)?\.(.+)$/) {
-					my $param = $1;
-					if (($a3 eq 'true' && $param ne 'include module') ||
-					    ($a3 ne 'true' && $param eq 'files to convert')) {
-						delete $projectConfiguration{$key};
-					}
+	else {
+		killMe('illegal command line');
+	}
+}
+
+sub setImages($) {
+	my $a3 = shift;
+	if (@projectConfigurationPath) {
+		my %new_config = readStdin();
+		my @keys = keys %projectConfiguration;
+		foreach my $key (@keys) {
+			if ($key =~ /^[^2]+2[^+_]+(?:\+[^+_]+)*(?:_[^.]+)?\.(.+)$/) {
+				my $param = $1;
+				if (($a3 eq 'true' && $param ne 'include module') ||
+				    ($a3 ne 'true' && $param eq 'files to convert')) {
+					delete $projectConfiguration{$key};
 				}
 			}
-			while (my ($section, $v) = each(%new_config)) {
-				while (my ($key, $value) = each(%{$v})) {
-					if ($key ne 'automatic assignment' && $key ne 'overriden assignment' && $key !~ /\_INHERITED/i) {
-						$projectConfiguration{"$section.$key"} = rebuiltConfigValue("$section.$key",$value);
-					}
+		}
+		while (my ($section, $v) = each(%new_config)) {
+			while (my ($key, $value) = each(%{$v})) {
+				if ($key ne 'automatic assignment' && $key ne 'overriden assignment' && $key !~ /\_INHERITED/i) {
+					$projectConfiguration{"$section.$key"} = rebuiltConfigValue("$section.$key",$value);
 				}
 			}
-			my $projectFile = getProjectConfigFilename(@projectConfigurationPath);
-			writeConfigFile($projectFile, %projectConfiguration);
-		}
-		else {
-			killMe('no path to the project');
 		}
+		my $projectFile = getProjectConfigFilename(@projectConfigurationPath);
+		saveConfigFile($projectFile, %projectConfiguration);
+	}
+	else {
+		killMe('no path to the project');
+	}
+}
+
+# Apply the changes given on STDIN with the JSON format to the
+# configuration of the given level. The changes are an object of
+# sections, which are objects of values. A null value removes the key
+# from the configuration; a list is joined with the path separator.
+# The configuration file is written only if a value has changed.
+sub setPatch($) {
+	my $level = shift;
+	my $text = readStdinText();
+	my ($config, $filename);
+	if ($level eq 'user') {
+		$config = \%userConfiguration;
+		$filename = getUserConfigFilename();
+	}
+	elsif ($level eq 'project') {
+		killMe('no path to the project') unless (@projectConfigurationPath);
+		$config = \%projectConfiguration;
+		$filename = getProjectConfigFilename(@projectConfigurationPath);
 	}
 	else {
 		killMe('illegal command line');
 	}
+	my $patch = eval { JSON::PP->new->decode($text) };
+	killMe("invalid patch: $@") if ($@ || !isHash($patch));
+	my $separator = getPathListSeparator();
+	my $changed = 0;
+	while (my ($section, $v) = each(%{$patch})) {
+		next unless (isHash($v));
+		while (my ($key, $value) = each(%{$v})) {
+			next if ($key =~ /\_INHERITED$/i);
+			my $attr = lc("$section.$key");
+			if (JSON::PP::is_bool($value)) {
+				$value = ($value ? 'true' : 'false');
+			}
+			elsif (isArray($value)) {
+				$value = join($separator, @{$value});
+			}
+			$value = rebuiltConfigValue($attr, $value) if (defined($value));
+			my $old = AutoLaTeX::Core::Config::serializeConfigValue($attr, $config->{$attr});
+			if ($value) {
+				my $new = AutoLaTeX::Core::Config::serializeConfigValue($attr, $value);
+				if (!defined($old) || $old ne $new) {
+					$config->{$attr} = $value;
+					$changed = 1;
+				}
+			}
+			elsif (exists $config->{$attr}) {
+				delete $config->{$attr};
+				$changed = 1;
+			}
+		}
+	}
+	if ($changed) {
+		saveConfigFile($filename, %{$config});
+	}
 }
-elsif (!$a1) {
+
+sub printUsage() {
 	my $bn = basename($0);
 	printComment(
 		"$bn get config [all|system|user|project] ["._T("<section>")."]",
@@ -451,6 +670,12 @@ elsif (!$a1) {
 	printComment(
 		"$bn get images",
 		_T("Output the list of figures detected by AutoLaTeX."));
+	printComment(
+		"$bn get bundle "._T("<part>")." ["._T("<part>")."...]",
+		formatText(_T("Output several data in a single invocation. Each part is one of 'translators', 'loads', 'images', 'conflicts[:resolved]', 'config:<section>' or 'config:<level>:<section>'. The output of each part is preceded by a line containing '{}' followed by the name of the part."), $BUNDLE_PART_MARKER));
+	printComment(
+		"$bn get ... --format=ini|json",
+		_T("Select the output format of the 'get' commands. With the 'json' format, the data is output on a single line. The configuration and the translators are objects of objects of strings, the loads are objects of objects of booleans, the images are objects of objects of lists of files, and the bundle is an object of which the keys are the parts. The default format is 'ini'."));
 	printComment(
 		"$bn set config user|project [true|false]",
 		_T("Read from STDIN an ini file that is a new configuration for the given level. The boolean param indicates if the configuration keys that are not given on STDIN will be removed (if true) or skipped (if false, the default) during the setting process."));
@@ -460,9 +685,134 @@ elsif (!$a1) {
 	printComment(
 		"$bn set images [true|false]",
 		_T("Read from STDIN an ini file that is describing the attributes for the translators. The boolean param indicates if the configuration keys that are not given on STDIN will be removed (if true) or skipped (if false, the default) during the setting process."));
+	printComment(
+		"$bn set patch user|project",
+		_T("Read from STDIN a JSON object that is describing the changes in the configuration of the given level. The keys of the object are the sections, and the values are objects from the configuration keys to their new values. A null value removes the key from the configuration. The configuration file is not written when nothing has changed."));
+	printComment(
+		"$bn serve",
+		formatText(_T("Run as a persistent server. Each line read from STDIN is a command with the same parameters as above (eg. 'get config project generation'), and 'quit' stops the server. The ini data expected by the 'set' commands must follow the command line, and must be terminated by a line containing '{}'. The output of each command is terminated by a line containing '{}' followed by the exit code of the command, and by the error message if any. A command may be preceded by an identifier starting with '\@', which is replied before the exit code."), $SERVER_END_MARKER, $SERVER_END_MARKER));
+}
+
+# Run the command given as parameters.
+sub runCommand(@) {
+	# Extract the output format from the parameters
+	my $format = 'ini';
+	my @args = ();
+	foreach my $arg (@_) {
+		if ($arg =~ /^--format=(.*)$/) {
+			$format = lc($1);
+			killMe("illegal output format: $format") if ($format ne 'ini' && $format ne 'json');
+		}
+		else {
+			push @args, $arg;
+		}
+	}
+
+	my $a1 = $args[0] || '';
+	my $a2 = $args[1] || '';
+	my $a3 = $args[2] || '';
+	my $a4 = $args[3] || '';
+
+	loadConfigurations();
+
+	if ($a1 eq 'get') {
+		my $data;
+		if ($a2 eq 'config') {
+			$data = getConfig($a3, $a4, $format);
+		}
+		elsif ($a2 eq 'translators') {
+			$data = getTranslators($format);
+		}
+		elsif ($a2 eq 'conflicts') {
+			$data = getConflicts($a3, $format);
+		}
+		elsif ($a2 eq 'loads') {
+			$data = getLoads($format);
+		}
+		elsif ($a2 eq 'images') {
+			$data = getImages($format);
+		}
+		elsif ($a2 eq 'bundle') {
+			$data = getBundle($format, @args[2..$#args]);
+		}
+		else {
+			killMe("illegal command line");
+		}
+		if ($format eq 'json') {
+			printJson($data);
+		}
+	}
+	elsif ($a1 eq 'set') {
+		if ($a2 eq 'loads') {
+			setLoads();
+		}
+		elsif ($a2 eq 'config') {
+			setConfig($a3, $a4);
+		}
+		elsif ($a2 eq 'images') {
+			setImages($a3);
+		}
+		elsif ($a2 eq 'patch') {
+			setPatch($a3);
+		}
+		else {
+			killMe('illegal command line');
+		}
+	}
+	else {
+		killMe('illegal command line');
+	}
+}
+
+# Run the server loop: read a command on each line of STDIN,
+# and reply its output followed by the end marker.
+sub runServer() {
+	$isServerMode = 1;
+	my $oldfh = select(STDOUT);
+	$| = 1;
+	select($oldfh);
+	while (my $line = <STDIN>) {
+		$line =~ s/^\s+//s;
+		$line =~ s/\s+$//s;
+		next unless ($line);
+		last if ($line eq 'quit');
+		my @args = split(/\s+/, $line);
+		# The identifier of the request is replied with the end marker
+		my $id = ($args[0] =~ /^@/) ? shift(@args) : undef;
+		my $status = 0;
+		my $message = '';
+		# The data of the 'set' commands is read before the command is
+		# checked, for not reading it as the next commands on error
+		$serverInput = undef;
+		$serverInput = readStdinText() if (@args && $args[0] eq 'set');
+		eval {
+			runCommand(@args);
+		};
+		$serverInput = undef;
+		if ($@) {
+			$status = 255;
+			$message = "$@";
+			$message =~ s/[\n\r]+/ /sg;
+			$message =~ s/\s+$//s;
+		}
+		print STDOUT "$SERVER_END_MARKER ".($id ? "$id " : '')."$status".($message ? " $message" : '')."\n";
+	}
+}
+
+setDebugLevel(0);
+
+initTextDomain('autolatex', File::Spec->catfile(getAutoLaTeXDir(), 'po'), 'UTF-8');
+
+my $a1 = $ARGV[0] || '';
+
+if ($a1 eq 'serve') {
+	runServer();
+}
+elsif (!$a1) {
+	printUsage();
 }
 else {
-	killMe('illegal command line');
+	runCommand(@ARGV);
 }
 
 exit(0);
@@ -69,9 +69,11 @@ use AutoLaTeX::Core::OS;
 use AutoLaTeX::Core::Config;
 use AutoLaTeX::Core::IntUtils;
 use AutoLaTeX::Core::Progress;
+use AutoLaTeX::Core::FileMonitor;
 use AutoLaTeX::Core::Translator;
 use AutoLaTeX::Make::Make;
 use AutoLaTeX::TeX::Flattener;
+use AutoLaTeX::TeX::TeXDependencyAnalyzer;
 
 ###################################################
 # Add the include path to the "user" interpreters #
@@ -98,6 +100,15 @@ my @SUPPORTED_COMMANDS = ( 'all', 'view', 'clean', 'cleanall', 'gen_doc', 'bibte
 
 # script parameters
 my @ORIGINAL_ARGV = @ARGV;
+# script parameters that are used by the worker for reloading the configuration
+my @LAUNCHING_ARGV = @ARGV;
+# source files of the last build, used by the continuous mode
+my @BUILD_SOURCE_FILES = ();
+
+# Stream on which a build run by the resident worker replies its peak memory,
+# and process identifier of the build
+my $WORKER_BUILD_REPORT = undef;
+my $WORKER_BUILD_PID = 0;
 
 ###################################################
 # Helping function to init the progress bar       #
@@ -109,6 +120,7 @@ sub __initProgress($) {
 	if ($show) {
 		my $progress = AutoLaTeX::Core::Progress->new($max);
 		$progress->setCarriageReturn($show ne 'n');
+		$progress->setPhaseReporting($show eq 'n');
 		return $progress;
 	}
 	return undef;
@@ -153,23 +165,76 @@ sub al_generateimages($) {
 	if (cfgBoolean($configuration{'generation.generate images'})) {
 		my $pv = 0;
 		my $imageCount = $autolatexData{'numberOfImages'};
-		$progress->setMax($imageCount) if ($progress);
+		my %unreferencedImages = ();
+		if (cfgBoolean($configuration{'generation.referenced images'})) {
+			%unreferencedImages = __getUnreferencedImages();
+			if (%unreferencedImages) {
+				$imageCount -= keys(%unreferencedImages);
+				my $rootDir = $configuration{'__private__'}{'input.project directory'};
+				printWarn(formatText(_T("The following images are not referenced by the document, they are not generated:\n{}"),
+					join("\n", sort map { removePathPrefix($rootDir, $_) } keys %unreferencedImages)));
+			}
+		}
+		if ($progress) {
+			$progress->setMax($imageCount);
+			$progress->startPhase('images');
+		}
 		foreach my $formatName (@{$autolatexData{'activatedImageExtensions'}}) {
 			my $entry = $autolatexData{'imageDatabase'}{"$formatName"};
 			my $trans = $entry->{'translator'};
 			my $fileCount = ($entry->{'files'}) ? @{$entry->{'files'}} : 0;
 			if ($fileCount>0) {
 				foreach my $file (@{$entry->{'files'}}) {
+					next if ($unreferencedImages{$file});
 					if ($progress) {
 						$progress->setComment(formatText(_T("Translating from {}"),basename($file)));
+						$progress->startPhase("$trans ".basename($file));
 					}
 					runRootTranslator(%configuration, $trans, $file, %{$autolatexData{'translators'}}, 0);
-					$progress->increment() if ($progress);
+					if ($progress) {
+						$progress->endPhase();
+						$progress->increment();
+					}
 				}
 			}
 		}
-		$progress->stop() if ($progress);
+		if ($progress) {
+			$progress->endPhase();
+			$progress->stop();
+		}
+	}
+}
+
+# Replies the images of the database that are not referenced by the TeX files
+# of the document, eg. with \includegraphics. An image is referenced when
+# one of the references is the name of one of the files generated from the
+# image, with or without its extension.
+# Result: the associative array (image filename => 1).
+sub __getUnreferencedImages() {
+	my $texFile = File::Spec->rel2abs(
+			$configuration{'__private__'}{'input.latex file'},
+			$configuration{'__private__'}{'input.project directory'});
+	my %references = map { $_ => 1 } getPictureReferencesOfTeX($texFile, dirname($texFile));
+	my %unreferencedImages = ();
+	foreach my $formatName (@{$autolatexData{'activatedImageExtensions'}}) {
+		my $entry = $autolatexData{'imageDatabase'}{"$formatName"};
+		next unless ($entry->{'files'});
+		my $transdef = $autolatexData{'translators'}{$entry->{'translator'}}{'transdef'};
+		my @inexts = sort { length($b) <=> length($a) } @{$transdef->{'INPUT_EXTENSIONS'}{'value'} || []};
+		my @outexts = @{$transdef->{'OUTPUT_EXTENSIONS'}{'value'} || []};
+		foreach my $file (@{$entry->{'files'}}) {
+			my $template = File::Spec->rel2abs($file);
+			foreach my $ext (@inexts) {
+				last if ($template =~ s/\Q$ext\E$//i);
+			}
+			my $isReferenced = $references{$template} || $references{File::Spec->rel2abs($file)};
+			foreach my $ext (@outexts) {
+				$isReferenced ||= $references{"$template$ext"};
+			}
+			$unreferencedImages{$file} = 1 unless ($isReferenced);
+		}
 	}
+	return %unreferencedImages;
 }
 
 sub al_run_images {
@@ -331,6 +396,7 @@ sub al_make($) {
 	$make->generationType($configuration{'generation.generation type'});
 	$make->addTeXFile( $configuration{'__private__'}{'input.latex file'} );
 	$make->build($progress);
+	@BUILD_SOURCE_FILES = $make->getSourceFiles();
 }
 
 sub al_run_make {
@@ -405,33 +471,6 @@ sub al_run_makeglossaries {
 #
 #------------------------------------------------------
 
-sub al_shell2re($) {
-	return '' unless ($_[0]);
-	my $shell = "$_[0]";
-	my $re = "";
-	while ($shell && $shell =~ /^(.*?)([*?]|(?:\[([^\]]+)\]))(.*)$/) {
-		(my $prev, my $sep, $shell) = ($1,$2,$4);
-		$re .= "\Q$prev\E";
-		if ($sep eq '*') {
-			$re .= '.*';
-		}
-		elsif ($sep eq '?') {
-			$re .= '.';
-		}
-		else {
-			$re .= '['.$3.']';
-		}
-		
-	}
-	if ($shell) {
-		$re .= "\Q$shell\E";
-	}
-	if ($re) {
-		$re = "(?:$re)";
-	}
-	return $re;
-}
-
 sub al_applyCleanRecursively(\@\@) {
 	my $rootPatterns = shift;
 	my $dirPatterns = shift;
@@ -449,7 +488,7 @@ sub al_applyCleanRecursively(\@\@) {
 				if ($tpatterns) {
 					$tpatterns .= '|';
 				}
-				$tpatterns .= al_shell2re($pattern);
+				$tpatterns .= shellPatternToRegex($pattern);
 			}
 		}
 	}
@@ -463,7 +502,7 @@ sub al_applyCleanRecursively(\@\@) {
 				if ($dpatterns) {
 					$dpatterns .= '|';
 				}
-				$dpatterns .= al_shell2re($pattern);
+				$dpatterns .= shellPatternToRegex($pattern);
 			}
 		}
 	}
@@ -504,10 +543,11 @@ sub al_getcleanfiles() {
 				$configuration{'__private__'}{'output.directory'},
 				$configuration{'__private__'}{'output.latex basename'}));
 	my @filestoclean = (
-		'.autolatex_stamp', 'autolatex_stamp',
+		'.autolatex_stamp', 'autolatex_stamp', '.autolatex_images',
 		'autolatex_exec_stderr.log', 'autolatex_exec_stdout.log', 'autolatex_exec_stdin.log',
 		'autolatex_autogenerated.tex',
 		"$outputFile.pdf", "$outputFile.dvi", "$outputFile.xdvi", "$outputFile.xdv", "$outputFile.ps", "$outputFile.synctex.gz", "$outputFile.synctex",
+		"${outputFile}_preamble.fmt",
 	);
 	my @filestocleanrec = (
 		'*.aux', '*.log', '*.bbl', '*.blg',
@@ -594,7 +634,7 @@ sub al_run_cleanall {
 						if ($cleanpattern) {
 							$cleanpattern .= '|';
 						}
-						$cleanpattern .= al_shell2re($p);
+						$cleanpattern .= shellPatternToRegex($p);
 					}
 					$autolatexData{'translators'}{"$trans"}{'cleanpattern'} = $cleanpattern;
 				}
@@ -821,6 +861,245 @@ END_FIGURE
 	$progress->stop() if ($progress);
 }
 
+#------------------------------------------------------
+#
+# WORKER MODE
+#
+#------------------------------------------------------
+
+# Create the monitor of the configuration files.
+sub __createConfigurationMonitor() {
+	my $monitor = AutoLaTeX::Core::FileMonitor->new();
+	$monitor->addFile(getSystemConfigFilename());
+	$monitor->addFile(getUserConfigFilename());
+	$monitor->addFile(getProjectConfigFilename($configuration{'__private__'}{'output.directory'}));
+	$monitor->addDirectory(File::Spec->catfile(getUserConfigDirectory(),"translators"));
+	return $monitor;
+}
+
+# Create the monitor of the image directories.
+sub __createImageMonitor() {
+	my $monitor = AutoLaTeX::Core::FileMonitor->new();
+	my $rawdirs = $configuration{'generation.image directory'} || '';
+	$rawdirs =~ s/^\s+//s;
+	$rawdirs =~ s/\s+$//s;
+	if ($rawdirs) {
+		my $separators = getPathListSeparator() || '';
+		foreach my $dir (split( /[$separators]/is, $rawdirs)) {
+			$monitor->addDirectory(File::Spec->rel2abs($dir, $configuration{'__private__'}{'input.project directory'}));
+		}
+	}
+	return $monitor;
+}
+
+# Load the translators and the list of the images that
+# are shared by the builds of the worker.
+sub __loadWorkerData() {
+	%autolatexData = ();
+	if ($configuration{'__private__'}{'input.latex file'}) {
+		loadTranslatorsFromConfiguration(%configuration,%autolatexData);
+		loadTranslatableImageList(%configuration,%autolatexData);
+	}
+}
+
+# Run AutoLaTeX as a resident worker for the current project.
+# The modules, the configuration, the translators and the list of
+# the images are loaded once. The build requests are read from
+# the standard input, one per line:
+#  build action...   runs the given actions, eg. "build all";
+#  quit              stops the worker.
+# Each build is run in a forked process, which is notified with
+# "[worker:build] pid" on the standard output. The end of the build
+# is notified with "[worker:done] exit_code cpu_time peak_rss" on the
+# standard output and on the standard error, where peak_rss is the peak
+# resident set size of the build in kilobytes, or 0 if it is unknown.
+# The configuration and the image list are reloaded when the
+# configuration files or the image directories have changed.
+sub al_run_worker() {
+	my $configMonitor = __createConfigurationMonitor();
+	my $imageMonitor = __createImageMonitor();
+	__loadWorkerData();
+	while (my $request = <STDIN>) {
+		$request =~ s/^\s+//s;
+		$request =~ s/\s+$//s;
+		my @actions = split(/\s+/, $request);
+		my $command = shift @actions;
+		next unless ($command);
+		last if ($command eq 'quit');
+		if ($command ne 'build') {
+			print STDERR formatText(_T('Worker command \'{}\' is not supported.'), $command)."\n";
+			next;
+		}
+
+		# Invalidate the loaded data
+		if ($configMonitor->hasChanged()) {
+			printDbgFor(2, _T("Reloading the configuration"));
+			@ARGV = @LAUNCHING_ARGV;
+			%configuration = mainProgram(); # Exit on error
+			if ($configuration{'__private__'}{'action.show progress'}) {
+				setDebugLevel(0);
+			}
+			$configMonitor = __createConfigurationMonitor();
+			$imageMonitor = __createImageMonitor();
+			__loadWorkerData();
+		}
+		elsif ($imageMonitor->hasChanged()) {
+			printDbgFor(2, _T("Reloading the list of the images"));
+			$imageMonitor = __createImageMonitor();
+			__loadWorkerData();
+		}
+
+		# Run the build in a child process for keeping
+		# the data of the worker unchanged
+		@actions = ('all') unless (@actions);
+		my @times = times();
+		local (*REPORT_READER, *REPORT_WRITER);
+		pipe(*REPORT_READER, *REPORT_WRITER) or printErr("Unable to create a pipe: $!\n");
+		my $pid = fork();
+		if (!defined($pid)) {
+			printErr("Unable to fork the process: $!\n");
+		}
+		elsif ($pid == 0) {
+			# The build has its own process group for being
+			# killed without the worker
+			setpgrp(0, 0);
+			open(STDIN, '<', File::Spec->devnull());
+			close(*REPORT_READER);
+			$WORKER_BUILD_REPORT = *REPORT_WRITER;
+			$WORKER_BUILD_PID = $$;
+			@ARGV = @actions;
+			_al_run_actions();
+			exit(0);
+		}
+		close(*REPORT_WRITER);
+		print STDOUT "[worker:build] $pid\n";
+		waitpid($pid, 0);
+		my $exitcode = ($? & 127) ? 255 : ($? >> 8);
+		my @endtimes = times();
+		my $cputime = ($endtimes[2] + $endtimes[3]) - ($times[2] + $times[3]);
+		my $rss = <REPORT_READER>;
+		close(*REPORT_READER);
+		$rss = ($rss && $rss =~ /^([0-9]+)/) ? $1 : 0;
+		print STDERR "[worker:done] $exitcode $cputime $rss\n";
+		print STDOUT "[worker:done] $exitcode $cputime $rss\n";
+	}
+}
+
+# Replies the peak resident set size of the current process and of its
+# terminated child processes, eg. pdflatex, in kilobytes. The child
+# processes are considered only when the Perl module BSD::Resource is
+# installed. Otherwise, the peak size of the current process is read
+# from /proc, if it exists.
+# Result: the size, or 0 if it is unknown.
+sub __getPeakMemory() {
+	if (eval { require BSD::Resource; 1 }) {
+		my $self = (BSD::Resource::getrusage(BSD::Resource::RUSAGE_SELF()))[2] || 0;
+		my $children = (BSD::Resource::getrusage(BSD::Resource::RUSAGE_CHILDREN()))[2] || 0;
+		return ($self>$children) ? int($self) : int($children);
+	}
+	local *STATUS;
+	if (open(*STATUS, '<', '/proc/self/status')) {
+		while (my $line = <STATUS>) {
+			if ($line =~ /^VmHWM:\s*([0-9]+)/) {
+				close(*STATUS);
+				return int($1);
+			}
+		}
+		close(*STATUS);
+	}
+	return 0;
+}
+
+# Reply the peak memory of a build run by the resident worker, including
+# when the build is stopped on error.
+END {
+	# The processes forked by the build are ignored
+	if ($WORKER_BUILD_REPORT && $$ == $WORKER_BUILD_PID) {
+		print $WORKER_BUILD_REPORT __getPeakMemory()."\n";
+		close($WORKER_BUILD_REPORT);
+		$WORKER_BUILD_REPORT = undef;
+	}
+}
+
+#------------------------------------------------------
+#
+# CONTINUOUS MODE
+#
+#------------------------------------------------------
+
+# Create the monitor of the sources of the document: the TeX files
+# and the other dependencies of the last build, the images and the
+# configuration files.
+sub __createSourceMonitor() {
+	my $monitor = __createConfigurationMonitor();
+	foreach my $file (@BUILD_SOURCE_FILES) {
+		$monitor->addFile("$file");
+	}
+	$monitor->addFile($configuration{'__private__'}{'input.latex file'});
+	# The images are detected again because they may be changed by the build
+	%autolatexData = ();
+	if ($configuration{'__private__'}{'input.latex file'}) {
+		loadTranslatorsFromConfiguration(%configuration,%autolatexData);
+		loadTranslatableImageList(%configuration,%autolatexData);
+	}
+	my @extensions = ();
+	foreach my $entry (values %{$autolatexData{'imageDatabase'}}) {
+		if (exists $entry->{'files'}) {
+			foreach my $file (@{$entry->{'files'}}) {
+				$monitor->addFile("$file");
+			}
+		}
+	}
+	foreach my $extension (keys %{$autolatexData{'imageDatabase'}}) {
+		# The extensions of the manually assigned files are not file extensions
+		push @extensions, quotemeta("$extension") if ($extension =~ /^\./);
+	}
+	# Only the images are detected in the image directories because
+	# the generated files are also written in these directories.
+	if (@extensions) {
+		my $filter = '(?i)(?:'.join('|', @extensions).')$';
+		my $rawdirs = $configuration{'generation.image directory'} || '';
+		$rawdirs =~ s/^\s+//s;
+		$rawdirs =~ s/\s+$//s;
+		if ($rawdirs) {
+			my $separators = getPathListSeparator() || '';
+			foreach my $dir (split( /[$separators]/is, $rawdirs)) {
+				$monitor->addDirectory(File::Spec->rel2abs($dir, $configuration{'__private__'}{'input.project directory'}), $filter);
+			}
+		}
+	}
+	return $monitor;
+}
+
+# Run the actions each time a source of the document has changed.
+# The sources are the files on which the document depends
+# according to the last build. The changes are detected with inotify
+# when it is available, and the bursts of changes, eg. when an editor
+# is saving several files, are merged into a single build.
+# The duration given to the continuous mode is the minimal duration
+# between two builds.
+sub al_run_continuous() {
+	my @actions = @ARGV;
+	while (1) {
+		my $start = time;
+		@BUILD_SOURCE_FILES = ();
+		@ARGV = @actions;
+		_al_run_actions();
+		my $monitor = __createSourceMonitor();
+		# The images may be changed before the next build
+		%autolatexData = ();
+		my $delay = $configuration{'__private__'}{'action.continuous mode'} - (time - $start);
+		sleep($delay) if ($delay>0);
+		# The sources that were saved during the build are already
+		# in the stamps of the monitor, they are detected by their dates
+		if (!$monitor->isModifiedSince($start) && !$monitor->hasChanged()) {
+			printDbgFor(2, _T("Waiting for a change in the sources of the document"));
+			$monitor->waitForChange();
+		}
+		printDbgFor(2, _T("The sources of the document have changed"));
+	}
+}
+
 #------------------------------------------------------
 #
 # MAIN PROGRAM
@@ -963,13 +1242,11 @@ sub __sharedMainProgram() {
 		push @ARGV, 'all' ;
 	}
 
-	if (defined($configuration{'__private__'}{'action.continuous mode'})) {
-		while (1) {
-			_al_run_actions();
-			if ($configuration{'__private__'}{'action.continuous mode'}>0) {
-				sleep($configuration{'__private__'}{'action.continuous mode'});
-			}
-		}
+	if ($configuration{'__private__'}{'action.worker mode'}) {
+		al_run_worker();
+	}
+	elsif (defined($configuration{'__private__'}{'action.continuous mode'})) {
+		al_run_continuous();
 	}
 	else {
 		_al_run_actions();
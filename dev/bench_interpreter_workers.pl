@@ -0,0 +1,90 @@
+#!/usr/bin/env perl
+#
+# Copyright (C) 2013-14  Stephane Galland <galland@arakhne.org>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 59 Temple Place - Suite 330,
+# Boston, MA 02111-1307, USA.
+
+#
+# Benchmark of the translators that are written in Python, Ruby
+# or shell script.
+#
+# A minimal translator function, that copies the input file into the
+# output file, is run for many images with a new interpreter for each
+# image, and with the long-lived interpreter workers.
+#
+# Usage: dev/bench_interpreter_workers.pl [number of images]
+#
+
+use strict;
+use File::Basename;
+use File::Spec;
+use File::Temp qw(tempdir);
+use Time::HiRes qw(time);
+
+use lib File::Spec->catdir(dirname(File::Spec->rel2abs(__FILE__)), '..', 'pm');
+
+use AutoLaTeX::Core::Util;
+use AutoLaTeX::Core::OS;
+
+my %TRANSLATORS = (
+	'python' => [ 'python', "import shutil\nshutil.copyfile(_in, _out)\n" ],
+	'ruby' => [ 'ruby', "require 'fileutils'\nFileUtils.cp(_in, _out)\n" ],
+	'sh' => [ 'bash', "cp \"\$_in\" \"\$_out\"\n" ],
+);
+
+sub run_benchmark($$$$) {
+	my $language = shift;
+	my $code = shift;
+	my $dir = shift;
+	my $count = shift;
+	my %durations = ();
+	foreach my $mode ('spawn', 'worker') {
+		my $start = time;
+		for(my $i=0; $i<$count; $i++) {
+			my $wrapper = "AutoLaTeX::Interpreter::$language"->new();
+			$wrapper->enable_worker('bench') if ($mode eq 'worker');
+			$wrapper->define_global_variable('_in', File::Spec->catfile($dir, "image$i.svg"));
+			$wrapper->define_global_variable('_out', File::Spec->catfile($dir, "image$i.$mode"));
+			$wrapper->run($code);
+		}
+		$durations{$mode} = time - $start;
+	}
+	return \%durations;
+}
+
+my $count = int($ARGV[0] || 200);
+my $dir = tempdir(CLEANUP => 1);
+for(my $i=0; $i<$count; $i++) {
+	my $in = File::Spec->catfile($dir, "image$i.svg");
+	open(my $fh, '>', $in) or die("$in: $!\n");
+	print $fh "<svg/>\n";
+	close($fh);
+}
+# The logs of the interpreters are written in the current directory
+chdir($dir);
+
+print "$count images\n";
+foreach my $language (sort keys %TRANSLATORS) {
+	my ($binary, $code) = @{$TRANSLATORS{$language}};
+	if (!which($binary)) {
+		printf("%-8s %s is not installed\n", $language, $binary);
+		next;
+	}
+	eval "use AutoLaTeX::Interpreter::$language;";
+	my $durations = run_benchmark($language, $code, $dir, $count);
+	printf("%-8s new interpreter for each image %7.2f s, worker %7.2f s\n",
+		$language, $durations->{'spawn'}, $durations->{'worker'});
+}
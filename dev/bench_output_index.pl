@@ -0,0 +1,127 @@
+#!/usr/bin/env perl
+#
+# Copyright (C) 2013-14  Stephane Galland <galland@arakhne.org>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 59 Temple Place - Suite 330,
+# Boston, MA 02111-1307, USA.
+
+#
+# Benchmark of the detection of the up-to-date images when the
+# translators are generating several files per image, eg. the layers
+# of a figure.
+#
+# Synthetic directories are filled with images and with their layers,
+# but without the main output files. The time for checking all the
+# images is measured with the index of the output directories, and
+# with a scan of the directory for each image as it was done before.
+#
+# Usage: dev/bench_output_index.pl [number of images]...
+#
+
+use strict;
+use File::Basename;
+use File::Spec;
+use File::Temp qw(tempdir);
+use Time::HiRes qw(time);
+
+use lib File::Spec->catdir(dirname(File::Spec->rel2abs(__FILE__)), '..', 'pm');
+
+use AutoLaTeX::Core::Util;
+use AutoLaTeX::Core::OS;
+use AutoLaTeX::Core::Translator;
+
+# Number of layers for each image
+my $LAYER_COUNT = 3;
+
+my %TRANSLATORS = (
+	'svg2pdf+layers' => {
+		'transdef' => {
+			'OUTPUT_EXTENSIONS' => { 'value' => [ '.pdf' ] },
+		},
+	},
+);
+
+# Create a directory with the given number of images and of their layers.
+sub create_directory($) {
+	my $count = shift;
+	my $dir = tempdir(CLEANUP => 1);
+	for(my $i=0; $i<$count; $i++) {
+		my $in = File::Spec->catfile($dir, "image$i.svg");
+		open(my $fh, '>', $in) or die("$in: $!\n");
+		close($fh);
+	}
+	# The dates of the files are in seconds, the layers must be more recent than the images
+	sleep(1);
+	for(my $i=0; $i<$count; $i++) {
+		for(my $j=0; $j<$LAYER_COUNT; $j++) {
+			my $layer = File::Spec->catfile($dir, "image${i}_layer$j.pdf");
+			open(my $fh, '>', $layer) or die("$layer: $!\n");
+			close($fh);
+		}
+	}
+	return $dir;
+}
+
+# Previous algorithm: scan the directory for each image.
+sub is_up_to_date_by_scan($$) {
+	my $in = shift;
+	my $out = shift;
+	my $inChange = lastFileChange("$in");
+	my $outChange = lastFileChange("$out");
+	if (!defined($outChange)) {
+		local *DIR;
+		my $dirname = dirname("$out");
+		if (opendir(*DIR, "$dirname")) {
+			my $fn;
+			my $bn = basename($out, '.pdf');
+			while (!defined($outChange) && ($fn = readdir(*DIR))) {
+				if (!isIgnorableDirectory($fn)
+						&& $fn =~ /^(\Q${bn}_\E.*)\Q.pdf\E$/s) {
+					$outChange = lastFileChange(File::Spec->catfile("$dirname", "$fn"));
+				}
+			}
+			closedir(*DIR);
+		}
+	}
+	return (defined($outChange) && $inChange<$outChange);
+}
+
+sub is_up_to_date_by_index($$) {
+	return AutoLaTeX::Core::Translator::_isTranslationUpToDate(\%TRANSLATORS, 'svg2pdf+layers', $_[0], $_[1]);
+}
+
+sub run_benchmark($$) {
+	my $dir = shift;
+	my $count = shift;
+	my %durations = ();
+	foreach my $method ([ 'scan', \&is_up_to_date_by_scan ], [ 'index', \&is_up_to_date_by_index ]) {
+		my $start = time;
+		for(my $i=0; $i<$count; $i++) {
+			my $in = File::Spec->catfile($dir, "image$i.svg");
+			my $out = File::Spec->catfile($dir, "image$i.pdf");
+			$method->[1]->($in, $out) or die("image$i is not detected as up-to-date\n");
+		}
+		$durations{$method->[0]} = time - $start;
+	}
+	return \%durations;
+}
+
+my @counts = @ARGV ? @ARGV : (100, 1000, 4000);
+foreach my $count (@counts) {
+	my $dir = create_directory($count);
+	my $durations = run_benchmark($dir, $count);
+	printf("%6d images, %6d files: scan for each image %8.3f s, directory index %8.3f s\n",
+		$count, $count * ($LAYER_COUNT + 1), $durations->{'scan'}, $durations->{'index'});
+}
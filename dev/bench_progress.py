@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2013-14  Stephane Galland <galland@arakhne.org>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 59 Temple Place - Suite 330,
+# Boston, MA 02111-1307, USA.
+
+#
+# Benchmark of the latency of the UI main loop while a runner
+# is receiving a storm of progress lines.
+#
+# A fake AutoLaTeX outputs thousands of progress lines. The progress
+# notifications are posted to a main loop, as the plugins are doing with
+# GObject.idle_add, and each of them is costing some processing time.
+# A probe that is simulating the keystrokes of the user measures how
+# long it waits before being processed by the main loop.
+#
+# Usage: dev/bench_progress.py [number of progress lines]
+#
+
+import os
+import sys
+import time
+import queue
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'libs', 'gtk3'))
+
+from autolatex.utils import runner
+from autolatex.utils import utils
+
+# Processing time of a progress notification by the UI
+UI_UPDATE_COST = 0.0005
+
+# Period of the keystrokes of the user
+KEYSTROKE_PERIOD = 0.01
+
+#
+# Minimal main loop: the events are processed in the order of their posting.
+#
+class MainLoop(object):
+
+  def __init__(self):
+    self._queue = queue.Queue()
+    self._running = True
+
+  def idle_add(self, callback, *args):
+    self._queue.put((callback, args))
+
+  def quit(self):
+    self._running = False
+    self._queue.put((lambda: None, ()))
+
+  def run(self):
+    while self._running:
+      callback, args = self._queue.get()
+      callback(*args)
+
+class Listener(runner.Listener):
+
+  def __init__(self, loop):
+    runner.Listener.__init__(self)
+    self._loop = loop
+    self.updates = 0
+
+  def get_runner_progress(self):
+    return True
+
+  def on_runner_progress(self, amount, comment):
+    self._loop.idle_add(self._update_ui, amount, comment)
+
+  def on_runner_finalize_execution(self, retcode, output, latex_warnings):
+    self._loop.idle_add(self._loop.quit)
+
+  def _update_ui(self, amount, comment):
+    self.updates += 1
+    time.sleep(UI_UPDATE_COST)
+
+def run_benchmark(script, progress_rate):
+  loop = MainLoop()
+  listener = Listener(loop)
+  latencies = []
+  done = threading.Event()
+  def keystrokes():
+    while not done.is_set():
+      posted = time.time()
+      loop.idle_add(lambda p=posted: latencies.append(time.time() - p))
+      time.sleep(KEYSTROKE_PERIOD)
+  utils.AUTOLATEX_BINARY = script
+  task = runner.Runner(listener, tempfile.gettempdir(), None, [], progress_rate=progress_rate)
+  probe = threading.Thread(target=keystrokes, daemon=True)
+  start = time.time()
+  task.start()
+  probe.start()
+  loop.run()
+  duration = time.time() - start
+  done.set()
+  latencies.sort()
+  return (listener.updates, duration, latencies[len(latencies) // 2], latencies[-1])
+
+def main():
+  count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+  fd, script = tempfile.mkstemp(suffix='.sh')
+  with os.fdopen(fd, 'w') as f:
+    f.write("#!/bin/sh\n")
+    f.write("i=0\nwhile [ $i -lt %d ]\ndo\n" % count)
+    f.write("  echo \"[ $((i * 100 / %d))%%] ###....... Translating image$i.svg\"\n" % count)
+    f.write("  i=$((i + 1))\n")
+    # Bursts of 100 lines every 50 ms
+    f.write("  if [ $((i % 100)) -eq 0 ]; then sleep 0.05; fi\n")
+    f.write("done\n")
+  os.chmod(script, 0o755)
+  try:
+    print("%d progress lines, UI update cost: %.1f ms" % (count, UI_UPDATE_COST * 1000))
+    for label, rate in (("unlimited", 0), ("10 per second", 10)):
+      updates, duration, median, worst = run_benchmark(script, rate)
+      print("%-14s UI updates: %6d, build: %6.2f s, keystroke latency: median %7.1f ms, max %7.1f ms" % (
+        label, updates, duration, median * 1000, worst * 1000))
+  finally:
+    os.unlink(script)
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2013-14  Stephane Galland <galland@arakhne.org>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 59 Temple Place - Suite 330,
+# Boston, MA 02111-1307, USA.
+
+#
+# Stress test of the backend queries and of the builds that are
+# run concurrently on several projects.
+#
+# Temporary project directories are created. A pool of threads is
+# changing and reading the configuration of each project with the
+# backend functions, and is running builds of each project with the
+# runners. The build is a fake AutoLaTeX that outputs its working
+# directory. Each result must belong to its own project, and the
+# working directory of the process must never change.
+#
+# Usage: dev/stress_concurrency.py [number of projects] [number of rounds]
+#
+
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import concurrent.futures
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'libs', 'gtk3'))
+
+from autolatex.utils import runner
+from autolatex.utils import utils
+
+# Number of threads of the pool
+THREAD_COUNT = 8
+
+# Period of the checking of the working directory, in seconds
+CWD_CHECK_PERIOD = 0.001
+
+class Listener(runner.Listener):
+
+  def __init__(self):
+    runner.Listener.__init__(self)
+    self.done = threading.Event()
+    self.output = None
+
+  def on_runner_finalize_execution(self, retcode, output, latex_warnings):
+    self.output = output
+    self.done.set()
+
+# Change the configuration of a project, and read it again.
+def query_backend(directory, index, round_count):
+  for round in range(round_count):
+    expected = 'project%d_%d.tex' % (index, round)
+    assert utils.backend_patch_configuration(directory, 'project', { 'generation': { 'main file': expected } }), \
+      "%s: the configuration cannot be changed" % directory
+    config = utils.backend_get_configuration(directory, 'project', 'generation').get('generation', {})
+    assert config.get('main file') == expected, \
+      "%s: main file is %r instead of %r" % (directory, config.get('main file'), expected)
+    bundle = utils.backend_get_bundle(directory, [ 'config:project:generation', 'translators' ])
+    config = bundle['config:project:generation'].get('generation', {})
+    assert config.get('main file') == expected, \
+      "%s: the bundle is not the bundle of the project" % directory
+
+# Build a project several times, and check the working directory of the builds.
+def build(directory, round_count):
+  for round in range(round_count):
+    listener = Listener()
+    runner.schedule(runner.Runner(listener, directory, 'all', []))
+    assert listener.done.wait(60), "%s: the build has not finished" % directory
+    assert listener.output.strip() == directory, \
+      "%s: the build was run in %r" % (directory, listener.output.strip())
+
+def main():
+  project_count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+  round_count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+  root = tempfile.mkdtemp()
+  cwd = os.getcwd()
+  failures = []
+  done = threading.Event()
+  def check_cwd():
+    while not done.is_set():
+      if os.getcwd() != cwd:
+        failures.append("the working directory has changed to %s" % os.getcwd())
+        return
+      done.wait(CWD_CHECK_PERIOD)
+  try:
+    # The fake AutoLaTeX fails for replying its working directory
+    # in the error output
+    script = os.path.join(root, 'autolatex.sh')
+    with open(script, 'w') as f:
+      f.write("#!/bin/sh\nsleep 0.1\npwd >&2\nexit 1\n")
+    os.chmod(script, 0o755)
+    utils.AUTOLATEX_BINARY = script
+    if not utils.AUTOLATEX_BACKEND_BINARY:
+      utils.AUTOLATEX_BACKEND_BINARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'autolatex-backend.pl')
+    directories = []
+    for i in range(project_count):
+      directory = os.path.realpath(os.path.join(root, 'project%d' % i))
+      os.mkdir(directory)
+      with open(os.path.join(directory, 'Main.tex'), 'w') as f:
+        f.write("\\documentclass{article}\n\\begin{document}\n%d\n\\end{document}\n" % i)
+      directories.append(directory)
+    checker = threading.Thread(target=check_cwd, daemon=True)
+    checker.start()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=THREAD_COUNT) as executor:
+      # The queries and the builds of a project are run in sequence
+      # for knowing their expected results
+      futures = []
+      for i, directory in enumerate(directories):
+        futures.append(executor.submit(query_backend, directory, i, round_count))
+        futures.append(executor.submit(build, directory, round_count))
+      for future in concurrent.futures.as_completed(futures):
+        try:
+          future.result()
+        except AssertionError as e:
+          failures.append(str(e))
+    done.set()
+    checker.join()
+  finally:
+    done.set()
+    utils.close_backend_connections()
+    shutil.rmtree(root)
+  print("%d projects, %d rounds, %d threads: %d failures" % (project_count, round_count, THREAD_COUNT, len(failures)))
+  for failure in failures:
+    print(failure)
+  sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+  main()
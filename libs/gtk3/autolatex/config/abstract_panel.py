@@ -22,12 +22,21 @@
 # IMPORTS
 #---------------------------------
 
+# Import standard python libs
+import copy
 # Include the Glib, Gtk and Gedit libraries
 from gi.repository import GObject, Gtk
 # AutoLaTeX internal libs
 from ..utils import utils
 from ..widgets import inherit_button
 
+#---------------------------------
+# INTERNATIONALIZATION
+#---------------------------------
+
+import gettext
+_T = gettext.gettext
+
 #---------------------------------
 # CLASS AbstractPanel
 #---------------------------------
@@ -45,14 +54,19 @@ class AbstractPanel(Gtk.Box):
   # @param directory - the name of the folder where the document is located, and
   #                    its AutoLaTeX configuration.
   # @param window - parent Gtk window.
-  def __init__(self, is_document_level, directory, window):
+  # @param bundle - the data replied by utils.backend_get_bundle(). If it
+  #                 is None, the panel displays a placeholder until load()
+  #                 is invoked.
+  def __init__(self, is_document_level, directory, window, bundle=None):
     # Use an intermediate GtkBox to be sure that
     # the child GtkGrid will not be expanded vertically
     Gtk.Box.__init__(self)
     self._is_document_level = is_document_level
     self._directory = directory
     self._window = window
+    self._bundle = None
     self._settings = None
+    self._is_loaded = False
     #
     # Create the grid for the panel
     #
@@ -68,21 +82,59 @@ class AbstractPanel(Gtk.Box):
     self._grid.set_property('hexpand', True)
     self._grid_row = 0
     #
+    # Create the placeholder that is displayed until the content is loaded
+    #
+    self._ui_placeholder = Gtk.Box()
+    self._ui_placeholder.set_property('orientation', Gtk.Orientation.HORIZONTAL)
+    self._ui_placeholder.set_property('margin', 5)
+    self._ui_placeholder.set_spacing(5)
+    ui_spinner = Gtk.Spinner()
+    ui_spinner.start()
+    self._ui_placeholder.pack_start(ui_spinner, False, False, 0)
+    self._ui_placeholder.pack_start(Gtk.Label(_T("Loading...")), False, False, 0)
+    self.pack_start(self._ui_placeholder, False, False, 0)
+    self._grid.set_no_show_all(True)
+    #
     # Create the panel's widgets
     #
     self._init_widgets()
     #
     # Initialize the content
     #
-    self._init_content()
-    #
-    # Update the state of the widgets
-    #
-    self.update_widget_states()
-    #
-    # Connext the signals
-    #
-    self._connect_signals()
+    if bundle is not None:
+      self.load(bundle)
+
+  # Fill the panel with the data from the backend, and
+  # replace the placeholder by the panel's widgets.
+  # @param bundle - the data replied by utils.backend_get_bundle().
+  #                 The missing data are directly read from the backend.
+  def load(self, bundle):
+    if not self._is_loaded:
+      self._bundle = bundle
+      #
+      # Initialize the content
+      #
+      self._init_content()
+      #
+      # Update the state of the widgets
+      #
+      self.update_widget_states()
+      #
+      # Connext the signals
+      #
+      self._connect_signals()
+      #
+      # Show the widgets
+      #
+      self._is_loaded = True
+      self._ui_placeholder.destroy()
+      self._ui_placeholder = None
+      self._grid.set_no_show_all(False)
+      self._grid.show_all()
+
+  # Replies if the content of the panel was loaded.
+  def is_loaded(self):
+    return self._is_loaded
 
   def _init_widgets(self):
     """Invoked to fill the given grid with the widgets"""
@@ -100,10 +152,31 @@ class AbstractPanel(Gtk.Box):
     """Invoked to change the states of the widgets"""
     raise NotImplementedError("Please implement this method")
 
-  def save(self):
-    """Invoked when the changes in the panel must be saved"""
+  def get_changes(self):
+    """Invoked to reply the changes in the panel, i.e. a dictionary of sections of changed values"""
     raise NotImplementedError("Please implement this method")
 
+  def changes_saved(self, changes):
+    """Invoked when the changes replied by get_changes() were saved"""
+    self._settings_saved(changes)
+
+  # Invoked when the changes in the panel must be saved
+  # without the other panels.
+  # @return true on success, false on error
+  def save(self):
+    changes = self.get_changes()
+    if not utils.backend_patch_configuration(self._directory, self.get_level(), changes):
+      return False
+    self.changes_saved(changes)
+    return True
+
+  # Replies the configuration level that is edited by the panel.
+  def get_level(self):
+    if self._is_document_level:
+      return 'project'
+    else:
+      return 'user'
+
   # Utility function that permits to change the sensitivity
   # of a widget according to a given flag and the "inheriting" flag
   def _update_sentitivity(self, widget, is_sensitive):
@@ -143,25 +216,70 @@ class AbstractPanel(Gtk.Box):
         return inherit_flag.get_overriding_value()
     return True
 
+  # Utility function that permits to get a data from the backend.
+  # The data is copied from the bundle given to the constructor if
+  # it is inside; otherwise the backend is invoked.
+  # @param part - the name of the data, see utils.backend_get_bundle().
+  # @return the data replied by the backend.
+  def _get_backend_data(self, part):
+    if self._bundle and part in self._bundle:
+      return copy.deepcopy(self._bundle[part])
+    return utils.backend_get_bundle(self._directory, [part])[part]
+
   # Utility function that permits to read the settings.
   def _read_settings(self, section):
-    self._settings = utils.backend_get_configuration(
-      self._directory,
-      'project' if self._is_document_level else 'user',
-      section)
+    self._settings = self._get_backend_data(
+      'config:%s:%s' % (('project' if self._is_document_level else 'user'), section))
     self._settings_section = section
+    self._saved_settings = copy.deepcopy(self._settings)
+    self._dirty_settings = set()
+
+  # Utility function that permits to store a value in the settings,
+  # and to mark the key as dirty if the value is not the saved one.
+  def _put_settings_value(self, key, value):
+    section = self._settings_section
+    self._settings.setdefault(section, {})[key] = value
+    if value == utils.CONFIG_EMPTY_VALUE:
+      value = None
+    if value != self._saved_settings.get(section, {}).get(key):
+      self._dirty_settings.add((section, key))
+    else:
+      self._dirty_settings.discard((section, key))
+
+  # Utility function that permits to reply the dirty keys of the settings.
+  # @return a dictionary of sections of changed values. A removed value is None.
+  def _get_settings_changes(self):
+    changes = {}
+    for section, key in self._dirty_settings:
+      value = self._settings.get(section, {}).get(key)
+      if value == utils.CONFIG_EMPTY_VALUE:
+        value = None
+      changes.setdefault(section, {})[key] = value
+    return changes
+
+  # Utility function that permits to mark the saved keys of the settings
+  # as not dirty.
+  # @param changes - the changes replied by _get_settings_changes().
+  def _settings_saved(self, changes):
+    for section in changes:
+      for key, value in changes[section].items():
+        if value is None:
+          self._saved_settings.get(section, {}).pop(key, None)
+        else:
+          self._saved_settings.setdefault(section, {})[key] = value
+        self._dirty_settings.discard((section, key))
 
   # Utility function to extract a string value from the settings
   def _get_settings_str(self, key, default_value=None):
-    if self._settings and self._settings.has_option(self._settings_section, key):
-      return str(self._settings.get(self._settings_section, key))
+    if self._settings is not None and key in self._settings.get(self._settings_section, {}):
+      return str(self._settings[self._settings_section][key])
     else:
       return default_value
 
   # Utility function to extract a boolean value from the settings
   def _get_settings_bool(self, key, default_value=None):
-    if self._settings and self._settings.has_option(self._settings_section, key):
-      return bool(self._settings.getboolean(self._settings_section, key))
+    if self._settings is not None and key in self._settings.get(self._settings_section, {}):
+      return bool(utils.parse_boolean(self._settings[self._settings_section][key]))
     else:
       return default_value
 
@@ -175,27 +293,26 @@ class AbstractPanel(Gtk.Box):
 
   # Utility function to set a string value from the settings
   def _set_settings_str(self, key, value):
-    if self._settings:
+    if self._settings is not None:
       if not value:
         value = utils.CONFIG_EMPTY_VALUE
-      self._settings.set(self._settings_section, key, value)
+      self._put_settings_value(key, value)
 
   # Utility function to set a boolean value from the settings
   def _set_settings_bool(self, key, value):
-    if self._settings:
+    if self._settings is not None:
       if value is None:
         value = utils.CONFIG_EMPTY_VALUE
       else:
         value = ('true' if value else 'false')
-      self._settings.set(self._settings_section, key, value)
+      self._put_settings_value(key, value)
 
   # Utility function to reset a section in the settings
   def _reset_settings_section(self, section=None):
-    if self._settings:
+    if self._settings is not None:
       if not section:
         section = self._settings_section
-      self._settings.remove_section(section)
-      self._settings.add_section(section)
+      self._settings[section] = {}
 
   # Utility function to create a label
   def _create_label(self, text, hexpand=False):
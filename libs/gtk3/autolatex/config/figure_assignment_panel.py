@@ -25,7 +25,6 @@
 # Standard libraries
 import os
 import re
-import configparser
 # Include the Glib, Gtk and Gedit libraries
 from gi.repository import Gtk
 # AutoLaTeX internal libs
@@ -47,8 +46,8 @@ _T = gettext.gettext
 class Panel(abstract_panel.AbstractPanel):
   __gtype_name__ = "AutoLaTeXFigureAssignmentPanel"
 
-  def __init__(self, is_document_level, directory, window):
-    abstract_panel.AbstractPanel.__init__(self, is_document_level, directory, window)
+  def __init__(self, is_document_level, directory, window, bundle=None):
+    abstract_panel.AbstractPanel.__init__(self, is_document_level, directory, window, bundle)
     
 
   #
@@ -84,10 +83,10 @@ class Panel(abstract_panel.AbstractPanel):
   # Initialize the content
   #
   def _init_content(self):
-    self._settings = utils.backend_get_translators(self._directory)
+    self._settings = self._get_backend_data('translators')
     self._translators = {}
     self._regex = re.compile('^([^2]+)')
-    for translator in self._settings.sections():
+    for translator in self._settings:
       result = re.match(self._regex, translator)
       if result:
         source = result.group(1)
@@ -95,30 +94,27 @@ class Panel(abstract_panel.AbstractPanel):
           self._translators[source] = []
         self._translators[source].append(translator)
         
-    self._settings = utils.backend_get_images(self._directory)
+    self._settings = self._get_backend_data('images')
     self._file_list = {}
-    for translator in self._settings.sections():
-      if self._settings.has_option(translator, 'automatic assignment'):
-        data = self._settings.get(translator, 'automatic assignment')
-        files = data.split(os.pathsep)
+    for translator in self._settings:
+      if 'automatic assignment' in self._settings[translator]:
+        files = self._settings[translator]['automatic assignment']
         for afile in files:
           if afile not in self._file_list:
             self._file_list[afile] = {}
           self._file_list[afile]['translator'] = translator
           self._file_list[afile]['override'] = False
           self._file_list[afile]['selected'] = translator
-      if self._settings.has_option(translator, 'files to convert'):
-        data = self._settings.get(translator, 'files to convert')
-        files = data.split(os.pathsep)
+      if 'files to convert' in self._settings[translator]:
+        files = self._settings[translator]['files to convert']
         for afile in files:
           if afile not in self._file_list:
             self._file_list[afile] = {}
           self._file_list[afile]['translator'] = translator
           self._file_list[afile]['override'] = True
           self._file_list[afile]['selected'] = translator
-      if self._settings.has_option(translator, 'overriden assignment'):
-        data = self._settings.get(translator, 'overriden assignment')
-        files = data.split(os.pathsep)
+      if 'overriden assignment' in self._settings[translator]:
+        files = self._settings[translator]['overriden assignment']
         for afile in files:
           if afile not in self._file_list:
             self._file_list[afile] = {}
@@ -172,22 +168,14 @@ class Panel(abstract_panel.AbstractPanel):
       self._file_list[afile]['selected'] = new_text
 
   def _append_file(self, config, section, option, afile):
-    if config.has_option(section, option):
-      path = config.get(section, option)
-      if path:
-        path = path+os.pathsep+afile
-      else:
-        path = afile
-    else:
-      path = afile
-    config.set(section, option, path)
-
-  # Invoked when the changes in the panel must be saved
-  def save(self):
-    config = configparser.ConfigParser()
+    config.setdefault(section, {}).setdefault(option, []).append(afile)
+
+  # Invoked to reply the changes in the panel
+  def get_changes(self):
+    config = {}
     for source in self._translators:
       for translator in self._translators[source]:
-        config.add_section(translator)
+        config[translator] = {}
     for afile in self._file_list:
       current = self._file_list[afile]['selected']
       if self._file_list[afile]['override']:
@@ -199,4 +187,17 @@ class Panel(abstract_panel.AbstractPanel):
       else:
         self._append_file(config, current, 'files to convert', afile)
         self._append_file(config, std, 'overriden assignment', afile)
-    return utils.backend_set_images(self._directory, config)
+    # Reply only the manual assignments that have changed
+    changes = {}
+    for translator in set(config) | set(self._settings):
+      new_files = sorted(config.get(translator, {}).get('files to convert', []))
+      old_files = sorted(self._settings.get(translator, {}).get('files to convert', []))
+      if new_files != old_files:
+        changes[translator] = { 'files to convert': (new_files if new_files else None) }
+    return changes
+
+  # Invoked when the changes replied by get_changes() were saved
+  def changes_saved(self, changes):
+    for translator in changes:
+      files = changes[translator]['files to convert']
+      self._settings.setdefault(translator, {})['files to convert'] = (files if files else [])
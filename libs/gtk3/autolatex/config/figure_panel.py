@@ -45,8 +45,8 @@ _T = gettext.gettext
 class Panel(abstract_panel.AbstractPanel):
   __gtype_name__ = "AutoLaTeXFigurePanel"
 
-  def __init__(self, is_document_level, directory, window):
-    abstract_panel.AbstractPanel.__init__(self, is_document_level, directory, window)
+  def __init__(self, is_document_level, directory, window, bundle=None):
+    abstract_panel.AbstractPanel.__init__(self, is_document_level, directory, window, bundle)
     
 
   #
@@ -247,8 +247,8 @@ class Panel(abstract_panel.AbstractPanel):
     self._check_figure_path_up_down(self._ui_figure_path_selection)
     self.update_widget_states()
 
-  # Invoked when the changes in the panel must be saved
-  def save(self):
+  # Invoked to reply the changes in the panel
+  def get_changes(self):
     self._reset_settings_section()
     #
     if self._get_sentitivity(self._ui_is_figure_generated_checkbox):
@@ -266,7 +266,4 @@ class Panel(abstract_panel.AbstractPanel):
       path = None
     self._set_settings_str('image directory', path)
     #
-    return utils.backend_set_configuration(
-        self._directory,
-        'project' if self._is_document_level else 'user',
-        self._settings)
+    return self._get_settings_changes()
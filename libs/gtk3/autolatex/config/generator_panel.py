@@ -108,8 +108,8 @@ class _IndexType:
 class Panel(abstract_panel.AbstractPanel):
   __gtype_name__ = "AutoLaTeXGeneratorPanel"
 
-  def __init__(self, is_document_level, directory, window):
-    abstract_panel.AbstractPanel.__init__(self, is_document_level, directory, window)
+  def __init__(self, is_document_level, directory, window, bundle=None):
+    abstract_panel.AbstractPanel.__init__(self, is_document_level, directory, window, bundle)
 
   #
   # Fill the grid
@@ -131,6 +131,12 @@ class Panel(abstract_panel.AbstractPanel):
     # SyncTeX
     self._ui_run_synctex_checkbox = self._create_switch(
         _T("Use SyncTeX when generating the document"))[1]
+    # Draft mode
+    self._ui_draft_mode_checkbox = self._create_switch(
+        _T("Do not produce the document in the intermediate LaTeX runs"))[1]
+    # Precompiled preamble
+    self._ui_precompiled_preamble_checkbox = self._create_switch(
+        _T("Precompile the preamble of the document"))[1]
     # Type of MakeIndex style
     r = self._create_combo(
         _T("Type of style for MakeIndex"),
@@ -174,6 +180,16 @@ class Panel(abstract_panel.AbstractPanel):
     self._init_overriding(self._ui_run_synctex_checkbox, cur is not None)
     self._ui_run_synctex_checkbox.set_active(utils.first_of(cur, inh, False))
     #
+    inh = self._get_settings_bool_inh('draft mode')
+    cur = self._get_settings_bool('draft mode')
+    self._init_overriding(self._ui_draft_mode_checkbox, cur is not None)
+    self._ui_draft_mode_checkbox.set_active(utils.first_of(cur, inh, False))
+    #
+    inh = self._get_settings_bool_inh('precompiled preamble')
+    cur = self._get_settings_bool('precompiled preamble')
+    self._init_overriding(self._ui_precompiled_preamble_checkbox, cur is not None)
+    self._ui_precompiled_preamble_checkbox.set_active(utils.first_of(cur, inh, False))
+    #
     inh = self._get_settings_str_inh('generation type')
     cur = self._get_settings_str('generation type')
     self._init_overriding(self._ui_generation_type_combo, cur is not None)
@@ -223,8 +239,8 @@ class Panel(abstract_panel.AbstractPanel):
   def on_generation_type_changed(self, widget, data=None):
     self.update_widget_states()
 
-  # Invoked when the changes in the panel must be saved
-  def save(self):
+  # Invoked to reply the changes in the panel
+  def get_changes(self):
     self._reset_settings_section()
     #
     if self._is_document_level and self._get_sentitivity(self._ui_main_tex_file_editor):
@@ -245,6 +261,18 @@ class Panel(abstract_panel.AbstractPanel):
       v = None
     self._set_settings_bool('synctex', v)
     #
+    if self._get_sentitivity(self._ui_draft_mode_checkbox):
+      v = self._ui_draft_mode_checkbox.get_active()
+    else:
+      v = None
+    self._set_settings_bool('draft mode', v)
+    #
+    if self._get_sentitivity(self._ui_precompiled_preamble_checkbox):
+      v = self._ui_precompiled_preamble_checkbox.get_active()
+    else:
+      v = None
+    self._set_settings_bool('precompiled preamble', v)
+    #
     if self._get_sentitivity(self._ui_generation_type_combo):
       v = _GenerationType.label(
           self._ui_generation_type_combo.get_active())
@@ -261,8 +289,5 @@ class Panel(abstract_panel.AbstractPanel):
       v = None
     self._set_settings_str('makeindex style', v)
     #
-    return utils.backend_set_configuration(
-      self._directory, 
-      'project' if self._is_document_level else 'user',
-      self._settings)
+    return self._get_settings_changes()
 
@@ -326,8 +326,8 @@ class _TranslatorCreationDialog(Gtk.Dialog):
 class Panel(abstract_panel.AbstractPanel):
   __gtype_name__ = "AutoLaTeXTranslatorPanel"
 
-  def __init__(self, is_document_level, directory, window):
-    abstract_panel.AbstractPanel.__init__(self, is_document_level, directory, window)
+  def __init__(self, is_document_level, directory, window, bundle=None):
+    abstract_panel.AbstractPanel.__init__(self, is_document_level, directory, window, bundle)
 
   #
   # Fill the grid
@@ -417,28 +417,28 @@ class Panel(abstract_panel.AbstractPanel):
       left_level = _Level.SYSTEM
       right_level = _Level.USER
     # Get the data from the backend
-    self._translator_config = utils.backend_get_translators(self._directory)
-    self._load_config = utils.backend_get_loads(self._directory)
+    self._translator_config = self._get_backend_data('translators')
+    self._load_config = self._get_backend_data('loads')
+    self._saved_load_flags = dict(self._load_config.get(self.get_level(), {}))
     # Build the conflict map and the inclusion states
     self._translator_conflict_candidates = {}
     self._translator_inclusions_constants = {}
     self._translator_inclusions = {}
-    self._translator_deletions = []
-    for translator in self._translator_config.sections():
-      source = self._translator_config.get(translator, 'full-source')
+    for translator in self._translator_config:
+      source = self._translator_config[translator]['full-source']
       if source not in self._translator_conflict_candidates:
         self._translator_conflict_candidates[source] = []
       self._translator_conflict_candidates[source].append(translator)
       self._translator_inclusions_constants[translator] = self._compute_inclusion_state(translator, left_level, right_level)
       self._translator_inclusions[translator] = self._compute_inclusion_state(translator, right_level, right_level)
     # Detect initial conflicts
-    for translator in self._translator_config.sections():
+    for translator in self._translator_config:
       self._update_translator_states(translator)
     # Fill the table
     self._translator_indexes = {}
     index = 0
-    for translator in self._translator_config.sections():
-      human_readable = self._translator_config.get(translator, 'human-readable')
+    for translator in self._translator_config:
+      human_readable = self._translator_config[translator]['human-readable']
       icon1 = self._get_level_icon(0, self._translator_inclusions_constants[translator])
       icon2 = self._get_level_icon(1, self._translator_inclusions[translator])
       self._ui_translator_list.append( [ icon1, icon2, translator, human_readable ] )
@@ -538,7 +538,7 @@ class Panel(abstract_panel.AbstractPanel):
     if inclusion_state != _IconType.EXCLUDED:
       # Detect any conflict
       is_includable = self._is_includable_with(translator, inclusion_state)
-      source = self._translator_config.get(translator, 'full-source')
+      source = self._translator_config[translator]['full-source']
       for candidate in self._translator_conflict_candidates[source]:
         if translator != candidate:
           other_state = self._translator_inclusions[candidate]
@@ -563,23 +563,23 @@ class Panel(abstract_panel.AbstractPanel):
   def _compute_inclusion_state(self, translator, query_level, editable_level):
     flag = _IconType.INHERITED
     if query_level < editable_level:
-      if self._load_config.has_option('system', translator):
-        flag = _IconType.INCLUDED if self._load_config.getboolean('system', translator) else _IconType.EXCLUDED
+      if translator in self._load_config.get('system', {}):
+        flag = _IconType.INCLUDED if utils.parse_boolean(self._load_config['system'][translator]) else _IconType.EXCLUDED
       if query_level > _Level.SYSTEM:
-        if self._load_config.has_option('user', translator):
-          flag = _IconType.INCLUDED if self._load_config.getboolean('user', translator) else _IconType.EXCLUDED
+        if translator in self._load_config.get('user', {}):
+          flag = _IconType.INCLUDED if utils.parse_boolean(self._load_config['user'][translator]) else _IconType.EXCLUDED
         if query_level > _Level.USER:
-          if self._load_config.has_option('project', translator):
-            flag = _IconType.INCLUDED if self._load_config.getboolean('project', translator) else _IconType.EXCLUDED
+          if translator in self._load_config.get('project', {}):
+            flag = _IconType.INCLUDED if utils.parse_boolean(self._load_config['project'][translator]) else _IconType.EXCLUDED
     elif query_level == _Level.SYSTEM:
-      if self._load_config.has_option('system', translator):
-        flag = _IconType.INCLUDED if self._load_config.getboolean('system', translator) else _IconType.EXCLUDED
+      if translator in self._load_config.get('system', {}):
+        flag = _IconType.INCLUDED if utils.parse_boolean(self._load_config['system'][translator]) else _IconType.EXCLUDED
     elif query_level == _Level.USER:
-      if self._load_config.has_option('user', translator):
-        flag = _IconType.INCLUDED if self._load_config.getboolean('user', translator) else _IconType.EXCLUDED
+      if translator in self._load_config.get('user', {}):
+        flag = _IconType.INCLUDED if utils.parse_boolean(self._load_config['user'][translator]) else _IconType.EXCLUDED
     else:
-      if self._load_config.has_option('project', translator):
-        flag = _IconType.INCLUDED if self._load_config.getboolean('project', translator) else _IconType.EXCLUDED
+      if translator in self._load_config.get('project', {}):
+        flag = _IconType.INCLUDED if utils.parse_boolean(self._load_config['project'][translator]) else _IconType.EXCLUDED
     return flag
 
   # Translate the state by removing the conflict flag
@@ -608,7 +608,7 @@ class Panel(abstract_panel.AbstractPanel):
       list_iter = self._ui_translator_list.get_iter(path)
       translator = self._ui_translator_list[list_iter][2]
       # Update the buttons
-      translator_filename = self._translator_config.get(translator, 'file')
+      translator_filename = self._translator_config[translator]['file']
       if translator_filename:
         translator_filename = os.path.dirname(translator_filename)
         delete_button_sensitivity = os.access(translator_filename, os.W_OK)
@@ -620,7 +620,7 @@ class Panel(abstract_panel.AbstractPanel):
         # Move up
         inclusion_state = (inclusion_state + 1) % 3
         # Reset the states for the group
-        source = self._translator_config.get(translator, 'full-source')
+        source = self._translator_config[translator]['full-source']
         for candidate in self._translator_conflict_candidates[source]:
           if translator != candidate:
             other_state = self._translator_inclusions[candidate]
@@ -735,9 +735,9 @@ class Panel(abstract_panel.AbstractPanel):
     self._translator_config = utils.backend_get_translators(self._directory)
     # Search the new translator
     translator = ''
-    for t in self._translator_config.sections():
-      if self._translator_config.has_option(t, 'file'):
-        f = self._translator_config.get(t, 'file')
+    for t in self._translator_config:
+      if 'file' in self._translator_config[t]:
+        f = self._translator_config[t]['file']
         if f == filename:
           translator = t
           break
@@ -750,17 +750,17 @@ class Panel(abstract_panel.AbstractPanel):
         left_level = _Level.SYSTEM
         right_level = _Level.USER
       # Update the conflict map and the inclusion states
-      source = self._translator_config.get(translator, 'full-source')
+      source = self._translator_config[translator]['full-source']
       if source not in self._translator_conflict_candidates:
         self._translator_conflict_candidates[source] = []
       self._translator_conflict_candidates[source].append(translator)
       self._translator_inclusions_constants[translator] = self._compute_inclusion_state(translator, left_level, right_level)
       self._translator_inclusions[translator] = self._compute_inclusion_state(translator, right_level, right_level)
       # Detect new conflicts
-      for t in self._translator_config.sections():
+      for t in self._translator_config:
         self._update_translator_states(t)
       # Add in the table
-      human_readable = self._translator_config.get(translator, 'human-readable')
+      human_readable = self._translator_config[translator]['human-readable']
       icon1 = self._get_level_icon(0, self._translator_inclusions_constants[translator])
       icon2 = self._get_level_icon(1, self._translator_inclusions[translator])
       insert_index = gtk_utils.get_insert_index_dichotomic(
@@ -814,7 +814,7 @@ class Panel(abstract_panel.AbstractPanel):
     dialog.destroy()
     if answer == Gtk.ResponseType.YES:
       # Remove the file
-      translator_filename = self._translator_config.get(translator, 'file')
+      translator_filename = self._translator_config[translator]['file']
       os.unlink(translator_filename)
       # Remove from the table
       self._ui_translator_list.remove(select_iter)
@@ -824,10 +824,9 @@ class Panel(abstract_panel.AbstractPanel):
         if the_index<=self._translator_indexes[t]:
           self._translator_indexes[t] = self._translator_indexes[t] - 1
       # Clear the conflict map and the inclusion states
-      source = self._translator_config.get(translator, 'full-source')
+      source = self._translator_config[translator]['full-source']
       self._translator_conflict_candidates[source].remove(translator)
       del self._translator_inclusions[translator]
-      self._translator_deletions.append(translator)
       # Reset the states of the other translators related to the removed one.
       for other_translator in self._translator_conflict_candidates[source]:
         other_state = self._translator_inclusions[other_translator]
@@ -837,13 +836,10 @@ class Panel(abstract_panel.AbstractPanel):
       for other_translator in self._translator_conflict_candidates[source]:
         self._update_translator_states(other_translator)
       # Remove the translator from the backend data
-      self._translator_config.remove_section(translator)
-      if self._is_document_level:
-        section_name = 'project'
-      else:
-        section_name = 'user'
-      if self._load_config.has_section(section_name) and self._load_config.has_option(section_name, translator):
-        self._load_config.remove_option(section_name, translator)
+      del self._translator_config[translator]
+      section_name = self.get_level()
+      if translator in self._load_config.get(section_name, {}):
+        del self._load_config[section_name][translator]
       # Update the UI
       for translator in self._translator_conflict_candidates[source]:
         inclusion_state = self._translator_inclusions[translator]
@@ -854,22 +850,32 @@ class Panel(abstract_panel.AbstractPanel):
 
 
 
-  # Invoked when the changes in the panel must be saved
-  def save(self):
-    if self._is_document_level:
-      section_name = 'project'
-    else:
-      section_name = 'user'
-    self._load_config.remove_section(section_name)
-    self._load_config.add_section(section_name)
+  # Invoked to reply the changes in the panel
+  def get_changes(self):
+    section_name = self.get_level()
+    self._load_config[section_name] = {}
     # Save the loading state of the translators
     for translator in self._translator_inclusions:
       state = self._translator_inclusions[translator]
       if state == _IconType.INCLUDED or state == _IconType.CONFLICT:
-        self._load_config.set(section_name, translator, 'true')
+        self._load_config[section_name][translator] = True
       elif state == _IconType.EXCLUDED:
-        self._load_config.set(section_name, translator, 'false')
-    # Force the removed translators to be removed from the configuration
-    for translator in self._translator_deletions:
-      self._load_config.set(section_name, translator, utils.CONFIG_EMPTY_VALUE)
-    return utils.backend_set_loads(self._directory, self._load_config)
+        self._load_config[section_name][translator] = False
+    # Send only the loading flags that have changed; the removed
+    # translators are removed from the configuration.
+    new_flags = self._load_config[section_name]
+    changes = {}
+    for translator in set(new_flags) | set(self._saved_load_flags):
+      value = new_flags.get(translator)
+      if value != self._saved_load_flags.get(translator):
+        changes[translator] = { 'include module': value }
+    return changes
+
+  # Invoked when the changes replied by get_changes() were saved
+  def changes_saved(self, changes):
+    for translator in changes:
+      value = changes[translator]['include module']
+      if value is None:
+        self._saved_load_flags.pop(translator, None)
+      else:
+        self._saved_load_flags[translator] = value
@@ -43,8 +43,8 @@ _T = gettext.gettext
 class Panel(abstract_panel.AbstractPanel):
   __gtype_name__ = "AutoLaTeXViewerPanel"
 
-  def __init__(self, is_document_level, directory, window):
-    abstract_panel.AbstractPanel.__init__(self, is_document_level, directory, window)
+  def __init__(self, is_document_level, directory, window, bundle=None):
+    abstract_panel.AbstractPanel.__init__(self, is_document_level, directory, window, bundle)
 
   #
   # Fill the grid
@@ -99,8 +99,8 @@ class Panel(abstract_panel.AbstractPanel):
   def on_launch_viewer_toggled(self, widget, data=None):
     self.update_widget_states()
 
-  # Invoked when the changes in the panel must be saved
-  def save(self):
+  # Invoked to reply the changes in the panel
+  def get_changes(self):
     self._reset_settings_section()
     #
     if self._get_sentitivity(self._ui_launch_viewer_checkbox):
@@ -115,6 +115,5 @@ class Panel(abstract_panel.AbstractPanel):
       v = None
     self._set_settings_str('viewer', v)
     #
-    return utils.backend_set_configuration(self._directory,
-      'project' if self._is_document_level else 'user', self._settings)
+    return self._get_settings_changes()
 
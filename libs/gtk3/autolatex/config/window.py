@@ -23,9 +23,10 @@
 #---------------------------------
 
 # Include the Glib, Gtk and Gedit libraries
-from gi.repository import Gtk, GdkPixbuf
+from gi.repository import GObject, Gtk, GdkPixbuf
 # AutoLaTeX internal libs
 from ..utils import utils
+from ..utils import gtk_utils
 from . import generator_panel, figure_panel, figure_assignment_panel, translator_panel, viewer_panel
 
 #---------------------------------
@@ -44,6 +45,16 @@ def open_configuration_dialog(parent, is_document_level, directory):
   dialog.run()
   dialog.destroy()
 
+# Replies the parts of the backend data that are needed by the panels.
+# @param is_document_level - indicates if the configuration is at the document level.
+# @return the parts for utils.backend_get_bundle().
+def _get_bundle_parts(is_document_level):
+  level = 'project' if is_document_level else 'user'
+  parts = [ 'translators', 'loads', 'config:%s:generation' % level, 'config:%s:viewer' % level ]
+  if is_document_level:
+    parts.append('images')
+  return parts
+
 #---------------------------------
 # CLASS NotbookTab
 #---------------------------------
@@ -67,6 +78,41 @@ class _NotebookTab(Gtk.Box):
   def get_text(self):
     return self._label
 
+#---------------------------------
+# CLASS LazyNotebookPage
+#---------------------------------
+
+# Page of the notebook that is creating its configuration
+# panel only when it is needed.
+class _LazyNotebookPage(Gtk.Box):
+  __gtype_name__ = "AutoLaTeXConfigurationLazyNotebookPage"
+
+  # @param panel_type - the type of the panel to create.
+  # @param is_document_level - indicates if the configuration is at the document level.
+  # @param directory - the directory of the document.
+  # @param window - the configuration window.
+  def __init__(self, panel_type, is_document_level, directory, window):
+    Gtk.Box.__init__(self)
+    self.set_property('orientation', Gtk.Orientation.VERTICAL)
+    self._panel_type = panel_type
+    self._is_document_level = is_document_level
+    self._directory = directory
+    self._window = window
+    self._panel = None
+
+  # Create the panel if it was not yet created.
+  # @param bundle - the data replied by the backend, or None if
+  #                 the data is not yet available.
+  def materialize(self, bundle):
+    if self._panel is None:
+      self._panel = self._panel_type.Panel(self._is_document_level, self._directory, self._window, bundle)
+      self.pack_start(self._panel, True, True, 0)
+      self._panel.show_all()
+
+  # Replies the panel, or None if it was not yet created.
+  def get_panel(self):
+    return self._panel
+
 #---------------------------------
 # CLASS AutoLaTeXConfigurationWindow
 #---------------------------------
@@ -81,49 +127,103 @@ class _Window(Gtk.Dialog):
       parent, 0,
       ( Gtk.STOCK_CANCEL, Gtk.ResponseType.CANCEL, Gtk.STOCK_APPLY, Gtk.ResponseType.APPLY))
     self.set_default_size(600, 500)
+    self._is_document_level = is_document_level
+    self._directory = directory
+    self._bundle = None
+    self._is_destroyed = False
     # Notebook
     self._ui_notebook = Gtk.Notebook()
     self.get_content_area().add(self._ui_notebook);
-    # Tab for translators
-    tab = generator_panel.Panel(is_document_level, directory, self)
-    self._ui_notebook.append_page(
-        tab,
-        _NotebookTab(
-          _T("Generator"), "autolatex-compile.png"))
-    tab = figure_panel.Panel(is_document_level, directory, self)
-    self._ui_notebook.append_page(
-        tab,
-        _NotebookTab(
-          _T("Figures"), "autolatex-images.png"))
+    # Tabs; the panels are created when their tabs are selected
+    self._add_page(generator_panel, is_document_level, directory,
+        _T("Generator"), "autolatex-compile.png")
+    self._add_page(figure_panel, is_document_level, directory,
+        _T("Figures"), "autolatex-images.png")
     if is_document_level:
-      tab = figure_assignment_panel.Panel(is_document_level, directory, self)
-      self._ui_notebook.append_page(
-          tab,
-          _NotebookTab(
-            _T("List of figures"), "autolatex-images.png"))
-    tab = translator_panel.Panel(is_document_level, directory, self)
-    self._ui_notebook.append_page(
-        tab,
-        _NotebookTab(
-          _T("Translators"), "autolatex-images.png"))
-    tab = viewer_panel.Panel(is_document_level, directory, self)
-    self._ui_notebook.append_page(
-        tab,
-        _NotebookTab(
-          _T("Viewer"), "autolatex-view.png"))
+      self._add_page(figure_assignment_panel, is_document_level, directory,
+          _T("List of figures"), "autolatex-images.png")
+    self._add_page(translator_panel, is_document_level, directory,
+        _T("Translators"), "autolatex-images.png")
+    self._add_page(viewer_panel, is_document_level, directory,
+        _T("Viewer"), "autolatex-view.png")
+    self._ui_notebook.get_nth_page(0).materialize(self._bundle)
     self.show_all()
-    # Listening the response signal
+    # Listening the signals
     self.connect('response', self.on_response_signal);
+    self.connect('destroy', self.on_destroy_signal);
+    self._ui_notebook.connect('switch-page', self.on_switch_page_signal);
+    # Read the data of all the panels with a single asynchronous
+    # invocation of the backend; the panels display placeholders
+    # until the data is received.
+    utils.backend_get_bundle_async(directory, _get_bundle_parts(is_document_level),
+        callback=gtk_utils.ui_callback(self._on_bundle_loaded))
+
+  # Add a page in the notebook.
+  # @param panel_type - the type of the panel in the page.
+  # @param is_document_level - indicates if the configuration is at the document level.
+  # @param directory - the directory of the document.
+  # @param label - the label of the tab.
+  # @param icon - the icon of the tab.
+  def _add_page(self, panel_type, is_document_level, directory, label, icon):
+    self._ui_notebook.append_page(
+        _LazyNotebookPage(panel_type, is_document_level, directory, self),
+        _NotebookTab(label, icon))
+
+  # Callback invoked in the UI thread when the data of the panels
+  # were replied by the backend.
+  # @param bundle - the data replied by the backend, or None on error.
+  def _on_bundle_loaded(self, bundle):
+    if not self._is_destroyed:
+      if bundle is None:
+        bundle = {}
+      self._bundle = bundle
+      for i in range(self._ui_notebook.get_n_pages()):
+        panel = self._ui_notebook.get_nth_page(i).get_panel()
+        if panel:
+          panel.load(bundle)
+      # Prefetch the other panels when the UI is idle
+      GObject.idle_add(self._prefetch_next_page, priority=GObject.PRIORITY_LOW)
+
+  # Create the next panel that was not yet created.
+  # @return True if another panel must be created.
+  def _prefetch_next_page(self):
+    if not self._is_destroyed:
+      for i in range(self._ui_notebook.get_n_pages()):
+        page = self._ui_notebook.get_nth_page(i)
+        if page.get_panel() is None:
+          page.materialize(self._bundle)
+          return True
+    return False
+
+  # Callback for the selection of a tab.
+  def on_switch_page_signal(self, notebook, page, page_num, data=None):
+    page.materialize(self._bundle)
+
+  # Callback for destroy of the dialog
+  def on_destroy_signal(self, widget, data=None):
+    self._is_destroyed = True
 
   # Callback for response in the dialog
   def on_response_signal(self, action, data=None):
     if data == Gtk.ResponseType.APPLY:
+      # Collect the changes of all the panels, and save
+      # them with a single invocation of the backend.
+      changes = {}
+      panel_changes = []
       for i in range(self._ui_notebook.get_n_pages()):
-        page = self._ui_notebook.get_nth_page(i)
-        result = page.save()
-        if not result:
-          tab_label = self._ui_notebook.get_tab_label(page)
-          dialog = Gtk.MessageDialog(self, Gtk.DialogFlags.MODAL, Gtk.MessageType.WARNING, Gtk.ButtonsType.OK, _T("The page '%s' cannot save its fields.\n You will loose the changes on this pages.") % tab_label.get_text())
-          answer = dialog.run()
-          dialog.destroy()
+        panel = self._ui_notebook.get_nth_page(i).get_panel()
+        if panel is None or not panel.is_loaded():
+          continue
+        panel_change = panel.get_changes()
+        for section in panel_change:
+          changes.setdefault(section, {}).update(panel_change[section])
+        panel_changes.append((panel, panel_change))
+      level = 'project' if self._is_document_level else 'user'
+      if utils.backend_patch_configuration(self._directory, level, changes):
+        for panel, panel_change in panel_changes:
+          panel.changes_saved(panel_change)
+      else:
+        dialog = Gtk.MessageDialog(self, Gtk.DialogFlags.MODAL, Gtk.MessageType.WARNING, Gtk.ButtonsType.OK, _T("The configuration cannot be saved.\n You will loose the changes."))
+        answer = dialog.run()
+        dialog.destroy()
 
@@ -69,6 +69,11 @@ class Manager:
         'force-synctex': True,
         'show-progress-info': True,
         'save-before-run-autolatex': True,
+        'build-timeout': 0,
+        'build-memory-limit': 0,
+        'build-niceness': 0,
+        'build-resident-worker': True,
+        'build-on-save': False,
       }
 
   # Unbind this manager to the Gsettings daemon.
@@ -202,3 +207,80 @@ class Manager:
     else:
       self._data['save-before-run-autolatex'] = bool(is_saving)
 
+  # Replies the maximal duration of a build in seconds, or 0 if unlimited.
+  def get_build_timeout(self):
+    if self.settings:
+      return self.settings.get_int('build-timeout')
+    else:
+      return self._data['build-timeout']
+
+  # Change the maximal duration of a build in seconds, or 0 if unlimited.
+  def set_build_timeout(self, timeout):
+    if self.settings:
+      self.settings.set_int('build-timeout', max(0, int(timeout)))
+      self.settings.apply()
+    else:
+      self._data['build-timeout'] = max(0, int(timeout))
+
+  # Replies the maximal memory of the processes of a build in megabytes,
+  # or 0 if unlimited.
+  def get_build_memory_limit(self):
+    if self.settings:
+      return self.settings.get_int('build-memory-limit')
+    else:
+      return self._data['build-memory-limit']
+
+  # Change the maximal memory of the processes of a build in megabytes,
+  # or 0 if unlimited.
+  def set_build_memory_limit(self, limit):
+    if self.settings:
+      self.settings.set_int('build-memory-limit', max(0, int(limit)))
+      self.settings.apply()
+    else:
+      self._data['build-memory-limit'] = max(0, int(limit))
+
+  # Replies the niceness of the processes of a build.
+  def get_build_niceness(self):
+    if self.settings:
+      return self.settings.get_int('build-niceness')
+    else:
+      return self._data['build-niceness']
+
+  # Change the niceness of the processes of a build.
+  def set_build_niceness(self, niceness):
+    niceness = min(19, max(0, int(niceness)))
+    if self.settings:
+      self.settings.set_int('build-niceness', niceness)
+      self.settings.apply()
+    else:
+      self._data['build-niceness'] = niceness
+
+  # Replies if the builds are run by a resident AutoLaTeX for each project.
+  def get_build_resident_worker(self):
+    if self.settings:
+      return self.settings.get_boolean('build-resident-worker')
+    else:
+      return self._data['build-resident-worker']
+
+  # Enable or disable the resident AutoLaTeX for each project.
+  def set_build_resident_worker(self, is_resident):
+    if self.settings:
+      self.settings.set_boolean('build-resident-worker', bool(is_resident))
+      self.settings.apply()
+    else:
+      self._data['build-resident-worker'] = bool(is_resident)
+
+  # Replies if the document is built when one of its files is saved.
+  def get_build_on_save(self):
+    if self.settings:
+      return self.settings.get_boolean('build-on-save')
+    else:
+      return self._data['build-on-save']
+
+  # Enable or disable the build of the document when one of its files is saved.
+  def set_build_on_save(self, is_building):
+    if self.settings:
+      self.settings.set_boolean('build-on-save', bool(is_building))
+      self.settings.apply()
+    else:
+      self._data['build-on-save'] = bool(is_building)
@@ -23,7 +23,7 @@
 #---------------------------------
 
 # Import standard python libs
-from gi.repository import Gtk
+from gi.repository import GObject, Gtk
 
 #---------------------------------
 # GLOBAL FUNCTIONS
@@ -52,3 +52,16 @@ def get_insert_index_dichotomic(list_store, column, data):
       f = c+1
   return f
 
+# Replies a function that is invoking the given callback in
+# the Gtk main loop. It permits to receive in the UI thread
+# the results of the asynchronous backend functions.
+# @param callback - the function to invoke in the UI thread.
+# @return the function to give to the asynchronous backend functions.
+def ui_callback(callback):
+  def _invoke_later(*args):
+    def _invoke():
+      callback(*args)
+      return False
+    GObject.idle_add(_invoke)
+  return _invoke_later
+
@@ -25,7 +25,13 @@
 # Import standard python libs
 import os
 import re
+import sys
+import time
+import json
+import signal
+import selectors
 import subprocess
+import collections
 
 # Try to use the threading library if it is available
 try:
@@ -33,27 +39,517 @@ try:
 except ImportError:
   import dummy_threading as _threading
 
+# The resource limits are available only on Unix platforms
+try:
+  import resource
+except ImportError:
+  resource = None
+
 # Import AutoLaTeX libraries
 from . import utils
 
+#---------------------------------
+# INTERNATIONALIZATION
+#---------------------------------
+
+import gettext
+_T = gettext.gettext
+
 #---------------------------------
 # GLOBAL VARIABLES
 #---------------------------------
 
-# List of all the runners
-_all_runners = []
+# Size of the blocks read from the outputs of AutoLaTeX
+_READ_BUFFER_SIZE = 4096
+
+# Default maximal number of progress notifications per second
+_PROGRESS_RATE = 10
+
+# Duration without change of the files of a document, in seconds,
+# after which a build is triggered
+_BUILD_TRIGGER_DELAY = 0.5
+
+# Regular expressions for the diagnostic messages of AutoLaTeX
+_CODED_WARNING_PATTERN = re.compile("^\\!\\!(.+?):(W[0-9]+):[^:]+:\\s*(.+?)\\s*$")
+_WARNING_PATTERN = re.compile("^(.+?):([0-9]+):\\s*warning:\\s*(.*?)\\s*$")
+_ERROR_PATTERN = re.compile("^(.+?):([0-9]+):\\s*(.*?)\\s*$")
+
+# Regular expressions for the progress and phase events of AutoLaTeX
+_PROGRESS_PATTERN = re.compile("^\\[\\s*([0-9]+)\\%\\]\\s+[#.]+(.*)$")
+_PHASE_START_PATTERN = re.compile("^\\[phase:start\\]\\s+(.*?)\\s*$")
+_PHASE_END_PATTERN = re.compile("^\\[phase:end\\]\\s+([0-9.]+)\\s+(.*?)\\s*$")
+
+# Notifications of the resident AutoLaTeX workers
+_WORKER_BUILD_PATTERN = re.compile("^\\[worker:build\\]\\s+([0-9]+)\\s*$")
+_WORKER_DONE_MARKER = '[worker:done]'
+_WORKER_DONE_PATTERN = re.compile("^\\[worker:done\\]\\s+([0-9]+)\\s+([0-9.]+)(?:\\s+([0-9]+))?\\s*$")
 
 #---------------------------------
 # FUNCTIONS
 #---------------------------------
 
-# Kill all the lancuhed runners.
+# Parse a line of the error output of AutoLaTeX.
+# @param line - the line to parse.
+# @return the tuple (kind, filename, line, code, text), or None if
+#         the line is not a diagnostic message.
+def _parse_message(line):
+  mo = re.match(_CODED_WARNING_PATTERN, line)
+  if mo:
+    return (MessageKind.WARNING, mo.group(1), 0, mo.group(2), mo.group(3))
+  mo = re.match(_WARNING_PATTERN, line)
+  if mo:
+    return (MessageKind.WARNING, mo.group(1), int(mo.group(2)), None, mo.group(3))
+  mo = re.match(_ERROR_PATTERN, line)
+  if mo:
+    return (MessageKind.ERROR, mo.group(1), int(mo.group(2)), None, mo.group(3))
+  return None
+
+# Launch a runner with the build scheduler.
+# @param runner - the runner to launch.
+def schedule(runner):
+  _SCHEDULER.schedule(runner)
+
+# Kill all the launched and waiting runners.
 def kill_all_runners():
-  global _all_runners
-  tab = _all_runners
-  _all_runners = []
-  for r in tab:
-    r.cancel()
+  _SCHEDULER.cancel_all()
+
+# Stop all the resident AutoLaTeX workers.
+def stop_all_workers():
+  _WORKERS.stop_all()
+
+#---------------------------------
+# CLASS: _Scheduler
+#---------------------------------
+
+#
+# Scheduler of the runners that are shared by all the
+# windows of the process:
+# - at most one runner is running for each project directory;
+# - the runners that are launched while a runner is running for the
+#   same directory are collapsed into a single following runner;
+# - a runner for 'all' cancels a running runner for 'images';
+# - the number of running runners is limited to the number of cores.
+#
+class _Scheduler(object):
+
+  def __init__(self):
+    self._lock = _threading.RLock()
+    self._max_running = max(1, os.cpu_count() or 1)
+    # Map from the directories to the running runners
+    self._running = {}
+    # Map from the directories to the waiting runners,
+    # in the order of their launching
+    self._waiting = collections.OrderedDict()
+
+  # Launch the given runner, or put it in the waiting queue.
+  # @param runner - the runner to launch.
+  def schedule(self, runner):
+    dropped_runners = []
+    with self._lock:
+      directory = runner.get_directory()
+      running = self._running.get(directory)
+      waiting = self._waiting.pop(directory, None)
+      if waiting is not None:
+        if waiting.get_directive() == 'all' and runner.get_directive() == 'images':
+          # The waiting runner is already generating the images
+          dropped_runners.append(runner)
+          runner = waiting
+        else:
+          dropped_runners.append(waiting)
+      if running is not None:
+        if runner.get_directive() == 'all' and running.get_directive() == 'images' and not running.is_cancelled():
+          dropped_runners.append(running)
+        self._waiting[directory] = runner
+      elif len(self._running) >= self._max_running:
+        self._waiting[directory] = runner
+      else:
+        self._running[directory] = runner
+        runner.start()
+    for dropped_runner in dropped_runners:
+      if dropped_runner is running:
+        dropped_runner.cancel()
+      else:
+        # The waiting runners have never notified the UI
+        dropped_runner.discard()
+
+  # Invoked by a runner when its task is finished.
+  # The next waiting runner is launched.
+  # @param runner - the finished runner.
+  def finished(self, runner):
+    with self._lock:
+      directory = runner.get_directory()
+      if self._running.get(directory) is runner:
+        del self._running[directory]
+      for directory in list(self._waiting):
+        if len(self._running) >= self._max_running:
+          break
+        if directory not in self._running:
+          next_runner = self._waiting.pop(directory)
+          self._running[directory] = next_runner
+          next_runner.start()
+
+  # Cancel the running and the waiting runners.
+  def cancel_all(self):
+    with self._lock:
+      waiting_runners = list(self._waiting.values())
+      running_runners = list(self._running.values())
+      self._waiting.clear()
+      self._running.clear()
+    for runner in waiting_runners:
+      runner.discard()
+    for runner in running_runners:
+      runner.cancel()
+
+_SCHEDULER = _Scheduler()
+
+#---------------------------------
+# CLASS: _Worker
+#---------------------------------
+
+#
+# A resident AutoLaTeX for a project, launched with the option
+# '--worker'. The worker keeps the configuration, the translators
+# and the list of the images in memory, and runs each build that
+# is requested on its standard input in a child process.
+#
+class _Worker(object):
+
+  # Constructor.
+  # @param directory - the directory of the project.
+  # @param cmd - the command line of AutoLaTeX, without the command.
+  # @param key - the values that must be the same for reusing the worker.
+  # @param preexec_fn - the function invoked in the worker before
+  #                     AutoLaTeX is launched.
+  def __init__(self, directory, cmd, key, preexec_fn):
+    self._key = key
+    self._build_pid = 0
+    self._process = subprocess.Popen(cmd + [ '--worker' ],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        cwd=directory, start_new_session=True, preexec_fn=preexec_fn)
+
+  # Replies the values that must be the same for reusing the worker.
+  def get_key(self):
+    return self._key
+
+  # Replies the process of the worker.
+  def get_process(self):
+    return self._process
+
+  # Replies if the worker is running.
+  def is_alive(self):
+    return self._process.poll() is None
+
+  # Change the process identifier of the running build.
+  # @param pid - the process identifier, or 0 if no build is running.
+  def set_build_pid(self, pid):
+    self._build_pid = pid
+
+  # Send a build request to the worker.
+  # @param directive - the AutoLaTeX command, e.g. 'clean', 'all', etc.
+  # @return true if the request was sent, false if the worker is dead.
+  def request(self, directive):
+    try:
+      self._process.stdin.write(("build %s\n" % (directive or '')).encode())
+      self._process.stdin.flush()
+      return True
+    except (OSError, ValueError):
+      return False
+
+  # Terminate the running build and all the processes it has launched.
+  # @return true if the build was terminated, false if the build is not known.
+  def cancel_build(self):
+    if not self._build_pid:
+      return False
+    try:
+      os.killpg(self._build_pid, signal.SIGTERM)
+    except OSError:
+      pass
+    return True
+
+  # Stop the worker and its running build.
+  def stop(self):
+    self.cancel_build()
+    try:
+      self._process.stdin.close()
+    except (OSError, ValueError):
+      pass
+    try:
+      os.killpg(self._process.pid, signal.SIGTERM)
+    except OSError:
+      pass
+
+#---------------------------------
+# CLASS: _WorkerPool
+#---------------------------------
+
+#
+# The resident AutoLaTeX workers of the process, at
+# most one for each project directory.
+#
+class _WorkerPool(object):
+
+  def __init__(self):
+    self._lock = _threading.Lock()
+    # Map from the directories to the workers
+    self._workers = {}
+
+  # Send a build request to the worker of the given directory.
+  # The worker is launched if it is not running, or if it was
+  # launched with other options.
+  # @param directory - the directory of the project.
+  # @param cmd - the command line of AutoLaTeX, without the command.
+  # @param key - the values that must be the same for reusing the worker.
+  # @param preexec_fn - the function invoked in the worker before
+  #                     AutoLaTeX is launched.
+  # @param directive - the AutoLaTeX command, e.g. 'clean', 'all', etc.
+  # @return the worker, or None if the build cannot be run by a worker.
+  def request_build(self, directory, cmd, key, preexec_fn, directive):
+    with self._lock:
+      worker = self._workers.get(directory)
+      if worker is not None and (worker.get_key() != key or not worker.is_alive()):
+        worker.stop()
+        del self._workers[directory]
+        worker = None
+      if worker is None:
+        try:
+          worker = _Worker(directory, cmd, key, preexec_fn)
+        except OSError:
+          return None
+        self._workers[directory] = worker
+    if worker.request(directive):
+      return worker
+    self.discard(worker)
+    return None
+
+  # Stop the given worker and forget it.
+  # @param worker - the worker.
+  def discard(self, worker):
+    with self._lock:
+      for directory, candidate in list(self._workers.items()):
+        if candidate is worker:
+          del self._workers[directory]
+    worker.stop()
+
+  # Stop all the workers.
+  def stop_all(self):
+    with self._lock:
+      workers = list(self._workers.values())
+      self._workers.clear()
+    for worker in workers:
+      worker.stop()
+
+_WORKERS = _WorkerPool()
+
+#---------------------------------
+# CLASS: _ProgressThrottle
+#---------------------------------
+
+#
+# Coalesce the progress notifications of a runner: only the
+# latest progress is kept, and it is delivered at most a given
+# number of times per second. The notifications that are
+# arriving too early are delivered by a timer.
+#
+class _ProgressThrottle(object):
+
+  # Constructor.
+  # @param callback - the function that is invoked with the amount
+  #                   and the comment of the progress.
+  # @param rate - the maximal number of invocations of the callback per
+  #               second, or 0 for no limit.
+  def __init__(self, callback, rate):
+    self._callback = callback
+    self._interval = 1. / rate if rate > 0 else 0.
+    self._lock = _threading.Lock()
+    self._last_time = 0.
+    self._pending = None
+    self._timer = None
+
+  # Notify a new progress.
+  # @param amount - progression indicator.
+  # @param comment - associated comment.
+  def update(self, amount, comment):
+    with self._lock:
+      self._pending = (amount, comment)
+      if self._timer is not None:
+        # The delivery is already planned
+        return
+      delay = self._last_time + self._interval - time.time()
+      if delay > 0:
+        self._timer = _threading.Timer(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+        return
+    self.flush()
+
+  # Deliver the pending progress immediately.
+  def flush(self):
+    with self._lock:
+      if self._timer is not None:
+        self._timer.cancel()
+        self._timer = None
+      if self._pending is not None:
+        self._last_time = time.time()
+        amount, comment = self._pending
+        self._pending = None
+        # Invoked inside the lock for keeping the order of the notifications
+        self._callback(amount, comment)
+
+  # Forget the pending progress.
+  def cancel(self):
+    with self._lock:
+      if self._timer is not None:
+        self._timer.cancel()
+        self._timer = None
+      self._pending = None
+
+#---------------------------------
+# CLASS: BuildTrigger
+#---------------------------------
+
+#
+# Trigger the builds of the documents when their files are
+# changed, eg. saved by the editor. The changes that are
+# notified in a short delay, eg. when several files are saved
+# at once, are merged into a single build.
+#
+class BuildTrigger(object):
+
+  # Constructor.
+  # @param callback - the function that is invoked with the directory
+  #                   of the document to build. It is invoked from
+  #                   a timer thread.
+  # @param delay - the duration without change, in seconds, after which
+  #                the build is triggered.
+  def __init__(self, callback, delay=_BUILD_TRIGGER_DELAY):
+    self._callback = callback
+    self._delay = delay
+    self._lock = _threading.Lock()
+    self._timers = {}
+
+  # Notify a change in the files of a document.
+  # @param directory - the directory of the document.
+  def notify_change(self, directory):
+    with self._lock:
+      timer = self._timers.get(directory)
+      if timer is not None:
+        timer.cancel()
+      timer = _threading.Timer(self._delay, self._trigger, (directory,))
+      timer.daemon = True
+      self._timers[directory] = timer
+      timer.start()
+
+  # Invoked when the delay is expired for a document.
+  # @param directory - the directory of the document.
+  def _trigger(self, directory):
+    with self._lock:
+      if self._timers.get(directory) is not _threading.current_thread():
+        # Cancelled or replaced by a more recent change
+        return
+      del self._timers[directory]
+    self._callback(directory)
+
+  # Cancel the builds that are not yet triggered.
+  def cancel(self):
+    with self._lock:
+      for timer in self._timers.values():
+        timer.cancel()
+      self._timers = {}
+
+#---------------------------------
+# CLASS: MessageKind
+#---------------------------------
+
+class MessageKind:
+  ERROR = 'error'
+  WARNING = 'warning'
+
+#---------------------------------
+# CLASS: TimingReport
+#---------------------------------
+
+#
+# Report of the durations of the phases of a build, eg.
+# the runs of the LaTeX compiler, of BibTeX or of the
+# image translators. The phases may be nested.
+#
+class TimingReport(object):
+
+  # Constructor.
+  # @param directory - the directory of the build.
+  # @param directive - the AutoLaTeX command of the build.
+  def __init__(self, directory, directive):
+    self._directory = directory
+    self._directive = directive
+    self._start_time = time.time()
+    self._duration = None
+    self._phases = []
+    self._open_phases = []
+
+  # Replies the directory of the build.
+  def get_directory(self):
+    return self._directory
+
+  # Replies the AutoLaTeX command of the build.
+  def get_directive(self):
+    return self._directive
+
+  # Replies the duration of the build in seconds, or None if
+  # the build is not finished.
+  def get_duration(self):
+    return self._duration
+
+  # Replies the phases in the order of their starts. Each phase
+  # is a dictionary with the keys 'name', 'depth' (level of nesting),
+  # 'start' (seconds since the start of the build) and 'duration'
+  # (in seconds, or None if the phase has not ended).
+  def get_phases(self):
+    return self._phases
+
+  # Notify the start of a phase.
+  # @param name - the name of the phase.
+  def start_phase(self, name):
+    phase = {
+      'name': name,
+      'depth': len(self._open_phases),
+      'start': time.time() - self._start_time,
+      'duration': None,
+    }
+    self._phases.append(phase)
+    self._open_phases.append(phase)
+
+  # Notify the end of the last started phase.
+  # @param duration - the duration of the phase in seconds, as
+  #                   measured by AutoLaTeX.
+  def end_phase(self, duration):
+    if self._open_phases:
+      self._open_phases.pop()['duration'] = duration
+
+  # Notify the end of the build. The phases that are not ended,
+  # eg. because the build has failed, keep an unknown duration.
+  def close(self):
+    self._duration = time.time() - self._start_time
+    self._open_phases = []
+
+  # Replies the report as a dictionary that may be serialized.
+  def to_dict(self):
+    return {
+      'directory': self._directory,
+      'directive': self._directive,
+      'start': self._start_time,
+      'duration': self._duration,
+      'phases': self._phases,
+    }
+
+  # Replies the report in the JSON format.
+  def to_json(self):
+    return json.dumps(self.to_dict(), indent=2)
+
+  # Write the report in the JSON format in the given file.
+  # @param filename - the name of the file.
+  def save(self, filename):
+    with open(filename, 'w') as f:
+      f.write(self.to_json())
 
 #---------------------------------
 # CLASS: Listener
@@ -69,6 +565,12 @@ class Listener(object):
   def get_runner_progress(self):
     return False
 
+  # Replies if the durations of the phases of the task must be
+  # reported, even if the progress is not displayed.
+  # @return true if a timing report is expected, false otherwise.
+  def get_runner_timing(self):
+    return False
+
   # Invoked when the task wants to create the associated UI.
   def on_runner_add_ui(self):
     pass
@@ -83,6 +585,43 @@ class Listener(object):
   def on_runner_progress(self, amount, comment):
     pass
 
+  # Invoked as soon as a diagnostic message is output by the
+  # task, while the task is running.
+  # @param kind - the kind of the message, see MessageKind.
+  # @param filename - the name of the file concerned by the message.
+  # @param line - the line number in the file, or 0 if unknown.
+  # @param code - the code of the warning (eg. 'W1'), or None.
+  # @param text - the text of the message.
+  def on_runner_message(self, kind, filename, line, code, text):
+    pass
+
+  # Invoked when a phase of the task, eg. a run of the LaTeX
+  # compiler, is starting.
+  # @param name - the name of the phase.
+  def on_runner_phase_start(self, name):
+    pass
+
+  # Invoked when a phase of the task is finished.
+  # @param name - the name of the phase.
+  # @param duration - the duration of the phase in seconds.
+  def on_runner_phase_end(self, name, duration):
+    pass
+
+  # Invoked when the task has finished, with the durations of
+  # its phases.
+  # @param report - the TimingReport of the task.
+  def on_runner_timing_report(self, report):
+    pass
+
+  # Invoked when the task has finished, for reporting the
+  # resources used by the task.
+  # @param max_rss - the peak resident set size of the processes, in bytes,
+  #                  or 0 if it is unknown.
+  # @param cpu_time - the CPU time used by the processes, in seconds.
+  # @param wall_time - the duration of the task, in seconds.
+  def on_runner_resource_usage(self, max_rss, cpu_time, wall_time):
+    pass
+
   # Invoked when the task has finished.
   # @param retcode - return code of the task.
   # @param output - output of the task (standard output)
@@ -105,105 +644,331 @@ class Runner(_threading.Thread):
   # @param directory - the path to set as the current path for the task.
   # @param directive - the AutoLaTeX command, e.g. 'clean', 'all', etc.
   # @param params - the CLI options for AutoLaTeX.
-  def __init__(self, listener, directory, directive, params):
+  # @param timeout - the number of seconds after which the task is killed,
+  #                  or 0 for no limit.
+  # @param memory_limit - the maximal address space of each process of the
+  #                       task in bytes, or 0 for no limit.
+  # @param niceness - the niceness of the processes of the task. If it is
+  #                   positive, the task has also the lowest I/O priority.
+  # @param progress_rate - the maximal number of progress notifications
+  #                        per second, or 0 for no limit.
+  # @param use_worker - indicates if the task is run by the resident
+  #                     AutoLaTeX of the project, which is launched if needed.
+  def __init__(self, listener, directory, directive, params, timeout=0, memory_limit=0, niceness=0, progress_rate=_PROGRESS_RATE, use_worker=False):
     _threading.Thread.__init__(self)
     assert listener
     self.daemon = True
     self._listener = listener
-    self._directory = directory
+    self._directory = os.path.abspath(directory)
+    self._directive = directive
     self._cmd = [ utils.AUTOLATEX_BINARY, '--file-line-warning' ] + params
-    if directive:
-      self._cmd.append(directive)
     self._has_progress = False
     self._subprocess = None
+    self._use_worker = use_worker
+    self._worker = None
+    self._is_cancelled = False
+    self._is_timed_out = False
+    self._state_lock = _threading.Lock()
+    self._timeout = timeout
+    self._memory_limit = memory_limit
+    self._niceness = niceness
+    self._progress_throttle = _ProgressThrottle(listener.on_runner_progress, progress_rate)
+
+  # Replies the directory of the task.
+  def get_directory(self):
+    return self._directory
+
+  # Replies the AutoLaTeX command of the task.
+  def get_directive(self):
+    return self._directive
+
+  # Replies if the task was cancelled.
+  def is_cancelled(self):
+    return self._is_cancelled
 
   # Cancel the execution of the task.
   def cancel(self):
+    with self._state_lock:
+      self._is_cancelled = True
+      has_progress = self._has_progress
+    self._progress_throttle.cancel()
     if self._subprocess:
-      self._subprocess.terminate()
+      self._terminate(self._subprocess)
       self._subprocess = None
-    if self._has_progress:
+    if has_progress:
       # Remove the info bar from the inside of the UI thread
       self._listener.on_runner_remove_ui()
     # Update the rest of the UI from the inside of the UI  thread
     self._listener.on_runner_finalize_execution(0, '', [])
 
+  # Cancel the task before it was started, eg. when it is replaced
+  # by another task in the waiting queue of the scheduler. The task
+  # is only marked as cancelled, because it has not notified the UI.
+  def discard(self):
+    with self._state_lock:
+      self._is_cancelled = True
+
+  # Terminate the subprocess and all the processes it has launched,
+  # eg. pdflatex, bibtex or inkscape.
+  # @param proc - the subprocess.
+  def _terminate(self, proc):
+    if self._worker:
+      # Only the build is terminated, not the worker, except
+      # if the build has not started yet
+      if not self._worker.cancel_build():
+        _WORKERS.discard(self._worker)
+      return
+    try:
+      if os.name == 'posix':
+        os.killpg(proc.pid, signal.SIGTERM)
+      else:
+        proc.terminate()
+    except OSError:
+      pass
+
+  # Invoked when the task has exceeded its maximal duration.
+  # @param proc - the subprocess.
+  def _on_timeout(self, proc):
+    self._is_timed_out = True
+    self._terminate(proc)
+
+  # Invoked in the subprocess before AutoLaTeX is launched,
+  # for applying the resource limits.
+  def _apply_resource_limits(self):
+    if self._memory_limit > 0 and resource is not None:
+      resource.setrlimit(resource.RLIMIT_AS, (self._memory_limit, self._memory_limit))
+    if self._niceness > 0:
+      os.nice(self._niceness)
+
+  # Replies the command line that is launching AutoLaTeX.
+  # @param with_directive - indicates if the AutoLaTeX command is included.
+  def _get_command_line(self, with_directive=True):
+    cmd = list(self._cmd)
+    if with_directive and self._directive:
+      cmd.append(self._directive)
+    if self._niceness > 0 and os.name == 'posix':
+      ionice = utils.which('ionice')
+      if ionice:
+        return [ ionice, '-c', '2', '-n', '7' ] + cmd
+    return cmd
+
+  # Wait for the end of the subprocess.
+  # @param proc - the subprocess.
+  # @return the tuple (return code, peak RSS in bytes, CPU time in seconds).
+  def _wait(self, proc):
+    if not hasattr(os, 'wait4'):
+      return (proc.wait(), 0, 0.)
+    pid, status, usage = os.wait4(proc.pid, 0)
+    if os.WIFSIGNALED(status):
+      proc.returncode = -os.WTERMSIG(status)
+    else:
+      proc.returncode = os.WEXITSTATUS(status)
+    # The peak RSS is given in kilobytes, except on Mac OS
+    max_rss = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+    return (proc.returncode, max_rss, usage.ru_utime + usage.ru_stime)
+
+  # Read the standard output and the standard error of the subprocess
+  # concurrently until they are closed. The thread is sleeping while
+  # no data is available.
+  # @param proc - the subprocess.
+  # @param stdout_callback - the function that is invoked with each line
+  #                          of the standard output as soon as it is
+  #                          received, or None to ignore the standard output.
+  # @param stderr_callback - the function that is invoked with each line
+  #                          of the standard error as soon as it is received.
+  # @param end_marker - the prefix of the line that ends each output
+  #                     without closing it, or None to read until the closing.
+  # @return the tuple (standard error of the subprocess, the line
+  #         of the standard output that starts with the end marker or None).
+  def _read_outputs(self, proc, stdout_callback, stderr_callback, end_marker=None):
+    stdout_buffer = b''
+    stderr_buffer = b''
+    stderr_line = b''
+    end_line = None
+    with selectors.DefaultSelector() as selector:
+      selector.register(proc.stdout, selectors.EVENT_READ)
+      selector.register(proc.stderr, selectors.EVENT_READ)
+      while selector.get_map():
+        for key, events in selector.select():
+          data = os.read(key.fd, _READ_BUFFER_SIZE)
+          if not data:
+            selector.unregister(key.fileobj)
+            key.fileobj.close()
+            if key.fileobj is proc.stdout and stdout_buffer and stdout_callback:
+              stdout_callback(utils.convert_bytes_to_string(stdout_buffer))
+            elif key.fileobj is proc.stderr and stderr_line:
+              stderr_callback(utils.convert_bytes_to_string(stderr_line))
+          elif key.fileobj is proc.stdout:
+            if stdout_callback or end_marker:
+              lines = re.split(b'[\n\r]', stdout_buffer + data)
+              stdout_buffer = lines.pop()
+              for line in lines:
+                if line:
+                  line = utils.convert_bytes_to_string(line)
+                  if end_marker and line.startswith(end_marker):
+                    end_line = line
+                    selector.unregister(proc.stdout)
+                    break
+                  if stdout_callback:
+                    stdout_callback(line)
+          else:
+            stderr_buffer += data
+            lines = re.split(b'[\n\r]', stderr_line + data)
+            stderr_line = lines.pop()
+            for line in lines:
+              if line:
+                line = utils.convert_bytes_to_string(line)
+                if end_marker and line.startswith(end_marker):
+                  # The end marker is not a part of the error output
+                  stderr_buffer = stderr_buffer[:stderr_buffer.rfind(end_marker.encode())]
+                  selector.unregister(proc.stderr)
+                  break
+                stderr_callback(line)
+    return (utils.convert_bytes_to_string(stderr_buffer), end_line)
+
   # Invoked by the background threading API for
   # running the task's activities.
   def run(self):
-    global _all_runners
-    _all_runners.append(self)
-    progress_line_pattern = None
+    try:
+      self._run_task()
+    finally:
+      _SCHEDULER.finished(self)
 
-    self._has_progress = self._listener.get_runner_progress()
+  # Run the task's activities.
+  def _run_task(self):
+    with self._state_lock:
+      if self._is_cancelled:
+        # The task was cancelled before it was started
+        return 0
+      self._has_progress = self._listener.get_runner_progress()
+      if self._has_progress:
+        # Add the progress UI
+        self._listener.on_runner_add_ui()
+    has_timing = self._has_progress or self._listener.get_runner_timing()
 
-    if self._has_progress:
-      # Add the progress UI
-      self._listener.on_runner_add_ui()
-      # Update the command line to obtain the progress data
+    if has_timing:
+      # Update the command line to obtain the progress and phase data
       self._cmd.append('--progress=n')
-      # Compile a regular expression to extract the progress amount
-      progress_line_pattern = re.compile("^\\[\\s*([0-9]+)\\%\\]\\s+[#.]+(.*)$")
 
-    # Launch the subprocess
-    os.chdir(self._directory)
-    self._subprocess = subprocess.Popen(self._cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if self._is_cancelled:
+      # The UI was removed by cancel()
+      return 0
+
+    # Launch the subprocess, or send the build request to the worker
+    start_time = time.time()
+    if self._use_worker and os.name == 'posix':
+      self._worker = _WORKERS.request_build(self._directory,
+          self._get_command_line(False),
+          (self._get_command_line(False), self._memory_limit, self._niceness),
+          self._apply_resource_limits, self._directive)
+    if self._worker:
+      self._subprocess = self._worker.get_process()
+    elif os.name == 'posix':
+      # The subprocess is the leader of a new process group
+      # in order to terminate all its child processes
+      self._subprocess = subprocess.Popen(self._get_command_line(),
+          stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=self._directory,
+          start_new_session=True, preexec_fn=self._apply_resource_limits)
+    else:
+      self._subprocess = subprocess.Popen(self._get_command_line(), stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=self._directory)
+    if self._is_cancelled:
+      # The task was cancelled before the subprocess was launched
+      self._terminate(self._subprocess)
+      self._subprocess = None
+      return 0
+    timer = None
+    if self._timeout > 0:
+      timer = _threading.Timer(self._timeout, self._on_timeout, [ self._subprocess ])
+      timer.daemon = True
+      timer.start()
     output = ''
     if self._subprocess:
-      if self._has_progress:
-        # Use the info bar to draw the progress of the task
-        if self._subprocess:
-          self._subprocess.poll()
-        # Loop until the subprocess is dead
-        while self._subprocess and self._subprocess.returncode is None:
-          if self._subprocess and not self._subprocess.stdout.closed:
-            # Read a line from STDOUT and extract the progress amount
-            if self._subprocess:
-              self._subprocess.stdout.flush()
-            if self._subprocess:
-              line = self._subprocess.stdout.readline()
-            if line:
-              mo = re.match(progress_line_pattern, utils.convert_bytes_to_string(line))
-              if mo:
-                amount = (float(mo.group(1)) / 100.)
-                comment = mo.group(2).strip()
-                self._listener.on_runner_progress(amount, comment)
-
-          if self._subprocess:
-            self._subprocess.poll()
-        # Kill the subprocess if 
-        proc = self._subprocess
-        if proc:
-          retcode = proc.returncode
-          # Read the error output of AutoLaTeX
-          proc.stderr.flush()
-          for line in proc.stderr:
-            output = output + utils.convert_bytes_to_string(line)
-          proc.stdout.close()
-          proc.stderr.close()
-
+      proc = self._subprocess
+      report = TimingReport(self._directory, self._directive)
+      if has_timing:
+        # Use the info bar to draw the progress of the task,
+        # and record the durations of the phases
+        def on_stdout_line(line):
+          mo = re.match(_PROGRESS_PATTERN, line)
+          if mo:
+            if self._has_progress:
+              amount = (float(mo.group(1)) / 100.)
+              comment = mo.group(2).strip()
+              self._progress_throttle.update(amount, comment)
+            return
+          mo = re.match(_PHASE_START_PATTERN, line)
+          if mo:
+            report.start_phase(mo.group(1))
+            self._listener.on_runner_phase_start(mo.group(1))
+            return
+          mo = re.match(_PHASE_END_PATTERN, line)
+          if mo:
+            duration = float(mo.group(1))
+            report.end_phase(duration)
+            self._listener.on_runner_phase_end(mo.group(2), duration)
       else:
         # Silent execution of the task
-        out, err = self._subprocess.communicate() if self._subprocess else ('','')
-        retcode = self._subprocess.returncode if self._subprocess else 0
-        output = utils.convert_bytes_to_string(err)
+        on_stdout_line = None
+      if self._worker:
+        # Record the process of the build for being able to cancel it
+        worker = self._worker
+        on_task_stdout_line = on_stdout_line
+        def on_stdout_line(line):
+          mo = re.match(_WORKER_BUILD_PATTERN, line)
+          if mo:
+            worker.set_build_pid(int(mo.group(1)))
+          elif on_task_stdout_line:
+            on_task_stdout_line(line)
+      # Notify the diagnostic messages as soon as they are received
+      def on_stderr_line(line):
+        message = _parse_message(line)
+        if message:
+          self._listener.on_runner_message(*message)
+      if self._worker:
+        # Drain the outputs of AutoLaTeX until the build is done
+        output, end_line = self._read_outputs(proc, on_stdout_line, on_stderr_line, _WORKER_DONE_MARKER)
+        self._worker.set_build_pid(0)
+        mo = re.match(_WORKER_DONE_PATTERN, end_line or '')
+        if mo:
+          # The peak RSS is given in kilobytes
+          retcode, max_rss, cpu_time = (int(mo.group(1)), int(mo.group(3) or 0) * 1024, float(mo.group(2)))
+        else:
+          # The worker has died
+          retcode, max_rss, cpu_time = (proc.wait(), 0, 0.)
+          _WORKERS.discard(self._worker)
+      else:
+        # Drain the outputs of AutoLaTeX until the subprocess is dead
+        output, end_line = self._read_outputs(proc, on_stdout_line, on_stderr_line)
+        retcode, max_rss, cpu_time = self._wait(proc)
+      if timer:
+        timer.cancel()
 
       # Stop because the subprocess was cancelled
       if not self._subprocess:
-        if self in _all_runners:
-          _all_runners.remove(self) 
         return 0
       self._subprocess = None
 
+      # Deliver the last progress
+      self._progress_throttle.flush()
+
+      self._listener.on_runner_resource_usage(max_rss, cpu_time, time.time() - start_time)
+      if has_timing:
+        report.close()
+        self._listener.on_runner_timing_report(report)
+
+      if self._is_timed_out:
+        output = (_T("The build was stopped because it has run for more than %d seconds.") % self._timeout) + "\n" + output
+        if retcode == 0:
+          retcode = 255
+
       # If AutoLaTeX had failed, the output is assumed to
       # be the error message.
       # If AutoLaTeX had not failed, the output may contains
       # "warning" notifications.
       latex_warnings = []
       if retcode == 0:
-        regex_expr = re.compile("^\\!\\!(.+?):(W[0-9]+):[^:]+:\\s*(.+?)\\s*$")
         for output_line in re.split("[\n\r]+", output):
-          mo = re.match(regex_expr, output_line)
+          mo = re.match(_CODED_WARNING_PATTERN, output_line)
           if mo:
             latex_warnings.append([mo.group(3),mo.group(1), mo.group(2)])
         output = '' # Output is no more interesting
@@ -214,6 +979,4 @@ class Runner(_threading.Thread):
       
       # Update the rest of the UI from the inside of the UI  thread
       self._listener.on_runner_finalize_execution(retcode, output, latex_warnings)
-    if self in _all_runners:
-      _all_runners.remove(self)
 
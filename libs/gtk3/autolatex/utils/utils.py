@@ -28,7 +28,17 @@ import sys
 import subprocess
 import io
 import gettext
-import configparser
+import json
+import copy
+import time
+import collections
+import concurrent.futures
+
+# Try to use the threading library if it is available
+try:
+  import threading as _threading
+except ImportError:
+  import dummy_threading as _threading
 
 #---------------------------------
 # UTILITY FUNCTION
@@ -70,6 +80,9 @@ DEFAULT_LOG_LEVEL = '--quiet'
 # String that is representing an empty string for the AutoLaTeX backend.
 CONFIG_EMPTY_VALUE = '<<<<empty>>>>'
 
+# String that is closing a block of data in the protocol of the AutoLaTeX backend server.
+BACKEND_END_MARKER = '<<<<end>>>>'
+
 # Paths
 AUTOLATEX_APP_PATH = None
 AUTOLATEX_DEV_PATH = None
@@ -224,6 +237,12 @@ def convert_bytes_to_string(bytes):
     return bytes.decode(sys.stdin.encoding)
   return ''
 
+# Convert a String to an array of bytes.
+def convert_string_to_bytes(string):
+  if (string):
+    return string.encode(sys.stdin.encoding)
+  return b''
+
 # Replies the first non-null value in the given values.
 def first_of(*values):
   for value in values:
@@ -309,22 +328,306 @@ def find_AutoLaTeX_directory(current_document):
 
 
 
+#---------------------------------
+# BACKEND SERVER
+#---------------------------------
+
+# Error raised when a reply of the backend server is not the reply
+# of the request, ie. the server and the client are out of sync.
+class _BackendDesyncError(Exception):
+  pass
+
+# Connection to a persistent AutoLaTeX backend ('autolatex-backend serve')
+# that is dedicated to a project directory.
+# The backend is restarted when it has crashed, or when the
+# path to the backend binary has changed.
+class _BackendConnection(object):
+
+  # @param directory - the directory of the project.
+  def __init__(self, directory):
+    self._directory = directory
+    self._binary = None
+    self._process = None
+    self._lock = _threading.Lock()
+    self._request_id = 0
+
+  # Start the backend server if it is not running.
+  def _start(self):
+    if self._process is not None and (self._binary != AUTOLATEX_BACKEND_BINARY or self._process.poll() is not None):
+      self._stop()
+    if self._process is None:
+      self._binary = AUTOLATEX_BACKEND_BINARY
+      self._process = subprocess.Popen( [self._binary, 'serve'],
+                        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                        cwd=self._directory )
+
+  # Stop the backend server.
+  def _stop(self):
+    process = self._process
+    self._process = None
+    if process is not None:
+      try:
+        process.stdin.close()
+        process.wait(timeout=2)
+      except (OSError, subprocess.TimeoutExpired):
+        try:
+          process.kill()
+          process.wait()
+        except OSError:
+          pass
+
+  # Stop the backend server.
+  def close(self):
+    with self._lock:
+      self._stop()
+
+  # Send a command to the backend server and read its reply.
+  # @param arguments - the command line arguments of the backend.
+  # @param input - the INI data to pass to the command, or None.
+  # @return the tuple (exit code, output).
+  def _send(self, arguments, input):
+    self._request_id += 1
+    request_id = '@' + str(self._request_id)
+    stream = self._process.stdin
+    stream.write(convert_string_to_bytes(request_id + ' ' + ' '.join(arguments) + "\n"))
+    if input is not None:
+      if input and not input.endswith("\n"):
+        input = input + "\n"
+      stream.write(convert_string_to_bytes(input + BACKEND_END_MARKER + "\n"))
+    stream.flush()
+    lines = []
+    while True:
+      line = self._process.stdout.readline()
+      if not line:
+        raise EOFError()
+      line = convert_bytes_to_string(line)
+      if line.startswith(BACKEND_END_MARKER):
+        status = line[len(BACKEND_END_MARKER):].split(None, 2)
+        if not status or status.pop(0) != request_id:
+          raise _BackendDesyncError()
+        try:
+          retcode = int(status[0])
+        except (IndexError, ValueError):
+          retcode = 255
+        return (retcode, ''.join(lines))
+      lines.append(line)
+
+  # Run a command on the backend server. The server is
+  # restarted once if it has crashed, or if its reply is
+  # not the reply of the command.
+  # @param arguments - the command line arguments of the backend.
+  # @param input - the INI data to pass to the command, or None.
+  # @return the tuple (exit code, output).
+  def request(self, arguments, input=None):
+    with self._lock:
+      for attempt in range(2):
+        try:
+          self._start()
+          return self._send(arguments, input)
+        except (OSError, EOFError, _BackendDesyncError):
+          self._stop()
+      return (255, '')
+
+# Connections to the backend servers, indexed by project directory.
+_BACKEND_CONNECTIONS = {}
+
+# Latencies of the calls to the backend, indexed by command.
+_BACKEND_LATENCIES = {}
+
+# Replies of the backend, indexed by project directory.
+# The order of the entries is the order of their last use.
+_BACKEND_CACHE = collections.OrderedDict()
+
+# Maximal number of projects for which the replies of the backend are cached.
+BACKEND_CACHE_SIZE = 8
+
+# Parts of the backend replies that are not cached because they are
+# not depending only on the configuration files.
+_BACKEND_UNCACHED_PARTS = [ 'images' ]
+
+# Executor of the asynchronous calls to the backend.
+_BACKEND_EXECUTOR = None
+
+# Maximal number of threads that are running asynchronous calls to the backend.
+BACKEND_ASYNC_WORKERS = 2
+
+_BACKEND_LOCK = _threading.Lock()
+
+# Replies the connection to the backend server for the given directory.
+# @param directory - the directory of the project.
+# @return the connection.
+def _get_backend_connection(directory):
+  directory = os.path.abspath(directory)
+  with _BACKEND_LOCK:
+    connection = _BACKEND_CONNECTIONS.get(directory)
+    if connection is None:
+      connection = _BackendConnection(directory)
+      _BACKEND_CONNECTIONS[directory] = connection
+    return connection
+
+# Stop all the backend servers.
+def close_backend_connections():
+  with _BACKEND_LOCK:
+    connections = list(_BACKEND_CONNECTIONS.values())
+    _BACKEND_CONNECTIONS.clear()
+  for connection in connections:
+    connection.close()
+
+# Run a function of the backend interface in a background thread.
+# @param function - the function to run, eg. backend_get_bundle.
+# @param args - the arguments to pass to the function.
+# @param callback - the function that is invoked with the result of the
+#                   function, or with None if the function has failed.
+#                   It is invoked in the background thread, see
+#                   gtk_utils.ui_callback() for invoking it in the UI thread.
+# @return a concurrent.futures.Future on the result of the function.
+def backend_async(function, *args, callback=None):
+  global _BACKEND_EXECUTOR
+  with _BACKEND_LOCK:
+    if _BACKEND_EXECUTOR is None:
+      _BACKEND_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=BACKEND_ASYNC_WORKERS)
+    future = _BACKEND_EXECUTOR.submit(function, *args)
+  if callback:
+    future.add_done_callback(
+      lambda f: callback(None if f.cancelled() or f.exception() else f.result()))
+  return future
+
+# Replies the latencies of the calls to the backend.
+# @return a dictionary in which the keys are the commands (eg. 'get config'),
+#         and the values are the tuples (number of calls, total duration, maximal duration),
+#         where the durations are in seconds.
+def get_backend_latencies():
+  with _BACKEND_LOCK:
+    return dict((command, tuple(values)) for command, values in _BACKEND_LATENCIES.items())
+
+# Replies the stat signature of a file or a directory.
+# @param filename - the name of the file.
+# @return the signature, or None if the file does not exist.
+def _get_stat_signature(filename):
+  try:
+    st = os.stat(filename)
+    return (filename, st.st_mtime_ns, st.st_size)
+  except OSError:
+    return None
+
+# Replies the signature of the files that are read by the backend
+# to build its replies for the given directory.
+# @param directory - the directory of the project.
+# @return the signature.
+def _get_backend_input_signature(directory):
+  signature = [ AUTOLATEX_BACKEND_BINARY ]
+  if AUTOLATEX_BACKEND_BINARY:
+    system_directory = os.path.dirname(os.path.realpath(AUTOLATEX_BACKEND_BINARY))
+    signature.append(_get_stat_signature(os.path.join(system_directory, 'default.cfg')))
+    signature.append(_get_stat_signature(os.path.join(system_directory, 'translators')))
+  signature.append(_get_stat_signature(get_autolatex_user_config_file()))
+  for root, dirs, files in os.walk(os.path.join(get_autolatex_user_config_directory(), 'translators')):
+    signature.append(_get_stat_signature(root))
+  signature.append(_get_stat_signature(get_autolatex_document_config_file(directory)))
+  # The main TeX file may be detected from the content of the directory
+  signature.append(_get_stat_signature(directory))
+  return tuple(signature)
+
+# Replies the cached replies of the backend for the given directory.
+# The cached replies are discarded if the configuration files have changed.
+# @param directory - the directory of the project.
+# @param signature - the signature of the configuration files.
+# @return the dictionary of the cached replies, indexed by part.
+def _get_backend_cache(directory, signature):
+  with _BACKEND_LOCK:
+    entry = _BACKEND_CACHE.get(directory)
+    if entry is None or entry[0] != signature:
+      entry = (signature, {})
+      _BACKEND_CACHE[directory] = entry
+    _BACKEND_CACHE.move_to_end(directory)
+    while len(_BACKEND_CACHE) > BACKEND_CACHE_SIZE:
+      _BACKEND_CACHE.popitem(last=False)
+    return entry[1]
+
+# Discard the cached replies of the backend for the given directory.
+# @param directory - the directory of the project.
+def invalidate_backend_cache(directory):
+  directory = os.path.abspath(directory)
+  with _BACKEND_LOCK:
+    if directory in _BACKEND_CACHE:
+      del _BACKEND_CACHE[directory]
+
+# Run a command on the backend server dedicated to the given directory.
+# @param directory - the directory of the project.
+# @param arguments - the command line arguments of the backend.
+# @param input - the INI data to pass to the command, or None.
+# @return the tuple (exit code, output).
+def _backend_call(directory, arguments, input=None):
+  connection = _get_backend_connection(directory)
+  start_time = time.time()
+  result = connection.request(arguments, input)
+  duration = time.time() - start_time
+  command = ' '.join(arguments[0:2])
+  with _BACKEND_LOCK:
+    values = _BACKEND_LATENCIES.get(command)
+    if values is None:
+      _BACKEND_LATENCIES[command] = [1, duration, duration]
+    else:
+      values[0] += 1
+      values[1] += duration
+      values[2] = max(values[2], duration)
+  return result
+
+# Replies the boolean value that corresponds to the given
+# configuration value.
+# @param value - the value to convert.
+# @param default_value - the value to reply if the given value is not a boolean.
+# @return the boolean value.
+def parse_boolean(value, default_value=None):
+  if isinstance(value, bool):
+    return value
+  value = str(value).strip().lower()
+  if value in ('1', 'yes', 'true', 'on'):
+    return True
+  if value in ('0', 'no', 'false', 'off'):
+    return False
+  return default_value
+
+# Write the given settings with the INI format.
+# @param settings - a dictionary of sections, which are dictionaries
+#                   of values. The lists are written with the path separator,
+#                   and the booleans with 'true' or 'false'.
+# @return the INI string.
+def _make_ini(settings):
+  string_out = io.StringIO()
+  for section in settings:
+    string_out.write("[%s]\n" % section)
+    for key, value in settings[section].items():
+      if isinstance(value, bool):
+        value = 'true' if value else 'false'
+      elif isinstance(value, (list, tuple)):
+        value = os.pathsep.join(value)
+      string_out.write("%s = %s\n" % (key, value))
+    string_out.write("\n")
+  result = string_out.getvalue()
+  string_out.close()
+  return result
+
+# Run a 'set' command on the backend server.
+# @param directory - the directory of the project.
+# @param arguments - the command line arguments of the backend.
+# @param settings - the dictionary of sections to pass to the backend.
+# @return true on success, false on error
+def _backend_set_ini(directory, arguments, settings):
+  retcode = _backend_call(directory, arguments, _make_ini(settings))[0]
+  invalidate_backend_cache(directory)
+  return retcode == 0
+
 # BACKEND INTERFACE:
 # Replies the installed translators for AutoLaTeX.
 # @param directory - name of the directory in which the
 #                    translators must be search for.
 #                    It is usually the directory of
 #                    the LaTeX document.
-# @return an INI data structure.
+# @return a dictionary in which the keys are the names of the
+#         translators, and the values are dictionaries of attributes.
 def backend_get_translators(directory):
-  os.chdir(directory)
-  process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'get', 'translators'], stdout=subprocess.PIPE )
-  data = process.communicate()[0]
-  string_in = io.StringIO(convert_bytes_to_string(data))
-  config = configparser.ConfigParser()
-  config.readfp(string_in)
-  string_in.close()
-  return config
+  return backend_get_bundle(directory, ['translators'])['translators']
 
 # BACKEND INTERFACE:
 # Replies the loaded translators in AutoLaTeX.
@@ -332,16 +635,11 @@ def backend_get_translators(directory):
 #                    translators must be search for.
 #                    It is usually the directory of
 #                    the LaTeX document.
-# @return an INI data structure.
+# @return a dictionary in which the keys are the levels ('system',
+#         'user', 'project'), and the values are dictionaries from the
+#         names of the translators to their boolean loading flags.
 def backend_get_loads(directory):
-  os.chdir(directory)
-  process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'get', 'loads', ], stdout=subprocess.PIPE )
-  data = process.communicate()[0]
-  string_in = io.StringIO(convert_bytes_to_string(data))
-  config = configparser.ConfigParser()
-  config.readfp(string_in)
-  string_in.close()
-  return config
+  return backend_get_bundle(directory, ['loads'])['loads']
 
 # BACKEND INTERFACE:
 # Replies the configuration of AutoLaTeX.
@@ -349,16 +647,11 @@ def backend_get_loads(directory):
 #                    translators must be search for.
 #                    It is usually the directory of
 #                    the LaTeX document.
-# @return an INI data structure.
+# @return a dictionary in which the keys are the sections, and the
+#         values are dictionaries of string values.
 def backend_get_configuration(directory, level, section):
-  os.chdir(directory)
-  process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'get', 'config', level, section], stdout=subprocess.PIPE )
-  data = process.communicate()[0]
-  string_in = io.StringIO(convert_bytes_to_string(data))
-  config = configparser.ConfigParser()
-  config.readfp(string_in)
-  string_in.close()
-  return config
+  part = 'config:%s:%s' % (level, section)
+  return backend_get_bundle(directory, [part])[part]
 
 # BACKEND INTERFACE:
 # Replies the images that must be auto-generated by AutoLaTeX.
@@ -366,16 +659,78 @@ def backend_get_configuration(directory, level, section):
 #                    translators must be search for.
 #                    It is usually the directory of
 #                    the LaTeX document.
-# @return an INI data structure.
+# @return a dictionary in which the keys are the names of the
+#         translators, and the values are dictionaries from
+#         'automatic assignment', 'overriden assignment' and
+#         'files to convert' to lists of files.
 def backend_get_images(directory):
-  os.chdir(directory)
-  process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'get', 'images'], stdout=subprocess.PIPE )
-  data = process.communicate()[0]
-  string_in = io.StringIO(convert_bytes_to_string(data))
-  config = configparser.ConfigParser()
-  config.readfp(string_in)
-  string_in.close()
-  return config
+  return backend_get_bundle(directory, ['images'])['images']
+
+# BACKEND INTERFACE:
+# Replies several data from AutoLaTeX in a single invocation of the backend.
+# @param directory - name of the directory in which the
+#                    translators must be search for.
+#                    It is usually the directory of
+#                    the LaTeX document.
+# @param parts - the list of the parts to retreive. Each part is one of
+#                'translators', 'loads', 'images', 'conflicts',
+#                'conflicts:resolved', 'config:<section>' (for the 'all' level),
+#                or 'config:<level>:<section>'.
+# The replies that are depending only on the configuration files are
+# cached until one of these files is changed.
+# @return a dictionary in which the keys are the parts, and the values
+#         are the data replied by the corresponding backend_get_* functions.
+def backend_get_bundle(directory, parts):
+  directory = os.path.abspath(directory)
+  cache = _get_backend_cache(directory, _get_backend_input_signature(directory))
+  bundle = {}
+  missed_parts = []
+  with _BACKEND_LOCK:
+    for part in parts:
+      if part in cache:
+        bundle[part] = copy.deepcopy(cache[part])
+      elif part not in missed_parts:
+        missed_parts.append(part)
+  if missed_parts:
+    retcode, data = _backend_call(directory, ['get', 'bundle', '--format=json'] + missed_parts)
+    replied = {}
+    if retcode == 0:
+      try:
+        replied = json.loads(data)
+      except ValueError:
+        pass
+      if not isinstance(replied, dict):
+        replied = {}
+    for part in missed_parts:
+      value = replied.get(part) or {}
+      bundle[part] = value
+      # The parts that are missing from the reply, eg. when the
+      # backend has failed, are not cached for trying again later
+      if part in replied and part.split(':')[0] not in _BACKEND_UNCACHED_PARTS:
+        with _BACKEND_LOCK:
+          cache[part] = copy.deepcopy(value)
+  return bundle
+
+# BACKEND INTERFACE:
+# Replies asynchronously several data from AutoLaTeX.
+# @param directory - the directory of the project.
+# @param parts - the list of the parts to retreive, see backend_get_bundle().
+# @param callback - the function that is invoked in a background thread
+#                   with the bundle, or with None on error.
+# @return a concurrent.futures.Future on the bundle.
+def backend_get_bundle_async(directory, parts, callback=None):
+  return backend_async(backend_get_bundle, directory, list(parts), callback=callback)
+
+# BACKEND INTERFACE:
+# Replies asynchronously the configuration of AutoLaTeX.
+# @param directory - the directory of the project.
+# @param level - the configuration level, see backend_get_configuration().
+# @param section - the name of the section.
+# @param callback - the function that is invoked in a background thread
+#                   with the configuration, or with None on error.
+# @return a concurrent.futures.Future on the configuration.
+def backend_get_configuration_async(directory, level, section, callback=None):
+  return backend_async(backend_get_configuration, directory, level, section, callback=callback)
 
 # BACKEND INTERFACE:
 # Change the loaded translators in the AutoLaTeX configuration.
@@ -383,16 +738,11 @@ def backend_get_images(directory):
 #                    translators must be search for.
 #                    It is usually the directory of
 #                    the LaTeX document.
-# @param load_config - an INI data structure that contains the plugin states
+# @param load_config - a dictionary from the levels ('user', 'project') to
+#                      the dictionaries of the loading flags of the translators
 # @return true on success, false on error
 def backend_set_loads(directory, load_config):
-  os.chdir(directory)
-  string_out = io.StringIO()
-  load_config.write(string_out)
-  process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'set', 'loads', ], stdin=subprocess.PIPE)
-  process.communicate(input=string_out.getvalue())
-  string_out.close()
-  return process.returncode == 0
+  return _backend_set_ini(directory, ['set', 'loads'], load_config)
 
 # BACKEND INTERFACE:
 # Change the configuration of AutoLaTeX.
@@ -402,16 +752,31 @@ def backend_set_loads(directory, load_config):
 #                    the LaTeX document.
 # @param level - indicates the configuration level. It must be one of
 #                'user', 'project'.
-# @param settings - an INI data structure that contains the new configuration
+# @param settings - a dictionary of sections that contains the new configuration
 # @return true on success, false on error
 def backend_set_configuration(directory, level, settings):
-  os.chdir(directory)
-  string_out = io.StringIO()
-  settings.write(string_out)
-  process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'set', 'config', level, 'false' ], stdin=subprocess.PIPE)
-  process.communicate(input=string_out.getvalue())
-  string_out.close()
-  return process.returncode == 0
+  return _backend_set_ini(directory, ['set', 'config', level, 'false'], settings)
+
+# BACKEND INTERFACE:
+# Change only the given keys in the configuration of AutoLaTeX.
+# The backend does not write the configuration file when
+# nothing has changed.
+# @param directory - name of the directory in which the
+#                    translators must be search for.
+#                    It is usually the directory of
+#                    the LaTeX document.
+# @param level - indicates the configuration level. It must be one of
+#                'user', 'project'.
+# @param patch - a dictionary of sections that contains the added and
+#                changed values. A value equal to None removes the key
+#                from the configuration.
+# @return true on success, false on error
+def backend_patch_configuration(directory, level, patch):
+  if not patch:
+    return True
+  retcode = _backend_call(directory, ['set', 'patch', level], json.dumps(patch))[0]
+  invalidate_backend_cache(directory)
+  return retcode == 0
 
 # BACKEND INTERFACE:
 # Change the configuration related to the auto-generated images by AutoLaTeX.
@@ -419,14 +784,7 @@ def backend_set_configuration(directory, level, settings):
 #                    translators must be search for.
 #                    It is usually the directory of
 #                    the LaTeX document.
-# @param settings - an INI data structure that contains the new configuration.
+# @param settings - a dictionary from the names of the translators to their attributes.
 # @return true on success, false on error
 def backend_set_images(directory, settings):
-  os.chdir(directory)
-  string_out = io.StringIO()
-  settings.write(string_out)
-  process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'set', 'images', 'false' ], stdin=subprocess.PIPE)
-  process.communicate(input=string_out.getvalue())
-  string_out.close()
-  return process.returncode == 0
-
+  return _backend_set_ini(directory, ['set', 'images', 'false'], settings)
@@ -33,6 +33,8 @@ from gi.repository import GObject, Gtk, Gio, GdkPixbuf, Gedit, PeasGtk
 # AutoLaTeX shared libs
 
 from autolatex.utils import utils as autolatex_utils
+from autolatex.utils import runner as autolatex_runner
+from autolatex.utils import gtk_utils as autolatex_gtk_utils
 from autolatex.utils import gsettings as autolatex_gsettings
 from autolatex.config import window as cli_config
 
@@ -71,6 +73,10 @@ class AutoLaTeXPlugin(GObject.Object, Gedit.WindowActivatable, PeasGtk.Configura
     self._console_icon = None # Icon of the error console
     self._gsettings = autolatex_gsettings.Manager()
     self._syntex_regex = re.compile('\%.*mainfile:\s*(.*)$')
+    self._build_trigger = None # Trigger of the builds when the files are saved
+    self._window_signals = [] # Signals connected to the window
+    self._document_signals = {} # Signals connected to the documents
+    self._saving_documents = set() # Documents that are saved by the plugin
 
   # Invoked when the configuration window is open
   def do_create_configure_widget(self):
@@ -83,11 +89,14 @@ class AutoLaTeXPlugin(GObject.Object, Gedit.WindowActivatable, PeasGtk.Configura
     if not self._gsettings:
       self._gsettings = autolatex_gsettings.Manager()
     self._add_ui()
+    self._connect_documents()
     self._check_autolatex_binaries()
 
   # Invoke when the plugin is desactivated
   def do_deactivate(self):
+    self._disconnect_documents()
     gedit_runner.kill_all_runners()
+    autolatex_utils.close_backend_connections()
     self._remove_ui()
     self._gsettings.unbind()
     self._gsettings = None
@@ -174,6 +183,43 @@ class AutoLaTeXPlugin(GObject.Object, Gedit.WindowActivatable, PeasGtk.Configura
     self._compilation_under_progress = not valid
     GObject.idle_add(self.do_update_state)
 
+  # Display a diagnostic message that was output by a running AutoLaTeX
+  # in the console.
+  def _show_runner_message(self, kind, filename, line, code, text):
+    show_console = self._latex_console.add_message(kind, filename, line, code, text)
+    if show_console == latex_console.ConsoleMode.SHOW:
+      self._open_latex_console(True)
+    return False
+
+  # Display the resources used by the last build in the status bar.
+  def _show_resource_usage(self, max_rss, cpu_time, wall_time):
+    statusbar = self.window.get_statusbar()
+    statusbar.remove_all(self._usage_statusbar_id)
+    if max_rss > 0:
+      statusbar.push(self._usage_statusbar_id,
+          _T("Last build: %.1fs, CPU time: %.1fs, peak memory: %d MB") % (wall_time, cpu_time, max_rss // (1024 * 1024)))
+    else:
+      # The peak memory is unknown when the build was run by a resident AutoLaTeX
+      statusbar.push(self._usage_statusbar_id,
+          _T("Last build: %.1fs, CPU time: %.1fs") % (wall_time, cpu_time))
+    return False
+
+  # Display the durations of the phases of the last build in the
+  # tooltip of the status bar.
+  def _show_timing_report(self, report):
+    lines = []
+    for phase in report.get_phases():
+      if phase['duration'] is None:
+        duration = _T("unfinished")
+      else:
+        duration = "%.2fs" % phase['duration']
+      lines.append("%s%s: %s" % ('  ' * phase['depth'], phase['name'], duration))
+    if lines:
+      self.window.get_statusbar().set_tooltip_text("\n".join(lines))
+    else:
+      self.window.get_statusbar().set_tooltip_text(None)
+    return False
+
   # Load an icon from the AutoLaTeX package
   def _get_icon(self, icon):
     return GdkPixbuf.Pixbuf.new_from_file(autolatex_utils.make_toolbar_icon_path('autolatex-'+icon+'.png'))
@@ -183,6 +229,7 @@ class AutoLaTeXPlugin(GObject.Object, Gedit.WindowActivatable, PeasGtk.Configura
   def _add_ui(self):
     # Get status bar id
     self._statusbar_id = self.window.get_statusbar().get_context_id('gedit-autolatex-plugin')
+    self._usage_statusbar_id = self.window.get_statusbar().get_context_id('gedit-autolatex-plugin-usage')
     # Get the UI manager
     manager = self.window.get_ui_manager()
     # Create the Top menu for AutoLaTeX
@@ -345,8 +392,79 @@ class AutoLaTeXPlugin(GObject.Object, Gedit.WindowActivatable, PeasGtk.Configura
       is_deleted = document.get_deleted()
       is_readonly = document.get_readonly()
       if not is_untitled and not is_deleted and not is_readonly :
+        # The build is already under progress, the save must not trigger another one
+        self._saving_documents.add(document)
         document.save(Gedit.DocumentSaveFlags.IGNORE_MTIME)
 
+  # Listen the saves of the documents for building the AutoLaTeX
+  # documents when one of their files is saved.
+  def _connect_documents(self):
+    self._build_trigger = autolatex_runner.BuildTrigger(self.on_build_triggered)
+    self._window_signals = [
+      self.window.connect('tab-added', self.on_tab_added),
+      self.window.connect('tab-removed', self.on_tab_removed),
+    ]
+    for document in self.window.get_documents():
+      self._connect_document(document)
+
+  # Stop to listen the saves of the documents.
+  def _disconnect_documents(self):
+    if self._build_trigger:
+      self._build_trigger.cancel()
+      self._build_trigger = None
+    for signal_id in self._window_signals:
+      self.window.disconnect(signal_id)
+    self._window_signals = []
+    for document, signal_id in self._document_signals.items():
+      document.disconnect(signal_id)
+    self._document_signals = {}
+    self._saving_documents = set()
+
+  def _connect_document(self, document):
+    if document not in self._document_signals:
+      self._document_signals[document] = document.connect('saved', self.on_document_saved)
+
+  def on_tab_added(self, window, tab, data=None):
+    self._connect_document(tab.get_document())
+
+  def on_tab_removed(self, window, tab, data=None):
+    document = tab.get_document()
+    signal_id = self._document_signals.pop(document, None)
+    if signal_id is not None:
+      document.disconnect(signal_id)
+    self._saving_documents.discard(document)
+
+  # Invoked when a document is saved. The signature of the signal
+  # is changing with the versions of Gedit.
+  def on_document_saved(self, document, *args):
+    if document in self._saving_documents:
+      self._saving_documents.discard(document)
+    elif self._build_trigger and self._gsettings and self._gsettings.get_build_on_save():
+      location = Gedit.Document.get_location(document)
+      if location:
+        directory = autolatex_utils.find_AutoLaTeX_directory(location.get_path())
+        if directory:
+          self._build_trigger.notify_change(directory)
+
+  # Invoked by the build trigger, outside the UI thread, when the
+  # files of a document were saved.
+  def on_build_triggered(self, directory):
+    GObject.idle_add(self._build_saved_document, directory)
+
+  def _build_saved_document(self, directory):
+    if self._build_trigger:
+      if self._compilation_under_progress:
+        # Retry when the current build is finished
+        self._build_trigger.notify_change(directory)
+      else:
+        self._launch_AutoLaTeX(
+          _T("Generating the document"),
+          'all', self._apply_general_autolatex_cli_options(
+          [ '--noview' ]),
+          False,
+          directory)
+    return False
+
   def _apply_general_autolatex_cli_options(self, params):
     if self._gsettings.get_force_synctex():
       params = [ '--synctex' ] + params
@@ -439,25 +557,36 @@ class AutoLaTeXPlugin(GObject.Object, Gedit.WindowActivatable, PeasGtk.Configura
                 max(3,text_buffer.get_line_count()-3))
       # Add the SyncTeX flag
       if not found:
-        private_config = autolatex_utils.backend_get_configuration(
+        autolatex_utils.backend_get_configuration_async(
                   directory,
-                  'all', '__private__');
-        main_file = private_config.get('input', 'latex file', '');
-        current_dir = Gio.File.new_for_path(os.getcwd())
-        main_file = current_dir.resolve_relative_path(main_file).get_path()
-        current_document = self.window.get_active_document()
-        document_file = Gedit.Document.get_location(current_document)
-        if document_file:
-          document_filename = current_dir.resolve_relative_path(document_file.get_path())
-          document_filename = document_filename.get_path()
-          if main_file != document_filename:
-            document_dir = document_file.get_parent()
-            rel_path = os.path.relpath(main_file, document_dir.get_path())
-            text_buffer.insert_interactive(
-                  text_buffer.get_iter_at_line(0),
-                  unicode("% mainfile: "+rel_path+"\n"),
-                  -1,
-                  view.get_editable())
+                  'all', '__private__',
+                  callback=autolatex_gtk_utils.ui_callback(
+                    lambda private_config: self.__insert_synctex_flag(
+                      private_config, directory, view, text_buffer)))
+
+  # Insert the SyncTeX flag in the given buffer.
+  # @param private_config - the private configuration of AutoLaTeX.
+  # @param directory - the directory of the project.
+  # @param view - the view on the buffer.
+  # @param text_buffer - the buffer to update.
+  def __insert_synctex_flag(self, private_config, directory, view, text_buffer):
+    if private_config:
+      main_file = private_config.get('input', {}).get('latex file', '');
+      current_dir = Gio.File.new_for_path(directory)
+      main_file = current_dir.resolve_relative_path(main_file).get_path()
+      # The buffer is the document, which may be no more the active document
+      document_file = Gedit.Document.get_location(text_buffer)
+      if document_file:
+        document_filename = current_dir.resolve_relative_path(document_file.get_path())
+        document_filename = document_filename.get_path()
+        if main_file != document_filename:
+          document_dir = document_file.get_parent()
+          rel_path = os.path.relpath(main_file, document_dir.get_path())
+          text_buffer.insert_interactive(
+                text_buffer.get_iter_at_line(0),
+                unicode("% mainfile: "+rel_path+"\n"),
+                -1,
+                view.get_editable())
 
   def __search_for_synctex_flag(self, text_buffer, line_number):
     found = None
@@ -507,8 +636,9 @@ class AutoLaTeXPlugin(GObject.Object, Gedit.WindowActivatable, PeasGtk.Configura
       self._open_latex_console(show_console == latex_console.ConsoleMode.SHOW)
       self.do_update_state()
 
-  def _launch_AutoLaTeX(self, label, directive, params, enable_saving):
-    directory = self._find_AutoLaTeX_dir()
+  def _launch_AutoLaTeX(self, label, directive, params, enable_saving, directory=None):
+    if not directory:
+      directory = self._find_AutoLaTeX_dir()
     if directory:
       GObject.idle_add(self._update_action_validity, False, None, None)
 
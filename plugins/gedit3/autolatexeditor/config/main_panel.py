@@ -177,6 +177,20 @@ class Panel(Gtk.Grid):
     self._ui_save_before_run.set_property('valign', Gtk.Align.CENTER)
     ui_table.attach(self._ui_save_before_run, 
         1,0,1,1) # left, top, width, height
+    ui_label = Gtk.Label(_T("Build the document when a file is saved"))
+    ui_label.set_property('hexpand', True)
+    ui_label.set_property('vexpand', False)
+    ui_label.set_property('halign', Gtk.Align.START)
+    ui_label.set_property('valign', Gtk.Align.CENTER)
+    ui_table.attach(ui_label, 
+        0,1,1,1) # left, right, width, height
+    self._ui_build_on_save = Gtk.Switch()
+    self._ui_build_on_save.set_property('hexpand', False)
+    self._ui_build_on_save.set_property('vexpand', False)
+    self._ui_build_on_save.set_property('halign', Gtk.Align.END)
+    self._ui_build_on_save.set_property('valign', Gtk.Align.CENTER)
+    ui_table.attach(self._ui_build_on_save, 
+        1,1,1,1) # left, top, width, height
 
     # Set the initial values
     self.on_initialize_fields()
@@ -190,6 +204,7 @@ class Panel(Gtk.Grid):
       self._settings.disconnect('force-synctex')
       self._settings.disconnect('show-progress-info')
       self._settings.disconnect('save-before-run-autolatex')
+      self._settings.disconnect('build-on-save')
       self.disconnect(self._ui_hierarchy_connect_id)
       self.on_save_changes()
     else:
@@ -198,6 +213,7 @@ class Panel(Gtk.Grid):
       self._settings.connect('force-synctex', self.on_gsettings_changed)
       self._settings.connect('show-progress-info', self.on_gsettings_changed)
       self._settings.connect('save-before-run-autolatex', self.on_gsettings_changed)
+      self._settings.connect('build-on-save', self.on_gsettings_changed)
 
   # Invoked when the different fields in the preference box must be initialized
   def on_initialize_fields(self):
@@ -213,6 +229,8 @@ class Panel(Gtk.Grid):
     self._ui_show_progress_info_bar.set_active(flag)
     flag = self._settings.get_save_before_run_autolatex()
     self._ui_save_before_run.set_active(flag)
+    flag = self._settings.get_build_on_save()
+    self._ui_build_on_save.set_active(flag)
 
   # Invoked when the changes in the preference dialog box should be saved
   def on_save_changes(self):
@@ -226,6 +244,8 @@ class Panel(Gtk.Grid):
     self._settings.set_progress_info_visibility(show_info_bar)
     save_before_run = self._ui_save_before_run.get_active()
     self._settings.set_save_before_run_autolatex(save_before_run)
+    build_on_save = self._ui_build_on_save.get_active()
+    self._settings.set_build_on_save(build_on_save)
   
   def on_gsettings_changed(self, settings, key, data=None):
     if key == 'autolatex-cmd':
@@ -275,4 +295,13 @@ class Panel(Gtk.Grid):
         dialog.destroy()
         if  answer == Gtk.ResponseType.YES:
           self._ui_show_progress_info_bar.set_active(gsettings_flag)
+    elif key == 'build-on-save':
+      gsettings_flag = self._settings.get_build_on_save()
+      window_flag = self._ui_build_on_save.get_active()
+      if gsettings_flag != window_flag:
+        dialog = Gtk.MessageDialog(self.window, Gtk.DialogFlags.MODAL, Gtk.MessageType.WARNING, Gtk.ButtonsType.YES_NO, _T("The flag to build the document when a file is saved has been changed by an external software. The new flag is different from the one inside the preference dialog box. Do you want to use the new flag?"))
+        answer = dialog.run()
+        dialog.destroy()
+        if  answer == Gtk.ResponseType.YES:
+          self._ui_build_on_save.set_active(gsettings_flag)
 
@@ -22,11 +22,9 @@
 from gi.repository import GObject, Gtk, Gedit
 from autolatex.utils import runner as autolatex_runner
 
-# List of all the runners
-_all_runners = []
-
 def kill_all_runners():
   autolatex_runner.kill_all_runners()
+  autolatex_runner.stop_all_workers()
 
 class Runner(autolatex_runner.Listener):
 
@@ -42,11 +40,16 @@ class Runner(autolatex_runner.Listener):
     self._automatic_bar_creation = False
     self._last_fraction = 0
     self._last_comment = None
-    self._thread = autolatex_runner.Runner(self, directory, directive, params)
+    gsettings = caller._gsettings
+    self._thread = autolatex_runner.Runner(self, directory, directive, params,
+      timeout=gsettings.get_build_timeout(),
+      memory_limit=gsettings.get_build_memory_limit() * 1024 * 1024,
+      niceness=gsettings.get_build_niceness(),
+      use_worker=gsettings.get_build_resident_worker())
 
   def start(self):
     if self._thread:
-      self._thread.start()
+      autolatex_runner.schedule(self._thread)
 
   def cancel(self):
     if self._thread:
@@ -70,6 +73,17 @@ class Runner(autolatex_runner.Listener):
   def on_runner_progress(self, amount, comment):
     GObject.idle_add(self._update_info_bar, amount, comment)
 
+  def on_runner_message(self, kind, filename, line, code, text):
+    GObject.idle_add(self._caller._show_runner_message,
+      kind, filename, line, code, text)
+
+  def on_runner_resource_usage(self, max_rss, cpu_time, wall_time):
+    GObject.idle_add(self._caller._show_resource_usage,
+      max_rss, cpu_time, wall_time)
+
+  def on_runner_timing_report(self, report):
+    GObject.idle_add(self._caller._show_timing_report, report)
+
   def on_runner_finalize_execution(self, retcode, output, latex_warnings):
     self._automatic_bar_creation = False
     GObject.idle_add(self._caller._update_action_validity,
@@ -126,8 +140,8 @@ class Runner(autolatex_runner.Listener):
     self._last_comment = comment
     if self._automatic_bar_creation and not self._info_bar and not self.__has_info_child():
       self._automatic_bar_creation = False
-      GObject.idle_add(self._add_info_bar)
-    GObject.idle_add(self.__set_info_bar_data, progress_value, comment)
+      self._add_info_bar()
+    self.__set_info_bar_data(progress_value, comment)
 
   def __set_info_bar_data(self, progress_value, comment):
     #print "MOVE TO "+str(progress_value)+"/"+str(comment)
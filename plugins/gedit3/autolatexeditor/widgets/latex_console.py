@@ -28,6 +28,7 @@ import re
 from gi.repository import GObject, GdkPixbuf, Gdk, Gio, Gtk
 # AutoLaTeX includes
 from autolatex.utils import latex_log_parser as log_parser
+from autolatex.utils import runner as autolatex_runner
 
 #---------------------------------
 # INTERNATIONALIZATION
@@ -143,6 +144,33 @@ class Console(Gtk.ScrolledWindow):
       return ConsoleMode.OPTIONAL
     return ConsoleMode.HIDE
 
+  # Add a diagnostic message that was received while AutoLaTeX is running.
+  # @param kind - the kind of the message, see autolatex.utils.runner.MessageKind.
+  # @param filename - the name of the file concerned by the message.
+  # @param linenumber - the line number in the file, or 0 if unknown.
+  # @param code - the code of the warning (eg. 'W1'), or None.
+  # @param message - the text of the message.
+  # @return the mode of display of the console.
+  def add_message(self, kind, filename, linenumber, code, message):
+    if kind == autolatex_runner.MessageKind.ERROR:
+      ui_icon = Gtk.STOCK_DIALOG_ERROR
+    elif code:
+      ui_icon = Gtk.STOCK_JUMP_TO
+    else:
+      ui_icon = Gtk.STOCK_DIALOG_WARNING
+    if code:
+      self._messages.append(
+        [ ui_icon, message, filename, int(0), code ])
+    else:
+      m = filename
+      if linenumber>0:
+        m = m + ":" + str(linenumber)
+      self._messages.append(
+        [ ui_icon, m+"\n"+message, filename, int(linenumber), None ])
+    if kind == autolatex_runner.MessageKind.ERROR:
+      return ConsoleMode.SHOW
+    return ConsoleMode.OPTIONAL
+
   # Display the next error.
   def show_next_error(self):
     length = len(self._messages)
@@ -21,6 +21,7 @@
 
 import os
 import re
+import select
 import subprocess
 
 # Try to use the threading library if it is available
@@ -34,6 +35,29 @@ import utils
 # List of all the runners
 _all_runners = []
 
+# Size of the blocks read from the outputs of AutoLaTeX
+_READ_BUFFER_SIZE = 4096
+
+# Regular expressions for the diagnostic messages of AutoLaTeX
+_CODED_WARNING_PATTERN = re.compile("^\\!\\!(.+?):(W[0-9]+):[^:]+:\\s*(.+?)\\s*$")
+_WARNING_PATTERN = re.compile("^(.+?):([0-9]+):\\s*warning:\\s*(.*?)\\s*$")
+_ERROR_PATTERN = re.compile("^(.+?):([0-9]+):\\s*(.*?)\\s*$")
+
+# Parse a line of the error output of AutoLaTeX.
+# Replies the tuple (kind, filename, line, code, text), or None if
+# the line is not a diagnostic message.
+def _parse_message(line):
+	mo = re.match(_CODED_WARNING_PATTERN, line)
+	if mo:
+		return (MessageKind.WARNING, mo.group(1), 0, mo.group(2), mo.group(3))
+	mo = re.match(_WARNING_PATTERN, line)
+	if mo:
+		return (MessageKind.WARNING, mo.group(1), int(mo.group(2)), None, mo.group(3))
+	mo = re.match(_ERROR_PATTERN, line)
+	if mo:
+		return (MessageKind.ERROR, mo.group(1), int(mo.group(2)), None, mo.group(3))
+	return None
+
 def kill_all_runners():
 	global _all_runners
 	tab = _all_runners
@@ -41,6 +65,11 @@ def kill_all_runners():
 	for r in tab:
 		r.cancel()
 
+# Kinds of the diagnostic messages
+class MessageKind:
+	ERROR = 'error'
+	WARNING = 'warning'
+
 # Launch AutoLaTeX inside a thread, and wait for the result
 class Listener(object):
 	def get_runner_progress(self):
@@ -51,6 +80,11 @@ class Listener(object):
 		pass
 	def on_runner_progress(self, amount, comment):
 		pass
+	# Invoked as soon as a diagnostic message is output, while the task is running.
+	# kind is one of the MessageKind constants, line is 0 if unknown,
+	# and code is the code of the warning (eg. 'W1') or None.
+	def on_runner_message(self, kind, filename, line, code, text):
+		pass
 	def on_runner_finalize_execution(self, retcode, output, latex_warnings):
 		pass
 
@@ -84,6 +118,45 @@ class Runner(_threading.Thread):
 		# Update the rest of the UI from the inside of the UI  thread
 		self._listener.on_runner_finalize_execution(0, '', [])
 
+	# Read the standard output and the standard error of the subprocess
+	# concurrently until they are closed. The thread is sleeping while
+	# no data is available.
+	# stdout_callback is invoked with each line of the standard output,
+	# or it is None to ignore the standard output.
+	# stderr_callback is invoked with each line of the standard error.
+	# Replies the standard error of the subprocess.
+	def _read_outputs(self, proc, stdout_callback, stderr_callback):
+		stdout_buffer = ''
+		stderr_buffer = ''
+		stderr_line = ''
+		streams = [ proc.stdout, proc.stderr ]
+		while streams:
+			readables = select.select(streams, [], [])[0]
+			for stream in readables:
+				data = os.read(stream.fileno(), _READ_BUFFER_SIZE)
+				if not data:
+					streams.remove(stream)
+					stream.close()
+					if stream is proc.stdout and stdout_buffer and stdout_callback:
+						stdout_callback(stdout_buffer)
+					elif stream is proc.stderr and stderr_line:
+						stderr_callback(stderr_line)
+				elif stream is proc.stdout:
+					if stdout_callback:
+						lines = re.split('[\n\r]', stdout_buffer + data)
+						stdout_buffer = lines.pop()
+						for line in lines:
+							if line:
+								stdout_callback(line)
+				else:
+					stderr_buffer += data
+					lines = re.split('[\n\r]', stderr_line + data)
+					stderr_line = lines.pop()
+					for line in lines:
+						if line:
+							stderr_callback(line)
+		return stderr_buffer
+
 	# Run the thread
 	def run(self):
 		global _all_runners
@@ -101,47 +174,29 @@ class Runner(_threading.Thread):
 			progress_line_pattern = re.compile("^\\[\\s*([0-9]+)\\%\\]\\s+[#.]+(.*)$")
 
 		# Launch the subprocess
-		os.chdir(self._directory)
-		self._subprocess = subprocess.Popen(self._cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+		self._subprocess = subprocess.Popen(self._cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=self._directory)
 		output = ''
 		if self._subprocess:
+			proc = self._subprocess
 			if self._has_progress:
 				# Use the info bar to draw the progress of the task
-				if self._subprocess:
-					self._subprocess.poll()
-				# Loop until the subprocess is dead
-				while self._subprocess and self._subprocess.returncode is None:
-					if self._subprocess and not self._subprocess.stdout.closed:
-						# Read a line from STDOUT and extract the progress amount
-						if self._subprocess:
-							self._subprocess.stdout.flush()
-						if self._subprocess:
-							line = self._subprocess.stdout.readline()
-						if line:
-							mo = re.match(progress_line_pattern, line)
-							if mo:
-								amount = (float(mo.group(1)) / 100.)
-								comment = mo.group(2).strip()
-								self._listener.on_runner_progress(amount, comment)
-
-					if self._subprocess:
-						self._subprocess.poll()
-				# Kill the subprocess if 
-				proc = self._subprocess
-				if proc:
-					retcode = proc.returncode
-					# Read the error output of AutoLaTeX
-					proc.stderr.flush()
-					for line in proc.stderr:
-						output = output + line
-					proc.stdout.close()
-					proc.stderr.close()
-
+				def on_stdout_line(line):
+					mo = re.match(progress_line_pattern, line)
+					if mo:
+						amount = (float(mo.group(1)) / 100.)
+						comment = mo.group(2).strip()
+						self._listener.on_runner_progress(amount, comment)
 			else:
 				# Silent execution of the task
-				out, err = self._subprocess.communicate() if self._subprocess else ('','')
-				retcode = self._subprocess.returncode if self._subprocess else 0
-				output = err
+				on_stdout_line = None
+			# Notify the diagnostic messages as soon as they are received
+			def on_stderr_line(line):
+				message = _parse_message(line)
+				if message:
+					self._listener.on_runner_message(*message)
+			# Drain the outputs of AutoLaTeX until the subprocess is dead
+			output = self._read_outputs(proc, on_stdout_line, on_stderr_line)
+			retcode = proc.wait()
 
 			# Stop because the subprocess was cancelled
 			if not self._subprocess:
@@ -156,9 +211,8 @@ class Runner(_threading.Thread):
 			# "warning" notifications.
 			latex_warnings = []
 			if retcode == 0:
-				regex_expr = re.compile("^\\!\\!(.+?):(W[0-9]+):[^:]+:\\s*(.+?)\\s*$")
 				for output_line in re.split("[\n\r]+", output):
-					mo = re.match(regex_expr, output_line)
+					mo = re.match(_CODED_WARNING_PATTERN, output_line)
 					if mo:
 						latex_warnings.append([mo.group(3),mo.group(1), mo.group(2)])
 				output = '' # Output is no more interesting
@@ -37,6 +37,7 @@ class AbstractRunnerCommand(runner.Listener):
 		runner.Listener.__init__(self)
 		self._thread = None
 		self._show_progress = True
+		self._has_messages = False
 
 	def cancel_task(self):
 		if self._thread:
@@ -63,6 +64,8 @@ class AbstractRunnerCommand(runner.Listener):
 		# settings, so that it'll be picked up as a result buffer
 		self.window.get_output_panel("autolatex")
 
+		self._has_messages = False
+
 		# Show the progress
 		if self._show_progress:
 			sublime.status_message(_T("Building [%d%%]") % int(0))
@@ -94,6 +97,44 @@ class AbstractRunnerCommand(runner.Listener):
 		else:
 			sublime.status_message(_T("Building [%d%%]") % int(amount * 100))
 
+	def on_runner_message(self, kind, filename, line, code, text):
+		# Show the message in the output panel while AutoLaTeX is running
+		if kind == runner.MessageKind.ERROR:
+			message = "%s:%d: %s\n" % (filename, line, text)
+		else:
+			message = "%s:%d: %s: %s\n" % (filename, max(line, 1), _T("warning"), text)
+		self._append_output(message, True)
+
+	# Append the given message in the output panel.
+	# If is_streamed is True, the message was received while AutoLaTeX is running.
+	def _append_output(self, message, is_streamed=False):
+		try:
+		    message = message.decode(self._encoding)
+		except:
+		    message = _T("[Decode error - output not %s]") % self._encoding
+
+		# Normalize newlines, Sublime Text always uses a single \n separator
+		# in memory.
+		message = message.replace('\r\n', '\n').replace('\r', '\n')
+
+	        selection_was_at_end = (len(self.output_view.sel()) == 1
+		    and self.output_view.sel()[0]
+			== sublime.Region(self.output_view.size()))
+
+		self.output_view.set_read_only(False)
+		edit = self.output_view.begin_edit()
+		if not is_streamed and self._has_messages:
+			# Replace the messages received while AutoLaTeX was running
+			self.output_view.erase(edit, sublime.Region(0, self.output_view.size()))
+			self._has_messages = False
+		elif is_streamed:
+			self._has_messages = True
+		self.output_view.insert(edit, self.output_view.size(), message)
+		if selection_was_at_end:
+		    self.output_view.show(self.output_view.size())
+		self.output_view.end_edit(edit)
+		self.output_view.set_read_only(True)
+
 	def on_runner_finalize_execution(self, retcode, output, latex_warnings):
 		messages = []
 		if retcode != 0:
@@ -103,26 +144,7 @@ class AbstractRunnerCommand(runner.Listener):
 				messages.append(warning[1]+":1: "+warning[0])
 
 		for message in messages:
-			try:
-			    message = message.decode(self._encoding)
-			except:
-			    message = _T("[Decode error - output not %s]") % self._encoding
-
-			# Normalize newlines, Sublime Text always uses a single \n separator
-			# in memory.
-			message = message.replace('\r\n', '\n').replace('\r', '\n')
-
-		        selection_was_at_end = (len(self.output_view.sel()) == 1
-			    and self.output_view.sel()[0]
-				== sublime.Region(self.output_view.size()))
-
-			self.output_view.set_read_only(False)
-			edit = self.output_view.begin_edit()
-			self.output_view.insert(edit, self.output_view.size(), message)
-			if selection_was_at_end:
-			    self.output_view.show(self.output_view.size())
-			self.output_view.end_edit(edit)
-			self.output_view.set_read_only(True)
+			self._append_output(message)
 
 		if retcode!=0:
 		    sublime.status_message(_T("Build finished with an error"))
@@ -183,8 +183,7 @@ def make_table_icon_path(name):
 
 
 def backend_get_translators(directory):
-	os.chdir(directory)
-	process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'get', 'translators'], stdout=subprocess.PIPE )
+	process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'get', 'translators'], stdout=subprocess.PIPE, cwd=directory )
 	data = process.communicate()[0]
 	string_in = StringIO.StringIO(data)
 	config = ConfigParser.ConfigParser()
@@ -193,8 +192,7 @@ def backend_get_translators(directory):
 	return config
 
 def backend_get_loads(directory):
-	os.chdir(directory)
-	process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'get', 'loads', ], stdout=subprocess.PIPE )
+	process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'get', 'loads', ], stdout=subprocess.PIPE, cwd=directory )
 	data = process.communicate()[0]
 	string_in = StringIO.StringIO(data)
 	config = ConfigParser.ConfigParser()
@@ -203,8 +201,7 @@ def backend_get_loads(directory):
 	return config
 
 def backend_get_configuration(directory, level, section):
-	os.chdir(directory)
-	process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'get', 'config', level, section], stdout=subprocess.PIPE )
+	process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'get', 'config', level, section], stdout=subprocess.PIPE, cwd=directory )
 	data = process.communicate()[0]
 	string_in = StringIO.StringIO(data)
 	config = ConfigParser.ConfigParser()
@@ -213,8 +210,7 @@ def backend_get_configuration(directory, level, section):
 	return config
 
 def backend_get_images(directory):
-	os.chdir(directory)
-	process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'get', 'images'], stdout=subprocess.PIPE )
+	process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'get', 'images'], stdout=subprocess.PIPE, cwd=directory )
 	data = process.communicate()[0]
 	string_in = StringIO.StringIO(data)
 	config = ConfigParser.ConfigParser()
@@ -223,28 +219,25 @@ def backend_get_images(directory):
 	return config
 
 def backend_set_loads(directory, load_config):
-	os.chdir(directory)
 	string_out = StringIO.StringIO()
 	load_config.write(string_out)
-	process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'set', 'loads', ], stdin=subprocess.PIPE)
+	process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'set', 'loads', ], stdin=subprocess.PIPE, cwd=directory )
 	process.communicate(input=string_out.getvalue())
 	string_out.close()
 	return process.returncode == 0
 
 def backend_set_configuration(directory, level, settings):
-	os.chdir(directory)
 	string_out = StringIO.StringIO()
 	settings.write(string_out)
-	process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'set', 'config', level, 'false' ], stdin=subprocess.PIPE)
+	process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'set', 'config', level, 'false' ], stdin=subprocess.PIPE, cwd=directory )
 	process.communicate(input=string_out.getvalue())
 	string_out.close()
 	return process.returncode == 0
 
 def backend_set_images(directory, settings):
-	os.chdir(directory)
 	string_out = StringIO.StringIO()
 	settings.write(string_out)
-	process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'set', 'images', 'false' ], stdin=subprocess.PIPE)
+	process = subprocess.Popen( [AUTOLATEX_BACKEND_BINARY, 'set', 'images', 'false' ], stdin=subprocess.PIPE, cwd=directory )
 	process.communicate(input=string_out.getvalue())
 	string_out.close()
 	return process.returncode == 0
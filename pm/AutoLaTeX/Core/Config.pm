@@ -92,7 +92,20 @@ my %CONFIGURATION_COMMENTS = (
 							"the target 'cleanall' is invoked."),
 	# GENERATION
 	'generation.biblio'			=> _T(	"Indicates if bibliography tool (bibtex,biber) should be run ('yes' or 'no')."),
+	'generation.excluded images'		=> _T(	"List of shell wildcards for the files and the directories that are ignored ".
+							"when AutoLaTeX is searching for the pictures. A pattern without a '/' is ".
+							"matched against the names of the files and of the directories; otherwise it ".
+							"is matched against their paths relative to the project directory. The patterns ".
+							"are separated by the path-separator character (':' on Unix, ';' on Windows)"),
 	'generation.generate images'		=> _T(	"Does the figures must be automatically generated ('yes' or 'no')?"),
+	'generation.image cache'		=> _T(	"Directory of the cache of the translated images. The files generated ".
+							"by the translators are stored in this directory, and they are reused ".
+							"when an image with the same content must be translated again with ".
+							"the same translator, even from another copy of the document. ".
+							"If it is empty, the cache is not used."),
+	'generation.image cache size'		=> _T(	"Maximal size of the cache of the translated images, in megabytes. ".
+							"When the cache is bigger, the least recently used images are removed ".
+							"from the cache. If it is zero, the size of the cache is not bounded."),
 	'generation.image directory'		=> _T(	"Specify the directories inside which AutoLaTeX ".
 							"will find the pictures which must be processed ".
 							"by the translators. Each time this option is ".
@@ -101,6 +114,10 @@ my %CONFIGURATION_COMMENTS = (
 							"The different paths are separated by the ".
 							"path-separator character (':' on Unix, ';' on ".
 							"Windows)"),
+	'generation.interpreter workers'	=> _T(	"Indicates if the translators that are written in Python, Ruby or shell ".
+							"script are run by a long-lived interpreter for each translator, in ".
+							"place of a new interpreter for each image ('yes' or 'no'). Each image ".
+							"is still translated in its own process, forked from the long-lived interpreter."),
 	'generation.main file'			=> _T(	"Main filename (this option is only available in project's ".
 							"configuration files)."),
 	'generation.generation type'		=> _T(	"Type of generation.\n   pdf   : use pdflatex to create a ".
@@ -123,6 +140,16 @@ my %CONFIGURATION_COMMENTS = (
 							"loaded. This is a list of paths separated by the path ".
 							"separator character used by your operating system: ':' ".
 							"on Unix platforms or ';' on Windows platforms for example."),
+	'generation.draft mode'			=> _T(	"Indicates if the intermediate runs of the LaTeX tool are done in draft mode ".
+							"('yes' or 'no'). In draft mode, the output document is not produced, and ".
+							"the images are not included. A last run produces the output document."),
+	'generation.precompiled preamble'	=> _T(	"Indicates if the preamble of the document is precompiled in a format file ".
+							"for accelerating the LaTeX compilations ('yes' or 'no'). The format is ".
+							"generated with the mylatexformat tool, and it is regenerated when the ".
+							"preamble or one of the files read by the preamble has changed."),
+	'generation.referenced images'		=> _T(	"Indicates if only the images that are referenced by the TeX files of the ".
+							"document, eg. with \\includegraphics or \\input, are generated ('yes' or 'no'). ".
+							"The images that are not referenced are reported."),
 	'generation.synctex'			=> _T(	"Indicates if the PDF document must be produced with the SyncTeX flag on or not. ".
 							"SyncTeX enables to link a PDF viewer (as evince) and a text editor (as Gedit). ".
 							"When you click inside one, the other is highlighting the line in its side."),
@@ -0,0 +1,355 @@
+# autolatex - FileMonitor.pm
+# Copyright (C) 2013  Stephane Galland <galland@arakhne.org>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 59 Temple Place - Suite 330,
+# Boston, MA 02111-1307, USA.
+
+=pod
+
+=head1 NAME
+
+FileMonitor.pm - Monitor of the changes in files
+
+=head1 DESCRIPTION
+
+Provides a tool to detect the changes in a set of files
+and directories, or to wait for them.
+On Linux, the waiting is based on inotify when the module
+Linux::Inotify2 is installed. Otherwise, the files are polled.
+
+To use this library, type C<use AutoLaTeX::Core::FileMonitor;>.
+
+=head1 GETTING STARTED
+
+=head2 Initialization
+
+To create a monitor, say something like this:
+
+    use AutoLaTeX::Core::FileMonitor;
+
+    my $monitor = AutoLaTeX::Core::FileMonitor->new() ;
+    $monitor->addFile('document.tex');
+    $monitor->addDirectory('imgs');
+    ...
+    if ($monitor->hasChanged()) {
+        ...
+    }
+    $monitor->waitForChange();
+
+...or something similar.
+
+=head1 METHOD DESCRIPTIONS
+
+This section contains only the methods in FileMonitor.pm itself.
+
+=over
+
+=cut
+package AutoLaTeX::Core::FileMonitor;
+
+our @ISA = qw( Exporter );
+our @EXPORT = qw( );
+our @EXPORT_OK = qw();
+
+require 5.014;
+use strict;
+use utf8;
+use vars qw(@ISA @EXPORT @EXPORT_OK $VERSION);
+use Exporter;
+use Carp;
+use File::Spec;
+use File::Basename;
+use Time::HiRes qw();
+use AutoLaTeX::Core::Util;
+
+our $VERSION = '1.0';
+
+# Period of the polling of the files when inotify is not available, in seconds
+my $POLLING_PERIOD = 0.5;
+
+# Default duration without change after which the changes are assumed to be finished, in seconds
+my $DEFAULT_DEBOUNCE_DURATION = 0.5;
+
+# Indicates if inotify is available
+my $HAS_INOTIFY = undef;
+
+#------------------------------------------------------
+#
+# Constructor
+#
+#------------------------------------------------------
+
+sub new() : method {
+	my $proto = shift;
+	my $class = ref($proto) || $proto;
+	my $self = {
+		'stamps' => {},
+		'filters' => {},
+	};
+	bless( $self, $class );
+	return $self;
+}
+
+=pod
+
+=item * addFile($)
+
+Add a file in the monitored files. The file
+may not exist.
+
+=over 4
+
+=item B<filename> is the name of the file.
+
+=back
+
+=cut
+sub addFile($) : method {
+	my $self = shift;
+	my $filename = shift;
+	$self->{'stamps'}{"$filename"} = _stamp($filename) if ($filename);
+}
+
+=pod
+
+=item * addDirectory($;$)
+
+Add a directory and all its subdirectories in the monitored
+directories. The addition and the removal of files are detected,
+not the changes inside the files.
+
+=over 4
+
+=item B<directory> is the name of the directory.
+
+=item B<filter> (optional) is the regular expression that must match the names
+of the files for which the addition or the removal is a change.
+If it is not given, any change of the directory is detected.
+
+=back
+
+=cut
+sub addDirectory($;$) : method {
+	my $self = shift;
+	my @dirs = ( shift );
+	my $filter = shift;
+	while (@dirs) {
+		my $dir = shift @dirs;
+		$self->{'filters'}{"$dir"} = $filter if ($filter);
+		$self->{'stamps'}{"$dir"} = _stamp($dir, $filter);
+		local *DIR;
+		if (opendir(*DIR, "$dir")) {
+			while (my $fn = readdir(*DIR)) {
+				if (!isIgnorableDirectory($fn)) {
+					my $ffn = File::Spec->catfile("$dir", "$fn");
+					push @dirs, "$ffn" if (-d "$ffn");
+				}
+			}
+			closedir(*DIR);
+		}
+	}
+}
+
+=pod
+
+=item * hasChanged()
+
+Replies if one of the monitored files or directories has changed
+since it was added to this monitor, or since the last call to
+this function.
+Only the modification stamps of the files and directories are
+read, the content of the directories is not read again.
+
+=cut
+sub hasChanged() : method {
+	my $self = shift;
+	my $changed = 0;
+	foreach my $filename (keys %{$self->{'stamps'}}) {
+		my $stamp = _stamp($filename, $self->{'filters'}{$filename});
+		if ($stamp ne $self->{'stamps'}{$filename}) {
+			$self->{'stamps'}{$filename} = $stamp;
+			$changed = 1;
+		}
+	}
+	return $changed;
+}
+
+=pod
+
+=item * isModifiedSince($)
+
+Replies if one of the monitored files was modified at or after
+the given date, eg. when a file was saved during a build, before
+it was added to this monitor. The directories are not considered.
+
+=over 4
+
+=item B<date> is the date in seconds since the epoch.
+
+=back
+
+=cut
+sub isModifiedSince($) : method {
+	my $self = shift;
+	my $date = shift;
+	foreach my $filename (keys %{$self->{'stamps'}}) {
+		if (!exists $self->{'filters'}{$filename}) {
+			my @stats = Time::HiRes::stat("$filename");
+			return 1 if (@stats && !-d _ && $stats[9]>=$date);
+		}
+	}
+	return 0;
+}
+
+=pod
+
+=item * waitForChange(;$)
+
+Wait until one of the monitored files or directories has changed,
+and until the changes are finished, eg. when an editor is saving
+several files.
+
+=over 4
+
+=item B<debounce> (optional) is the duration without change, in seconds, after which
+the changes are assumed to be finished.
+
+=back
+
+=cut
+sub waitForChange(;$) : method {
+	my $self = shift;
+	my $debounce = shift;
+	$debounce = $DEFAULT_DEBOUNCE_DURATION unless (defined($debounce) && $debounce>=0);
+	my $inotify = $self->_createInotify();
+	if ($inotify) {
+		$self->_waitForInotifyEvent($inotify, undef);
+		while ($self->_waitForInotifyEvent($inotify, $debounce)) {
+			# Wait for the end of the changes
+		}
+		# Update the stamps
+		$self->hasChanged();
+	}
+	else {
+		while (!$self->hasChanged()) {
+			Time::HiRes::sleep($POLLING_PERIOD);
+		}
+		do {
+			Time::HiRes::sleep($debounce);
+		}
+		while ($self->hasChanged());
+	}
+}
+
+# Create the inotify watches on the monitored files and directories.
+# Replies the Linux::Inotify2 object, or undef if inotify is not available.
+sub _createInotify() : method {
+	my $self = shift;
+	if (!defined($HAS_INOTIFY)) {
+		$HAS_INOTIFY = ($^O eq 'linux' && eval { require Linux::Inotify2; 1 }) ? 1 : 0;
+	}
+	return undef unless ($HAS_INOTIFY);
+	my $inotify = Linux::Inotify2->new() or return undef;
+	my $mask = Linux::Inotify2::IN_CLOSE_WRITE() | Linux::Inotify2::IN_MOVED_TO() |
+		Linux::Inotify2::IN_MOVED_FROM() | Linux::Inotify2::IN_CREATE() |
+		Linux::Inotify2::IN_DELETE();
+	# The parent directories are watched because the editors
+	# are replacing the files when they are saved
+	my %dirs = ();
+	foreach my $filename (keys %{$self->{'stamps'}}) {
+		if (-d "$filename") {
+			$dirs{"$filename"} = 1;
+		}
+		else {
+			$dirs{dirname("$filename")} = 1;
+		}
+	}
+	foreach my $dir (keys %dirs) {
+		$inotify->watch("$dir", $mask) if (-d "$dir");
+	}
+	$inotify->blocking(0);
+	return $inotify;
+}
+
+# Wait for an inotify event on the monitored files and directories.
+# Parameters:
+# $_[0] = the Linux::Inotify2 object.
+# $_[1] = the maximal duration of the waiting in seconds, or undef for no limit.
+# Result: true if a change was detected, false if the duration has expired.
+sub _waitForInotifyEvent($$) : method {
+	my $self = shift;
+	my $inotify = shift;
+	my $timeout = shift;
+	my $end = defined($timeout) ? Time::HiRes::time() + $timeout : undef;
+	while (1) {
+		my $remaining = defined($end) ? $end - Time::HiRes::time() : undef;
+		return 0 if (defined($remaining) && $remaining<=0);
+		my $rin = '';
+		vec($rin, $inotify->fileno(), 1) = 1;
+		my $nfound = select($rin, undef, undef, $remaining);
+		next if ($nfound<0 && $!{EINTR});
+		return 0 if ($nfound<=0);
+		foreach my $event ($inotify->read()) {
+			my $filename = $event->fullname();
+			if (exists $self->{'stamps'}{"$filename"}) {
+				return 1;
+			}
+			my $dir = $event->w()->name();
+			if (exists $self->{'stamps'}{"$dir"}) {
+				my $filter = $self->{'filters'}{"$dir"};
+				return 1 if (!$filter || $event->name() =~ /$filter/);
+			}
+		}
+	}
+}
+
+# Replies a string that is changing when the file is changing.
+# Parameters:
+# $_[0] = the name of the file.
+# $_[1] = the regular expression for the files in the directory, if the file is a directory.
+sub _stamp($;$) {
+	my $filename = shift;
+	my $filter = shift;
+	if ($filter) {
+		local *DIR;
+		opendir(*DIR, "$filename") or return '';
+		my @names = sort grep { /$filter/ } readdir(*DIR);
+		closedir(*DIR);
+		return join("\0", @names);
+	}
+	my @stats = Time::HiRes::stat("$filename");
+	return '' unless (@stats);
+	return join(':', $stats[1], $stats[7], $stats[9]);
+}
+
+1;
+__END__
+=back
+
+=head1 BUG REPORT AND FEEDBACK
+
+To report bug, provide feedback, suggest new features, etc. visit the AutoLaTeX Project management page at <http://www.arakhne.org/autolatex/> or send email to the author at L<galland@arakhne.org>.
+
+=head1 LICENSE
+
+S<GNU Public License (GPL)>
+
+=head1 COPYRIGHT
+
+S<Copyright (c) 2013 Stéphane Galland E<lt>galland@arakhne.orgE<gt>>
+
+=head1 SEE ALSO
+
+L<autolatex-dev>
@@ -0,0 +1,359 @@
+# autolatex - ImageCache.pm
+# Copyright (C) 2013  Stephane Galland <galland@arakhne.org>
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 59 Temple Place - Suite 330,
+# Boston, MA 02111-1307, USA.
+
+=pod
+
+=head1 NAME
+
+ImageCache.pm - Cache of the translated images
+
+=head1 DESCRIPTION
+
+Provides a cache of the files generated by the translators.
+The entries of the cache are identified by a key that is computed
+from the content of the source image, the definition of the
+translator, and the type of generation. Because the key does
+not depend on the location of the source image, the cache
+directory may be shared by several copies of a document.
+
+When the size of the cache is greater than the maximal size,
+the least recently used entries are removed.
+
+To use this library, type C<use AutoLaTeX::Core::ImageCache;>.
+
+=head1 GETTING STARTED
+
+=head2 Initialization
+
+To create a cache, say something like this:
+
+    use AutoLaTeX::Core::ImageCache;
+
+    my $cache = AutoLaTeX::Core::ImageCache->new('/var/cache/autolatex', 1024*1024*1024) ;
+    my $key = $cache->computeKey('svg2pdf.transdef', 'pdf', 'image.svg', 'image.pdf');
+    if (!$cache->restore($key, 'imgs')) {
+        ...
+        $cache->store($key, 'imgs/image.pdf');
+    }
+
+...or something similar.
+
+=head1 METHOD DESCRIPTIONS
+
+This section contains only the methods in ImageCache.pm itself.
+
+=over
+
+=cut
+package AutoLaTeX::Core::ImageCache;
+
+our @ISA = qw( Exporter );
+our @EXPORT = qw( );
+our @EXPORT_OK = qw();
+
+require 5.014;
+use strict;
+use utf8;
+use vars qw(@ISA @EXPORT @EXPORT_OK $VERSION);
+use Exporter;
+use Carp;
+use File::Spec;
+use File::Basename;
+use File::Path qw(make_path remove_tree);
+use File::Copy;
+use Digest::MD5;
+use AutoLaTeX::Core::Util;
+use AutoLaTeX::Core::IntUtils;
+
+our $VERSION = '1.0';
+
+# Version of the layout of the cache entries, put in the keys
+my $CACHE_FORMAT_VERSION = 1;
+
+#------------------------------------------------------
+#
+# Constructor
+#
+#------------------------------------------------------
+
+sub new($$) : method {
+	my $proto = shift;
+	my $class = ref($proto) || $proto;
+	my $self = {
+		'directory' => File::Spec->rel2abs(shift),
+		'maxSize' => shift || 0,
+	};
+	bless( $self, $class );
+	return $self;
+}
+
+=pod
+
+=item * getDirectory()
+
+Replies the directory of the cache.
+
+=cut
+sub getDirectory() : method {
+	my $self = shift;
+	return $self->{'directory'};
+}
+
+=pod
+
+=item * computeKey($$$$)
+
+Compute the key of the cache entry for the translation of a file.
+
+=over 4
+
+=item B<translatorFile> is the name of the file that contains the definition of the translator.
+
+=item B<mode> is the type of generation, eg. C<pdf> or C<eps>.
+
+=item B<in> is the name of the source file.
+
+=item B<out> is the name of the target file. Only its basename is used, because
+the generated files may refer to each other by their names.
+
+=back
+
+I<Returns:> the key, or undef if one of the files cannot be read.
+
+=cut
+sub computeKey($$$$) : method {
+	my $self = shift;
+	my $translatorFile = shift;
+	my $mode = shift;
+	my $in = shift;
+	my $out = shift;
+	my $md5 = Digest::MD5->new();
+	$md5->add("$CACHE_FORMAT_VERSION\0$mode\0".basename("$out")."\0");
+	foreach my $file ($translatorFile, $in) {
+		local *FILE;
+		open(*FILE, '<', "$file") or return undef;
+		binmode(*FILE);
+		$md5->addfile(*FILE);
+		close(*FILE);
+		$md5->add("\0");
+	}
+	return $md5->hexdigest();
+}
+
+=pod
+
+=item * restore($$)
+
+Restore the files of a cache entry. The files are hard linked when
+it is possible, otherwise they are copied. Their modification dates
+are set to the current date.
+
+=over 4
+
+=item B<key> is the key of the entry.
+
+=item B<directory> is the directory in which the files must be restored.
+
+=back
+
+I<Returns:> the list of the restored files, or an empty list if the entry is not in the cache.
+
+=cut
+sub restore($$) : method {
+	my $self = shift;
+	my $key = shift;
+	my $directory = shift;
+	my $entry = $self->_getEntryDirectory($key);
+	return () unless (-d "$entry");
+	my @names = _readEntry($entry);
+	return () unless (@names);
+	my @restored = ();
+	foreach my $name (@names) {
+		my $source = File::Spec->catfile("$entry", "$name");
+		my $target = File::Spec->catfile("$directory", "$name");
+		unlink("$target");
+		my $linked = link("$source", "$target") && utime(undef, undef, "$target");
+		if (!$linked) {
+			unlink("$target");
+			if (!copy("$source", "$target")) {
+				printDbgFor(3, formatText(_T("Cannot restore {} from the image cache: {}"), $name, $!));
+				unlink(@restored);
+				return ();
+			}
+		}
+		push @restored, "$target";
+	}
+	# Mark the entry as recently used
+	utime(undef, undef, "$entry");
+	if ($self->{'entries'} && $self->{'entries'}{"$entry"}) {
+		$self->{'entries'}{"$entry"}[0] = time;
+	}
+	return @restored;
+}
+
+=pod
+
+=item * store($@)
+
+Store files in the cache, and remove the least recently used
+entries if the cache is too big.
+
+=over 4
+
+=item B<key> is the key of the entry.
+
+=item B<files> are the names of the files to put in the entry.
+
+=back
+
+I<Returns:> true if the files were stored; otherwise false.
+
+=cut
+sub store($@) : method {
+	my $self = shift;
+	my $key = shift;
+	my @files = @_;
+	return 0 unless (@files);
+	my $entry = $self->_getEntryDirectory($key);
+	my $parent = dirname("$entry");
+	# The files are copied in a temporary directory that is renamed when it is
+	# complete, for sharing the cache between concurrent runs of AutoLaTeX
+	my $tmpEntry = "$entry.$$.tmp";
+	eval { make_path("$tmpEntry"); };
+	if (! -d "$tmpEntry") {
+		printDbgFor(3, formatText(_T("Cannot create the image cache entry {}"), $tmpEntry));
+		return 0;
+	}
+	foreach my $file (@files) {
+		if (!copy("$file", File::Spec->catfile("$tmpEntry", basename("$file")))) {
+			printDbgFor(3, formatText(_T("Cannot store {} in the image cache: {}"), basename($file), $!));
+			remove_tree("$tmpEntry");
+			return 0;
+		}
+	}
+	my $stored = (! -d "$entry" && rename("$tmpEntry", "$entry"));
+	remove_tree("$tmpEntry") unless ($stored);
+	if ($self->{'maxSize'}>0) {
+		# The cache directory is read once, the sizes of the
+		# next entries are added to the total size
+		if (!$self->{'entries'}) {
+			$self->_readEntries();
+		}
+		elsif ($stored) {
+			my $size = _getEntrySize("$entry");
+			$self->{'entries'}{"$entry"} = [ time, $size ];
+			$self->{'size'} += $size;
+		}
+		$self->_evict() if ($self->{'size'}>$self->{'maxSize'});
+	}
+	return 1;
+}
+
+# Replies the directory of a cache entry.
+# Parameters:
+# $_[0] = the key of the entry.
+sub _getEntryDirectory($) : method {
+	my $self = shift;
+	my $key = shift;
+	return File::Spec->catfile($self->{'directory'}, substr("$key", 0, 2), "$key");
+}
+
+# Replies the names of the files in a cache entry.
+# Parameters:
+# $_[0] = the directory of the entry.
+sub _readEntry($) {
+	my $entry = shift;
+	my @names = ();
+	local *DIR;
+	if (opendir(*DIR, "$entry")) {
+		while (my $name = readdir(*DIR)) {
+			push @names, "$name" if (-f File::Spec->catfile("$entry", "$name"));
+		}
+		closedir(*DIR);
+	}
+	return @names;
+}
+
+# Replies the size of the files in a cache entry.
+# Parameters:
+# $_[0] = the directory of the entry.
+sub _getEntrySize($) {
+	my $entry = shift;
+	my $size = 0;
+	foreach my $name (_readEntry($entry)) {
+		$size += (-s File::Spec->catfile("$entry", "$name")) || 0;
+	}
+	return $size;
+}
+
+# Read the dates and the sizes of all the entries of the cache.
+sub _readEntries() : method {
+	my $self = shift;
+	$self->{'entries'} = {};
+	$self->{'size'} = 0;
+	local *DIR;
+	opendir(*DIR, $self->{'directory'}) or return;
+	my @buckets = grep { /^[0-9a-f]{2}$/ } readdir(*DIR);
+	closedir(*DIR);
+	foreach my $bucket (@buckets) {
+		my $bucketDir = File::Spec->catfile($self->{'directory'}, "$bucket");
+		opendir(*DIR, "$bucketDir") or next;
+		my @keys = grep { /^[0-9a-f]{32}$/ } readdir(*DIR);
+		closedir(*DIR);
+		foreach my $key (@keys) {
+			my $entry = File::Spec->catfile("$bucketDir", "$key");
+			my $size = _getEntrySize("$entry");
+			$self->{'entries'}{"$entry"} = [ (stat("$entry"))[9] || 0, $size ];
+			$self->{'size'} += $size;
+		}
+	}
+}
+
+# Remove the least recently used entries until the size of the
+# cache is lower than the maximal size.
+sub _evict() : method {
+	my $self = shift;
+	my $entries = $self->{'entries'};
+	foreach my $entry (sort { $entries->{$a}[0] <=> $entries->{$b}[0] } keys %{$entries}) {
+		last if ($self->{'size'}<=$self->{'maxSize'});
+		printDbgFor(4, formatText(_T("Removing {} from the image cache"), basename($entry)));
+		remove_tree("$entry");
+		$self->{'size'} -= $entries->{$entry}[1];
+		delete $entries->{$entry};
+	}
+}
+
+1;
+__END__
+=back
+
+=head1 BUG REPORT AND FEEDBACK
+
+To report bug, provide feedback, suggest new features, etc. visit the AutoLaTeX Project management page at <http://www.arakhne.org/autolatex/> or send email to the author at L<galland@arakhne.org>.
+
+=head1 LICENSE
+
+S<GNU Public License (GPL)>
+
+=head1 COPYRIGHT
+
+S<Copyright (c) 2013 Stéphane Galland E<lt>galland@arakhne.orgE<gt>>
+
+=head1 SEE ALSO
+
+L<autolatex-dev>
@@ -69,6 +69,7 @@ sub analyzeCommandLineOptions(\%) {
 
 		'auto!' => sub { $cfg->{'generation.generate images'} = ($_[1] ? 'yes' : 'no'); },
 		'asyncview!' => sub { $cfg->{'viewer.asynchronous run'} = ($_[1] ? 'yes' : 'no'); },
+		'imgcache=s' => sub { $cfg->{'generation.image cache'} = $_[1]; },
 		'imgdirectory=s' => sub { $cfg->{'generation.image directory'} = $_[1]; },
 
 		'continuous:i' => sub {
@@ -98,6 +99,8 @@ sub analyzeCommandLineOptions(\%) {
 				push @{$realcfg->{'__private__'}{'action.input directories'}}, $_[1];
 			},
 
+		'draftmode!' => sub { $cfg->{'generation.draft mode'} = ($_[1] ? 'yes' : 'no'); },
+
 		'dvi' => sub { 
 				$cfg->{'generation.generation type'} = 'dvi';
 			},
@@ -192,8 +195,12 @@ sub analyzeCommandLineOptions(\%) {
 				$cfg->{'generation.generation type'} = 'ps';
 			},
 
+		'precompiledpreamble!' => sub { $cfg->{'generation.precompiled preamble'} = ($_[1] ? 'yes' : 'no'); },
+
 		'quiet' => sub { $debugLevel = 0; },
 
+		'refimages!' => sub { $cfg->{'generation.referenced images'} = ($_[1] ? 'yes' : 'no'); },
+
 		'search-project-from=s' => sub { 
 					$realcfg->{'__private__'}{'action.search project from'} = $_[1];
 				},
@@ -236,6 +243,11 @@ sub analyzeCommandLineOptions(\%) {
 					}
 				},
 
+		'worker' => sub {
+				$realcfg->{'__private__'}{'action.worker mode'} = 1;
+				$cfg->{'viewer.asynchronous run'} = 'true';
+			},
+
 		'W' => sub {
 				$realcfg->{'__private__'}{'CLI.warning level'}++;
 			},
@@ -60,6 +60,7 @@ use utf8;
 use vars qw(@ISA @EXPORT @EXPORT_OK $VERSION);
 use Exporter;
 use Carp;
+use Time::HiRes qw();
 use AutoLaTeX::Core::IntUtils;
 use AutoLaTeX::Core::Util qw($INTERNAL_MESSAGE_PREFIX);
 
@@ -94,6 +95,8 @@ sub new(;$) : method {
 			'comment-to-display' => '',
 			'previous-message-size' => 0,
 			'carriage-return' => 1,
+			'phase-reporting' => 0,
+			'phases' => [],
 		};
 	}
 	bless( $self, $class );
@@ -156,6 +159,112 @@ sub getCarriageReturn() : method {
 
 =pod
 
+=item * setPhaseReporting($)
+
+Enable or disable the output of the start and end events
+of the phases on the standard output.
+
+=over 4
+
+=item B<enable> is the flag.
+
+=back
+
+=cut
+sub setPhaseReporting($) : method {
+	my $self = shift;
+	my $enable = shift;
+	if ($self->{'parent'}) {
+		$self->{'parent'}->setPhaseReporting($enable);
+	}
+	else {
+		$self->{'phase-reporting'} = $enable;
+	}
+}
+
+=pod
+
+=item * getPhaseReporting()
+
+Replies if the start and end events of the phases are output.
+
+=cut
+sub getPhaseReporting() : method {
+	my $self = shift;
+	if ($self->{'parent'}) {
+		return $self->{'parent'}->getPhaseReporting();
+	}
+	else {
+		return $self->{'phase-reporting'};
+	}
+}
+
+=pod
+
+=item * startPhase($)
+
+Notify the start of a phase of the task, eg. a run of
+the LaTeX compiler. The event is output as the line
+C<[phase:start] name>. The phases may be nested.
+
+=over 4
+
+=item B<name> is the name of the phase.
+
+=back
+
+=cut
+sub startPhase($) : method {
+	my $self = shift;
+	my $name = shift;
+	if ($self->{'parent'}) {
+		$self->{'parent'}->startPhase($name);
+	}
+	else {
+		push @{$self->{'phases'}}, [ $name, Time::HiRes::time() ];
+		$self->_reportPhase("[phase:start] $name");
+	}
+}
+
+=pod
+
+=item * endPhase()
+
+Notify the end of the last started phase. The event is
+output as the line C<[phase:end] duration name>, where
+the duration is given in seconds.
+
+Replies the duration of the phase in seconds.
+
+=cut
+sub endPhase() : method {
+	my $self = shift;
+	if ($self->{'parent'}) {
+		return $self->{'parent'}->endPhase();
+	}
+	my $phase = pop @{$self->{'phases'}};
+	return undef unless ($phase);
+	my $duration = Time::HiRes::time() - $phase->[1];
+	$self->_reportPhase(sprintf("[phase:end] %.3f %s", $duration, $phase->[0]));
+	return $duration;
+}
+
+sub _reportPhase($) : method {
+	my $self = shift;
+	my $message = shift;
+	if ($self->{'phase-reporting'}) {
+		# Do not overwrite the progress bar
+		if ($self->{'carriage-return'} && $self->{'previous-message-size'}>0) {
+			$message = "\n$message";
+			$self->{'previous-message-size'} = 0;
+		}
+		print STDOUT "$message\n";
+		$INTERNAL_MESSAGE_PREFIX = "\n";
+	}
+}
+
+=pod
+
 =item * setBarWidth($)
 
 Set the number of characters for rendering the progress bar.
@@ -55,11 +55,13 @@ use File::Spec;
 use File::Basename;
 use File::Path qw(make_path remove_tree);
 use File::Copy;
+use Time::HiRes qw();
 
 use AutoLaTeX::Core::Util;
 use AutoLaTeX::Core::Config;
 use AutoLaTeX::Core::IntUtils;
 use AutoLaTeX::Core::OS;
+use AutoLaTeX::Core::ImageCache;
 
 # Sorted list of the levels
 our @ALL_LEVELS = ('system', 'user', 'project');
@@ -67,6 +69,16 @@ our @ALL_LEVELS = ('system', 'user', 'project');
 # Data for the translators
 my %ROOT_TRANSLATORS = ();
 
+# Default maximal size of the cache of the translated images, in megabytes
+my $DEFAULT_IMAGE_CACHE_SIZE = 1024;
+
+# Cache of the translated images
+my $IMAGE_CACHE = undef;
+
+# Index of the names of the files in the output directories of the translators:
+# directory => { 'stamp' => stamp of the directory, 'prefixes' => { basename => [ filenames ] } }
+my %OUTPUT_DIRECTORY_INDEX = ();
+
 =pod
 
 =item * extractTranslatorNameComponents($)
@@ -733,27 +745,7 @@ sub runRootTranslator(\%$$\%$) {
 	my $translators = shift || confess("translators are mandatory");
 	my $force = shift;
 
-	my $out = undef;
-	my @transexts = sort {
-				my $la = length($a);
-				my $lb = length($b);
-				my $c = $lb <=> $la;
-				if ($c) {
-					($c);
-				}
-				else {
-					($a cmp $b);
-				}
-			}
-			@{$translators->{"$transname"}{'transdef'}{'INPUT_EXTENSIONS'}{'value'}};
-	my $i = 0;
-	while (($i<@transexts) && (!$out)) {
-		if ($in =~ /^(.+)\Q$transexts[$i]\E$/i) {
-			$out = "$1";
-		}
-		$i++;
-	}
-	$out = "$in" unless ($out);
+	my $out = _getTargetBasename($translators, $transname, $in);
 	$out .= $translators->{"$transname"}{'transdef'}{'OUTPUT_EXTENSIONS'}{'value'}[0] || '';
 
 	$ROOT_TRANSLATORS{'configuration'} = $configuration;
@@ -762,6 +754,18 @@ sub runRootTranslator(\%$$\%$) {
 	$ROOT_TRANSLATORS{'loglevel'} = 1;
 	$ROOT_TRANSLATORS{'fail-on-error'} = 1;
 
+	my $cache = _getImageCache($configuration);
+	if ($cache) {
+		return _runCachedTranslator(
+			$cache,
+			$configuration,
+			$translators,
+			$transname,
+			$in,
+			$out,
+			$force);
+	}
+
 	return _runTranslator(
 		$configuration,
 		$translators,
@@ -862,38 +866,8 @@ sub _runTranslator($$$$$$$$) {
 	}
 
 	# Try to avoid the translation if the source file is no more recent than the target file.
-	if (!$force) {
-		my $inChange = lastFileChange("$in");
-		my $outChange = lastFileChange("$out");
-		if (!defined($outChange)) {
-			# No out file, try to detect other types of generated files
-			local *DIR;
-			my $dirname = dirname("$out");
-			if (opendir(*DIR, "$dirname")) {
-				my $fn;
-				my $ext = $translators->{"$transname"}{'transdef'}{'OUTPUT_EXTENSIONS'}{'value'}[0] || '';
-				my $bn = basename($out, $ext);
-				while (!defined($outChange) && ($fn = readdir(*DIR))) {
-					if (!isIgnorableDirectory($fn)
-							&& $fn =~ /^(\Q${bn}_\E.*)\Q$ext\E$/s) {
-						my $ffn = File::Spec->catfile("$dirname", "$fn");
-						my $t = lastFileChange("$ffn");
-						if (defined($t) && (!defined($outChange) || $t<$outChange)) {
-							$outChange = $t;
-						}
-					}
-				}
-				closedir(*DIR);
-			}
-		}
-
-		if (defined($outChange) && $inChange<$outChange) {
-			# No need to translate again
-			printDbgFor(2, formatText(_T("{} is up-to-date."), basename($out)));
-			return 1;
-		} else {
-			printDbgFor(3, formatText(_T("in={}; out={}."), $outChange, $inChange));
-		}
+	if (!$force && _isTranslationUpToDate($translators, $transname, $in, $out)) {
+		return 1;
 	}
 
 	if ($logLevel) {
@@ -1024,6 +998,10 @@ sub _runTranslator($$$$$$$$) {
 			$wrapper->define_global_variable('_outbasename', $outbasename);
 			$wrapper->define_global_variable('_outwoext', $outwoext);
 
+			if (cfgBoolean($configuration->{'generation.interpreter workers'})) {
+				$wrapper->enable_worker($transname);
+			}
+
 			my $code = $translators->{"$transname"}{'transdef'}{'TRANSLATOR_FUNCTION'}{'value'} || '';
 			$wrapper->run($code);
 		}
@@ -1042,6 +1020,273 @@ sub _runTranslator($$$$$$$$) {
 	return 1;
 }
 
+# Replies the name of the target file of a translation, without its extension.
+# Parameters:
+# $_[0] = the definitions of all the translators.
+# $_[1] = the name of the translator.
+# $_[2] = the name of the source file.
+# Result: the name of the source file without its input extension.
+sub _getTargetBasename($$$) {
+	my $translators = shift;
+	my $transname = shift;
+	my $in = shift;
+	my @transexts = sort {
+				my $la = length($a);
+				my $lb = length($b);
+				my $c = $lb <=> $la;
+				if ($c) {
+					($c);
+				}
+				else {
+					($a cmp $b);
+				}
+			}
+			@{$translators->{"$transname"}{'transdef'}{'INPUT_EXTENSIONS'}{'value'} || []};
+	foreach my $ext (@transexts) {
+		if ($in =~ /^(.+)\Q$ext\E$/i) {
+			return "$1";
+		}
+	}
+	return "$in";
+}
+
+# Replies if the target file of a translation is more recent than the source file.
+# Parameters:
+# $_[0] = the definitions of all the translators.
+# $_[1] = the name of the translator.
+# $_[2] = the absolute name of the source file.
+# $_[3] = the absolute name of the target file.
+# Result: true if the translation is not needed; otherwise false.
+sub _isTranslationUpToDate($$$$) {
+	my $translators = shift;
+	my $transname = shift;
+	my $in = shift;
+	my $out = shift;
+	my $inChange = lastFileChange("$in");
+	my $outChange = lastFileChange("$out");
+	if (!defined($outChange)) {
+		# No out file, try to detect other types of generated files
+		my $dirname = dirname("$out");
+		my $ext = $translators->{"$transname"}{'transdef'}{'OUTPUT_EXTENSIONS'}{'value'}[0] || '';
+		my $bn = basename($out, $ext);
+		foreach my $fn (_getIndexedOutputFiles("$dirname", "$bn")) {
+			if ($fn =~ /\Q$ext\E$/s) {
+				my $ffn = File::Spec->catfile("$dirname", "$fn");
+				my $t = lastFileChange("$ffn");
+				if (defined($t) && (!defined($outChange) || $t<$outChange)) {
+					$outChange = $t;
+				}
+			}
+		}
+	}
+
+	if (defined($outChange) && $inChange<$outChange) {
+		# No need to translate again
+		printDbgFor(2, formatText(_T("{} is up-to-date."), basename($out)));
+		return 1;
+	}
+	printDbgFor(3, formatText(_T("in={}; out={}."), $outChange, $inChange));
+	return 0;
+}
+
+# Replies the names of the files in a directory that are starting with
+# a basename followed by an underscore character, eg. the layers of a figure.
+# The names of the files are read once in an index of the directory, which
+# is built again only when the directory has changed.
+# Parameters:
+# $_[0] = the name of the directory.
+# $_[1] = the basename.
+# Result: the list of the names of the files.
+sub _getIndexedOutputFiles($$) {
+	my $dirname = shift;
+	my $bn = shift;
+	my @stats = Time::HiRes::stat("$dirname");
+	return () unless (@stats);
+	my $stamp = join(':', $stats[1], $stats[9]);
+	my $index = $OUTPUT_DIRECTORY_INDEX{"$dirname"};
+	if (!$index || $index->{'stamp'} ne $stamp) {
+		$index = { 'stamp' => $stamp, 'prefixes' => {} };
+		local *DIR;
+		if (opendir(*DIR, "$dirname")) {
+			while (my $fn = readdir(*DIR)) {
+				if (!isIgnorableDirectory($fn)) {
+					# Each underscore character may be the end of a basename
+					my $pos = index($fn, '_');
+					while ($pos>0) {
+						push @{$index->{'prefixes'}{substr($fn, 0, $pos)}}, "$fn";
+						$pos = index($fn, '_', $pos + 1);
+					}
+				}
+			}
+			closedir(*DIR);
+		}
+		$OUTPUT_DIRECTORY_INDEX{"$dirname"} = $index;
+	}
+	return @{$index->{'prefixes'}{"$bn"} || []};
+}
+
+# Replies the cache of the translated images that is configured, if any.
+# Parameters:
+# $_[0] = the configuration.
+# Result: the AutoLaTeX::Core::ImageCache, or undef if the cache is disabled.
+sub _getImageCache($) {
+	my $configuration = shift;
+	my $directory = $configuration->{'generation.image cache'};
+	return undef unless ($directory);
+	if (!$IMAGE_CACHE || $IMAGE_CACHE->getDirectory() ne File::Spec->rel2abs("$directory")) {
+		my $size = $configuration->{'generation.image cache size'};
+		$size = $DEFAULT_IMAGE_CACHE_SIZE unless (defined($size) && $size =~ /^\s*[0-9]+\s*$/);
+		$IMAGE_CACHE = AutoLaTeX::Core::ImageCache->new("$directory", int($size) * 1024 * 1024);
+	}
+	return $IMAGE_CACHE;
+}
+
+# Replies the stamps of the files that are generated by the translation of
+# an image, ie. the target files and the files that are starting with the
+# basename of the target file followed by an underscore character, eg. the
+# layers of a figure. The files that are generated from another image,
+# eg. "arch_v2.pdf" from "arch_v2.svg" when "arch.svg" is translated,
+# are ignored.
+# Parameters:
+# $_[0] = the configuration.
+# $_[1] = the definitions of all the translators.
+# $_[2] = the name of the translator.
+# $_[3] = the absolute name of the source file.
+# $_[4] = the absolute name of the target file.
+# Result: the associative array (filename => stamp).
+sub _getGeneratedFileStamps($$$$$) {
+	my $configuration = shift;
+	my $translators = shift;
+	my $transname = shift;
+	my $in = shift;
+	my $out = shift;
+	my @exts = @{$translators->{"$transname"}{'transdef'}{'OUTPUT_EXTENSIONS'}{'value'} || []};
+	my $bn = basename($out, $exts[0] || '');
+	my $pattern = join('|', map { quotemeta($_) } @exts);
+	my %stamps = ();
+	my $dirname = dirname("$out");
+	my @files = map { "$bn$_" } @exts;
+	foreach my $fn (_getIndexedOutputFiles("$dirname", "$bn")) {
+		if ($fn =~ /^(.*?)(?:$pattern)$/s
+		    && !_isGeneratedFromAnotherImage($configuration, $translators, "$dirname", "$bn", "$1")) {
+			push @files, "$fn";
+		}
+	}
+	foreach my $fn (@files) {
+		my $ffn = File::Spec->catfile("$dirname", "$fn");
+		if ($ffn ne $in) {
+			my @stats = stat("$ffn");
+			$stamps{"$ffn"} = join(':', $stats[1], $stats[3], $stats[7], $stats[9]) if (@stats && -f _);
+		}
+	}
+	return %stamps;
+}
+
+# Replies if a file that is starting with the basename of a target file
+# followed by an underscore character is generated from another image.
+# It is the case when the name of the file, or one of its prefixes that
+# are ending before an underscore character, is the basename of the
+# target file of another image.
+# Parameters:
+# $_[0] = the configuration.
+# $_[1] = the definitions of all the translators.
+# $_[2] = the name of the directory.
+# $_[3] = the basename of the target file.
+# $_[4] = the name of the file, without its extension.
+# Result: true if the file is generated from another image; otherwise false.
+sub _isGeneratedFromAnotherImage($$$$$) {
+	my $configuration = shift;
+	my $translators = shift;
+	my $dirname = shift;
+	my $bn = shift;
+	my $name = shift;
+	my @candidates = ( "$name" );
+	my $pos = index($name, '_', length($bn) + 1);
+	while ($pos>0) {
+		push @candidates, substr($name, 0, $pos);
+		$pos = index($name, '_', $pos + 1);
+	}
+	my $images = $configuration->{'__private__'}{'image targets'};
+	foreach my $candidate (@candidates) {
+		my $template = File::Spec->catfile("$dirname", "$candidate");
+		if ($images) {
+			return 1 if ($images->{"$template"});
+		}
+		else {
+			# The images were not detected, search for the source files
+			foreach my $translator (values %{$translators}) {
+				next unless ($translator->{'transdef'});
+				foreach my $ext (@{$translator->{'transdef'}{'INPUT_EXTENSIONS'}{'value'} || []}) {
+					return 1 if (-f "$template$ext");
+				}
+			}
+		}
+	}
+	return 0;
+}
+
+# Run a root translator with the cache of the translated images.
+# Parameters:
+# $_[0] = the cache.
+# $_[1] = the configuration.
+# $_[2] = the definitions of all the translators.
+# $_[3] = the name of the translator.
+# $_[4] = the name of the source file.
+# $_[5] = the name of the target file.
+# $_[6] = indicates if the translation is forced.
+# Result: the result of the translator.
+sub _runCachedTranslator($$$$$$$) {
+	my $cache = shift;
+	my $configuration = shift;
+	my $translators = shift;
+	my $transname = shift;
+	my $in = File::Spec->rel2abs(shift);
+	my $out = File::Spec->rel2abs(shift);
+	my $force = shift;
+	my $ispdfmode = (($configuration->{'generation.generation type'} || 'pdf') eq 'pdf');
+
+	if (!$force && _isTranslationUpToDate($translators, $transname, $in, $out)) {
+		return 1;
+	}
+
+	my $key = $cache->computeKey(
+			$translators->{"$transname"}{'file'},
+			($ispdfmode ? 'pdf' : 'eps'),
+			$in, $out);
+	if (!$key) {
+		return _runTranslator($configuration, $translators, $transname, $in, $out, $force, 1, 1);
+	}
+
+	if (!$force && $cache->restore($key, dirname("$out"))) {
+		printDbgFor(1, formatText(_T("{} -> {} (from the image cache)"), basename($in), basename($out)));
+		return 1;
+	}
+
+	my %before = _getGeneratedFileStamps($configuration, $translators, $transname, $in, $out);
+	# The generated files that were restored from the cache may be hard links
+	# to the cache entries. They are removed to avoid the translator to write
+	# inside the cache.
+	foreach my $file (keys %before) {
+		my $nlinks = (split(/:/, $before{$file}))[1];
+		if ($nlinks>1) {
+			unlink("$file");
+			delete $before{$file};
+		}
+	}
+
+	my $r = _runTranslator($configuration, $translators, $transname, $in, $out, $force, 1, 1);
+
+	if ($r) {
+		my %after = _getGeneratedFileStamps($configuration, $translators, $transname, $in, $out);
+		my @generated = grep { !$before{$_} || $before{$_} ne $after{$_} } keys %after;
+		if (@generated) {
+			printDbgFor(3, formatText(_T("Storing {} in the image cache"), join(', ', map { basename($_) } @generated)));
+			$cache->store($key, @generated);
+		}
+	}
+	return $r;
+}
+
 
 =pod
 
@@ -1202,6 +1447,7 @@ sub loadTranslatableImageList(\%\%;$) {
 	my $skipManualAssignment = shift;
 	if (!$data->{'imageDatabaseReady'} && exists $configuration->{'generation.image directory'}) {
 		$data->{'numberOfImages'} = 0;
+		$configuration->{'__private__'}{'image targets'} = {};
 		my $separator = getPathListSeparator();
 		# Prepare the configuration entries '*.files to convert'
 		if (!$skipManualAssignment) {
@@ -1218,7 +1464,6 @@ sub loadTranslatableImageList(\%\%;$) {
 			}
 		}
 		# Detect the image from the file system
-		local* DIR;
 		printDbg(formatText(_T("Detecting images inside '{}'"), $configuration->{'generation.image directory'}));
 		my $rawdirs = $configuration->{'generation.image directory'};
 		$rawdirs =~ s/^\s+//s;
@@ -1226,6 +1471,7 @@ sub loadTranslatableImageList(\%\%;$) {
 		if ($rawdirs) {
 			my $separators = getPathListSeparator() || '';
 			my @dirs = split( /[$separators]/is, $rawdirs);
+			# Build the table of the extensions, with the longest extensions first
 			my @imageExtensions = keys %{$data->{'imageDatabase'}};
 			@imageExtensions = sort {
 							my $la = length($a);
@@ -1237,46 +1483,70 @@ sub loadTranslatableImageList(\%\%;$) {
 								($lb - $la);
 							}
 						} @imageExtensions;
+			my %suffixes = ();
+			my @suffixLengths = ();
+			foreach my $ext (@imageExtensions) {
+				my $len = length($ext);
+				if (!exists $suffixes{lc($ext)}) {
+					$suffixes{lc($ext)} = $ext;
+					push @suffixLengths, $len if (!@suffixLengths || $suffixLengths[-1]!=$len);
+				}
+			}
+			my $projectDir = $configuration->{'__private__'}{'input.project directory'};
+			my ($excludedNames, $excludedPaths) = _getExcludedImagePatterns($configuration);
+			my $indexFile = File::Spec->catfile("$projectDir", '.autolatex_images');
+			my %oldIndex = _readImageDirectoryIndex("$indexFile");
+			my %newIndex = ();
+			my $changed = 0;
 			while (@dirs) {
 				my $dir = shift @dirs;
-				$dir = File::Spec->rel2abs($dir, $configuration->{'__private__'}{'input.project directory'});
-				if (opendir(*DIR, "$dir")) {
-					while (my $fn = readdir(*DIR)) {
-						if (!isIgnorableDirectory($fn)) {
-							my $ffn = File::Spec->catfile("$dir", "$fn");
-							if (-d "$ffn") {
-								push @dirs, "$ffn";
-							}
-							else {
-								my $selectedExtension = undef;
-								if (!$skipManualAssignment &&
-								    $configuration->{'__private__'}{'files to convert'}{$ffn}) {
-									my $trans = $configuration->{'__private__'}{'files to convert'}{$ffn};
-									$selectedExtension = "$separator$separator$trans$separator$separator";
-									$data->{'imageDatabase'}{"$selectedExtension"}{'translator'} = $trans;
-									loadTranslator($trans, %{$data->{'translators'}});
-								}
-								if (!$selectedExtension) {
-									for(my $i=0; !$selectedExtension && $i<@imageExtensions; ++$i) {
-										if ($fn =~ /\Q$imageExtensions[$i]\E$/i) {
-											$selectedExtension = $imageExtensions[$i];
-										}
-									}
-								}
-								if ($selectedExtension) {
-									if (!$data->{'imageDatabase'}{"$selectedExtension"}{'files'}) {
-										$data->{'imageDatabase'}{"$selectedExtension"}{'files'} = [];
-									}
-									push @{$data->{'imageDatabase'}{"$selectedExtension"}{'files'}}, "$ffn";
-									$data->{'activatedImageExtensions'}{"$selectedExtension"} = 1;
-									$data->{'numberOfImages'}++;
-								}
+				$dir = File::Spec->rel2abs($dir, $projectDir);
+				next if (exists $newIndex{"$dir"});
+				my $entry = _getImageDirectoryEntry("$dir", $oldIndex{"$dir"});
+				next unless ($entry);
+				$changed = 1 if (!$oldIndex{"$dir"} || $entry != $oldIndex{"$dir"});
+				$newIndex{"$dir"} = $entry;
+				foreach my $fn (@{$entry->{'dirs'}}) {
+					my $ffn = File::Spec->catfile("$dir", "$fn");
+					if (!_isExcludedImage("$fn", "$ffn", $projectDir, $excludedNames, $excludedPaths)) {
+						push @dirs, "$ffn";
+					}
+				}
+				foreach my $fn (@{$entry->{'files'}}) {
+					my $ffn = File::Spec->catfile("$dir", "$fn");
+					next if (_isExcludedImage("$fn", "$ffn", $projectDir, $excludedNames, $excludedPaths));
+					my $selectedExtension = undef;
+					if (!$skipManualAssignment &&
+					    $configuration->{'__private__'}{'files to convert'}{$ffn}) {
+						my $trans = $configuration->{'__private__'}{'files to convert'}{$ffn};
+						$selectedExtension = "$separator$separator$trans$separator$separator";
+						$data->{'imageDatabase'}{"$selectedExtension"}{'translator'} = $trans;
+						loadTranslator($trans, %{$data->{'translators'}});
+					}
+					if (!$selectedExtension) {
+						my $lcfn = lc($fn);
+						my $fnlen = length($lcfn);
+						for(my $i=0; !$selectedExtension && $i<@suffixLengths; ++$i) {
+							if ($suffixLengths[$i]<=$fnlen) {
+								$selectedExtension = $suffixes{substr($lcfn, -$suffixLengths[$i])};
 							}
 						}
 					}
-					closedir(*DIR);
+					if ($selectedExtension) {
+						if (!$data->{'imageDatabase'}{"$selectedExtension"}{'files'}) {
+							$data->{'imageDatabase'}{"$selectedExtension"}{'files'} = [];
+						}
+						push @{$data->{'imageDatabase'}{"$selectedExtension"}{'files'}}, "$ffn";
+						my $trans = $data->{'imageDatabase'}{"$selectedExtension"}{'translator'};
+						$configuration->{'__private__'}{'image targets'}{_getTargetBasename($data->{'translators'}, $trans, "$ffn")} = 1;
+						$data->{'activatedImageExtensions'}{"$selectedExtension"} = 1;
+						$data->{'numberOfImages'}++;
+					}
 				}
 			}
+			if ($changed || grep { !exists $newIndex{$_} } keys %oldIndex) {
+				_writeImageDirectoryIndex("$indexFile", %newIndex);
+			}
 		}
 		if ($data->{'activatedImageExtensions'}) {
 			my @keys = keys %{$data->{'activatedImageExtensions'}};
@@ -1287,6 +1557,139 @@ sub loadTranslatableImageList(\%\%;$) {
 	return undef;
 }
 
+
+# Replies the regular expressions that are matching the excluded images.
+# Parameters:
+# $_[0] = the configuration.
+# Result: the regular expression for the names of the files, and the regular
+#         expression for the paths relative to the project directory.
+sub _getExcludedImagePatterns($) {
+	my $configuration = shift;
+	my $rawpatterns = $configuration->{'generation.excluded images'} || '';
+	my $separator = getPathListSeparator();
+	my (@names, @paths);
+	foreach my $pattern (split(/\s*\Q$separator\E\s*/, trim("$rawpatterns"))) {
+		next unless ($pattern);
+		# The patterns are using the Unix directory separator
+		$pattern =~ s/\/+$//;
+		if ($pattern =~ /\//) {
+			push @paths, shellPatternToRegex($pattern);
+		}
+		else {
+			push @names, shellPatternToRegex($pattern);
+		}
+	}
+	return (
+		(@names ? '^(?:'.join('|', @names).')$' : undef),
+		(@paths ? '^(?:'.join('|', @paths).')$' : undef));
+}
+
+# Replies if a file or a directory is excluded from the search of the images.
+# Parameters:
+# $_[0] = the name of the file.
+# $_[1] = the absolute path of the file.
+# $_[2] = the project directory.
+# $_[3] = the regular expression for the excluded names.
+# $_[4] = the regular expression for the excluded paths.
+# Result: true if the file is excluded; otherwise false.
+sub _isExcludedImage($$$$$) {
+	my ($fn, $ffn, $projectDir, $excludedNames, $excludedPaths) = @_;
+	return 1 if ($excludedNames && $fn =~ /$excludedNames/s);
+	if ($excludedPaths) {
+		my $relpath = join('/', File::Spec->splitdir(File::Spec->abs2rel("$ffn", "$projectDir")));
+		return 1 if ($relpath =~ /$excludedPaths/s);
+	}
+	return 0;
+}
+
+# Replies the list of the files and of the subdirectories of a directory.
+# The directory is read only if it has changed since the given entry was built.
+# Parameters:
+# $_[0] = the absolute path of the directory.
+# $_[1] = the previous entry of the directory, or undef.
+# Result: the entry { 'stamp' => stamp, 'dirs' => [ names ], 'files' => [ names ] },
+#         or undef if the directory cannot be read.
+sub _getImageDirectoryEntry($$) {
+	my $dir = shift;
+	my $oldEntry = shift;
+	my @stats = Time::HiRes::stat("$dir");
+	return undef unless (@stats && -d _);
+	my $stamp = join(':', $stats[1], $stats[9]);
+	return $oldEntry if ($oldEntry && $oldEntry->{'stamp'} && $oldEntry->{'stamp'} eq $stamp);
+	my $entry = { 'stamp' => $stamp, 'dirs' => [], 'files' => [] };
+	# A directory that has changed recently may change again in the same
+	# time unit of the file system without updating its date
+	$entry->{'stamp'} = '' if (Time::HiRes::time() - $stats[9] < 2);
+	local *DIR;
+	opendir(*DIR, "$dir") or return undef;
+	while (my $fn = readdir(*DIR)) {
+		if (!isIgnorableDirectory($fn)) {
+			if (-d File::Spec->catfile("$dir", "$fn")) {
+				push @{$entry->{'dirs'}}, "$fn";
+			}
+			else {
+				push @{$entry->{'files'}}, "$fn";
+			}
+		}
+	}
+	closedir(*DIR);
+	return $entry;
+}
+
+# Read the index of the image directories that was saved by a previous run.
+# Parameters:
+# $_[0] = the name of the index file.
+# Result: the associative array (directory => entry).
+sub _readImageDirectoryIndex($) {
+	my $indexFile = shift;
+	my %index = ();
+	local *FILE;
+	if (open(*FILE, '<', "$indexFile")) {
+		my $entry = undef;
+		while (my $line = <FILE>) {
+			chomp $line;
+			if ($line =~ /^DIR\(([^)]*)\)\:(.+)$/) {
+				$entry = { 'stamp' => $1, 'dirs' => [], 'files' => [] };
+				$index{"$2"} = $entry;
+			}
+			elsif ($entry && $line =~ /^SUBDIR\:(.+)$/) {
+				push @{$entry->{'dirs'}}, "$1";
+			}
+			elsif ($entry && $line =~ /^FILE\:(.+)$/) {
+				push @{$entry->{'files'}}, "$1";
+			}
+		}
+		close(*FILE);
+	}
+	return %index;
+}
+
+# Save the index of the image directories for the next runs.
+# Parameters:
+# $_[0] = the name of the index file.
+# $_[1..n] = the associative array (directory => entry).
+sub _writeImageDirectoryIndex($%) {
+	my $indexFile = shift;
+	my %index = @_;
+	local *FILE;
+	if (open(*FILE, '>', "$indexFile")) {
+		foreach my $dir (sort keys %index) {
+			my $entry = $index{$dir};
+			print FILE "DIR(".$entry->{'stamp'}."):$dir\n";
+			foreach my $fn (@{$entry->{'dirs'}}) {
+				print FILE "SUBDIR:$fn\n";
+			}
+			foreach my $fn (@{$entry->{'files'}}) {
+				print FILE "FILE:$fn\n";
+			}
+		}
+		close(*FILE);
+	}
+	else {
+		printDbgFor(2, formatText(_T("{}: {}"), $indexFile, $!));
+	}
+}
+
 1;
 __END__
 =back
@@ -52,7 +52,8 @@ our $VERSION = '38.3';
 	      &runCommandSilently &removePathPrefix &trim &trim_ws &formatText
 	      &makeMessage &makeMessageLong &secure_unlink &str2language
 	      &killSubProcesses &toANSI &toUTF8 &redirectToSTDOUT &redirectToSTDERR
-		  &isIgnorableDirectory ) ;
+		  &isIgnorableDirectory &shellPatternToRegex
+	      &runWorkerOrFailFromInput ) ;
 @EXPORT_OK = qw( $INTERNAL_MESSAGE_PREFIX );
 
 require 5.014;
@@ -63,6 +64,8 @@ use vars qw(@ISA @EXPORT @EXPORT_OK $VERSION);
 use File::Spec;
 use File::Path qw(remove_tree);
 use POSIX ":sys_wait_h";
+use IPC::Open2;
+use Cwd;
 use Carp;
 use Data::Dumper;
 
@@ -81,6 +84,9 @@ my $lastListenerCheck = 0;
 # Array of launched subprocesses
 my %launchedSubProcesses = ();
 
+# Long-lived worker processes: name => { 'pid' => pid, 'in' => handle, 'out' => handle, 'marker' => end of script }
+my %workers = ();
+
 
 sub __print(@) {
 	if ($autolatexUseSTDERR) {
@@ -892,22 +898,8 @@ sub runCommandOrFail(@) {
 		my $exitcode = $?;
 		my @stdout = ();
 		if ($kpid>0) {
-			local *LOGFILE;
 			if ($exitcode!=0) {
-				open(*LOGFILE, "< autolatex_exec_stdout.log") or printErr(formatText(_T("{}: {}"), "autolatex_exec_stdout.log", $!));
-				while (my $line = <LOGFILE>) {
-					print STDOUT $INTERNAL_MESSAGE_PREFIX.$line;
-					$INTERNAL_MESSAGE_PREFIX = '';
-				}
-				close(*LOGFILE);
-				open(*LOGFILE, "< autolatex_exec_stderr.log") or printErr(formatText(_T("{}: {}"), "autolatex_exec_stderr.log", $!));
-				while (my $line = <LOGFILE>) {
-					__print($INTERNAL_MESSAGE_PREFIX.$line);
-					$INTERNAL_MESSAGE_PREFIX = '';
-				}
-				close(*LOGFILE);
-				@_ = map { '\''.addSlashes($_).'\''; } @_;
-				confess("\$ ", join(' ', @_));
+				__failWithExecutionLogs(@_);
 			}
 			elsif ($wantstdout) {
 				@stdout = readFileLines("autolatex_exec_stdout.log");
@@ -974,22 +966,8 @@ sub runCommandOrFailFromInput($@) {
 		my $exitcode = $?;
 		my @stdout = ();
 		if ($kpid>0) {
-			local *LOGFILE;
 			if ($exitcode!=0) {
-				open(*LOGFILE, "< autolatex_exec_stdout.log") or printErr(formatText(_T("{}: {}"), "autolatex_exec_stdout.log", $!));
-				while (my $line = <LOGFILE>) {
-					print STDOUT $INTERNAL_MESSAGE_PREFIX.$line;
-					$INTERNAL_MESSAGE_PREFIX = '';
-				}
-				close(*LOGFILE);
-				open(*LOGFILE, "< autolatex_exec_stderr.log") or printErr(formatText(_T("{}: {}"), "autolatex_exec_stderr.log", $!));
-				while (my $line = <LOGFILE>) {
-					__print($INTERNAL_MESSAGE_PREFIX.$line);
-					$INTERNAL_MESSAGE_PREFIX = '';
-				}
-				close(*LOGFILE);
-				@_ = map { '\''.addSlashes($_).'\''; } @_;
-				confess("\$ ", join(' ', @_));
+				__failWithExecutionLogs(@_);
 			}
 			elsif ($wantstdout) {
 				@stdout = readFileLines("autolatex_exec_stdout.log");
@@ -1413,6 +1391,116 @@ sub countLinesIn($) {
 	return $c;
 }
 
+# Output the logs of a system command that has failed, and stop the program.
+# Parameters:
+# $_[0..n] = the command.
+sub __failWithExecutionLogs(@) {
+	local *LOGFILE;
+	open(*LOGFILE, "< autolatex_exec_stdout.log") or printErr(formatText(_T("{}: {}"), "autolatex_exec_stdout.log", $!));
+	while (my $line = <LOGFILE>) {
+		print STDOUT $INTERNAL_MESSAGE_PREFIX.$line;
+		$INTERNAL_MESSAGE_PREFIX = '';
+	}
+	close(*LOGFILE);
+	open(*LOGFILE, "< autolatex_exec_stderr.log") or printErr(formatText(_T("{}: {}"), "autolatex_exec_stderr.log", $!));
+	while (my $line = <LOGFILE>) {
+		__print($INTERNAL_MESSAGE_PREFIX.$line);
+		$INTERNAL_MESSAGE_PREFIX = '';
+	}
+	close(*LOGFILE);
+	@_ = map { '\''.addSlashes($_).'\''; } @_;
+	confess("\$ ", join(' ', @_));
+}
+
+=pod
+
+=item B<runWorkerOrFailFromInput($$@)>
+
+Run a script in a long-lived worker process, block and stop the
+program when the script has failed.
+The worker is launched with the given command the first time, and
+it is reused by the next calls with the same name. The text that
+marks the end of the scripts is added at the end of the command line.
+
+The worker receives on its standard input the current directory,
+the file for the standard output of the script, the file for the
+standard error of the script, and the lines of the script followed by
+the end marker. It must run the script in a new process, so that the
+scripts do not share any state, and reply the exit code of the script
+on a line of its standard output.
+
+=over 4
+
+=item the name of the worker.
+
+=item the script to run.
+
+=item is the command that launches the worker.
+
+=back
+
+I<Returns:> true if the script was run by the worker; false if the
+worker cannot be used, eg. it cannot be launched or it has died.
+
+=cut
+sub runWorkerOrFailFromInput($$@) {
+	my $name = shift;
+	my $input = shift || '';
+	my $worker = $workers{"$name"};
+	if (!$worker) {
+		printDbgFor(4, formatText(_T("Launching the worker {}:\n{}"), $name, join(' ',@_)));
+		my $marker = "AUTOLATEX_END_OF_SCRIPT_${$}_".time();
+		my ($in, $out);
+		my $pid = eval { open2($out, $in, toANSI(@_), $marker); };
+		return 0 unless ($pid);
+		$launchedSubProcesses{$pid} = $pid;
+		$worker = $workers{"$name"} = {
+			'pid' => $pid,
+			'in' => $in,
+			'out' => $out,
+			'marker' => $marker,
+		};
+	}
+	utf8::encode($input) if (utf8::is_utf8($input));
+	local $SIG{'PIPE'} = 'IGNORE';
+	my $handle = $worker->{'in'};
+	my $reply = undef;
+	if (print $handle getcwd()."\n".
+			File::Spec->rel2abs("autolatex_exec_stdout.log")."\n".
+			File::Spec->rel2abs("autolatex_exec_stderr.log")."\n".
+			"$input\n".$worker->{'marker'}."\n") {
+		$handle = $worker->{'out'};
+		$reply = <$handle>;
+	}
+	if (!defined($reply) || $reply !~ /^\s*([0-9]+)\s*$/s) {
+		printDbgFor(4, formatText(_T("The worker {} has died."), $name));
+		__stopWorker($name);
+		return 0;
+	}
+	if ($1!=0) {
+		# The script of the worker is not output
+		__failWithExecutionLogs($_[0]);
+	}
+	unlink("autolatex_exec_stdout.log");
+	unlink("autolatex_exec_stderr.log");
+	return 1;
+}
+
+# Stop a long-lived worker process.
+# Parameters:
+# $_[0] = the name of the worker.
+sub __stopWorker($) {
+	my $name = shift;
+	my $worker = $workers{"$name"};
+	if ($worker) {
+		delete $workers{"$name"};
+		# The worker stops at the end of its standard input
+		close($worker->{'in'});
+		close($worker->{'out'});
+		waitpid($worker->{'pid'}, 0);
+		delete $launchedSubProcesses{$worker->{'pid'}};
+	}
+}
 
 =pod
 
@@ -1424,6 +1512,7 @@ Kill all the subprocesses launched by one of the running functions above.
 sub killSubProcesses() {
 	my @pids = keys %launchedSubProcesses;
 	%launchedSubProcesses = ();
+	%workers = ();
 	kill 9, @pids;
 }
 
@@ -1440,9 +1529,48 @@ sub isIgnorableDirectory($) {
 			|| $file eq ".git" || $file eq ".svn" || $file eq ".cvs";
 }
 
+=pod
+
+=item B<shellPatternToRegex($)>
+
+Convert a shell wildcard pattern (with C<*>, C<?> and C<[...]>)
+to a Perl regular expression.
+Replies an empty string if the pattern is empty.
+
+=cut
+sub shellPatternToRegex($) {
+	return '' unless ($_[0]);
+	my $shell = "$_[0]";
+	my $re = "";
+	while ($shell && $shell =~ /^(.*?)([*?]|(?:\[([^\]]+)\]))(.*)$/) {
+		(my $prev, my $sep, $shell) = ($1,$2,$4);
+		$re .= "\Q$prev\E";
+		if ($sep eq '*') {
+			$re .= '.*';
+		}
+		elsif ($sep eq '?') {
+			$re .= '.';
+		}
+		else {
+			$re .= '['.$3.']';
+		}
+		
+	}
+	if ($shell) {
+		$re .= "\Q$shell\E";
+	}
+	if ($re) {
+		$re = "(?:$re)";
+	}
+	return $re;
+}
+
 
 
 END {
+	foreach my $name (keys %workers) {
+		__stopWorker($name);
+	}
 	waitForSystemCommandTerminaison();
 }
 
@@ -47,6 +47,8 @@ use vars qw(@ISA @EXPORT @EXPORT_OK $VERSION);
 use Exporter;
 use Carp;
 
+use AutoLaTeX::Core::Util;
+
 #------------------------------------------------------
 #
 # Global vars
@@ -105,6 +107,39 @@ sub run($) : method {
 	confess("You must implement the method run().");
 }
 
+=pod
+
+=item * enable_worker($)
+
+Run the code in a long-lived worker process instead of launching a new
+interpreter for each run. The worker is shared by the interpreters of the
+same language that are using the same name, eg. the name of the translator.
+Each code is run by the worker in a new process, so that the runs are still
+isolated. This mode is ignored by the interpreters that provide no worker.
+
+=cut
+sub enable_worker($) : method {
+	my $self = shift;
+	my $name = shift || confess("no worker name");
+	$self->{'worker'} = $name;
+}
+
+# Run a script with the worker of the interpreter if it is enabled,
+# or with a new interpreter otherwise.
+# Parameters:
+# $_[0] = the script.
+# $_[1] = the command that launches the worker, or undef if the interpreter has no worker.
+# $_[2..n] = the command that runs the script given on its standard input.
+sub _run_script($$@) : method {
+	my $self = shift;
+	my $script = shift;
+	my $workerCommand = shift;
+	if ($self->{'worker'} && $workerCommand) {
+		return if (runWorkerOrFailFromInput(ref($self).':'.$self->{'worker'}, $script, @{$workerCommand}));
+	}
+	runCommandOrFailFromInput($script, @_);
+}
+
 
 1;
 __END__
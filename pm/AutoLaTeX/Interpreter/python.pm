@@ -60,6 +60,58 @@ use AutoLaTeX::Core::Util;
 # Version number
 my $VERSION = "1.0" ;
 
+# Worker that runs the Python scripts in forked processes
+my $WORKER = <<'EOS';
+import os, sys, traceback
+marker = sys.argv[1].encode('ascii')
+stdin = getattr(sys.stdin, 'buffer', sys.stdin)
+stdout = getattr(sys.stdout, 'buffer', sys.stdout)
+while True:
+	cwd = stdin.readline()
+	if not cwd:
+		break
+	outlog = stdin.readline().rstrip(b'\n')
+	errlog = stdin.readline().rstrip(b'\n')
+	lines = []
+	while True:
+		line = stdin.readline()
+		if not line or line.rstrip(b'\n') == marker:
+			break
+		lines.append(line)
+	pid = os.fork()
+	if pid == 0:
+		status = 0
+		try:
+			os.chdir(cwd.rstrip(b'\n'))
+			os.dup2(os.open(os.devnull, os.O_RDONLY), 0)
+			os.dup2(os.open(outlog, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644), 1)
+			os.dup2(os.open(errlog, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644), 2)
+			exec(compile(b''.join(lines), '<stdin>', 'exec'), { '__name__': '__main__', '__builtins__': __builtins__ })
+		except SystemExit as e:
+			if e.code is None:
+				status = 0
+			elif isinstance(e.code, int):
+				status = e.code
+			else:
+				sys.stderr.write(str(e.code) + '\n')
+				status = 1
+		except BaseException:
+			traceback.print_exc()
+			status = 1
+		try:
+			sys.stdout.flush()
+			sys.stderr.flush()
+		finally:
+			os._exit(status)
+	status = os.waitpid(pid, 0)[1]
+	if os.WIFEXITED(status):
+		status = os.WEXITSTATUS(status)
+	else:
+		status = 128 + os.WTERMSIG(status)
+	stdout.write(('%d\n' % status).encode('ascii'))
+	stdout.flush()
+EOS
+
 
 =pod
 
@@ -125,7 +177,7 @@ sub run($) : method {
 		$fullcode .= "$name = "._to_python($value)."\n";
 	}
 	$fullcode .= "\n\n\n$code";
-	runCommandOrFailFromInput($fullcode, 'python');
+	$self->_run_script($fullcode, [ 'python', '-c', $WORKER ], 'python');
 }
 
 
@@ -60,6 +60,38 @@ use AutoLaTeX::Core::Util;
 # Version number
 my $VERSION = "1.0" ;
 
+# Worker that runs the Ruby scripts in forked processes. The variables
+# of the worker are local to a lambda, for not being visible from the
+# top-level binding in which the scripts are run.
+my $WORKER = <<'EOS';
+lambda do
+	marker = ARGV.shift
+	$stdin.binmode
+	$stdout.sync = true
+	while (cwd = $stdin.gets)
+		outlog = $stdin.gets.chomp
+		errlog = $stdin.gets.chomp
+		code = ''
+		while (line = $stdin.gets) && line.chomp != marker
+			code << line
+		end
+		# The scripts are encoded in UTF-8, as the scripts given to the interpreter
+		code.force_encoding('UTF-8')
+		pid = fork do
+			Dir.chdir(cwd.chomp)
+			$stdin.reopen(File::NULL)
+			$stdout.reopen(outlog, 'w')
+			$stderr.reopen(errlog, 'w')
+			$stdout.sync = true
+			$stderr.sync = true
+			TOPLEVEL_BINDING.eval(code, '-')
+		end
+		Process.wait(pid)
+		puts($?.exitstatus || 128 + $?.termsig.to_i)
+	end
+end.call
+EOS
+
 
 =pod
 
@@ -125,7 +157,7 @@ sub run($) : method {
 		$fullcode .= "$name = "._to_ruby($value)."\n";
 	}
 	$fullcode .= "\n\n\n$code";
-	runCommandOrFailFromInput($fullcode, 'ruby');
+	$self->_run_script($fullcode, [ 'ruby', '-e', $WORKER ], 'ruby');
 }
 
 
@@ -60,6 +60,29 @@ use AutoLaTeX::Core::Util;
 # Version number
 my $VERSION = "1.0" ;
 
+# Worker that runs the shell scripts in subshells. The variables of the
+# worker are removed before the script is run, as in a new shell.
+my $WORKER = <<'EOS';
+__AUTOLATEX_MARKER="$1"
+while IFS= read -r __AUTOLATEX_CWD && IFS= read -r __AUTOLATEX_OUTLOG && IFS= read -r __AUTOLATEX_ERRLOG
+do
+	__AUTOLATEX_CODE=''
+	while IFS= read -r __AUTOLATEX_LINE && [ "$__AUTOLATEX_LINE" != "$__AUTOLATEX_MARKER" ]
+	do
+		__AUTOLATEX_CODE="$__AUTOLATEX_CODE$__AUTOLATEX_LINE
+"
+	done
+	(
+		set --
+		cd "$__AUTOLATEX_CWD" && exec < /dev/null > "$__AUTOLATEX_OUTLOG" 2> "$__AUTOLATEX_ERRLOG" &&
+		unset BASH_EXECUTION_STRING __AUTOLATEX_MARKER __AUTOLATEX_CWD __AUTOLATEX_OUTLOG __AUTOLATEX_ERRLOG __AUTOLATEX_LINE &&
+		eval "unset __AUTOLATEX_CODE
+$__AUTOLATEX_CODE"
+	)
+	echo "$?"
+done
+EOS
+
 
 =pod
 
@@ -117,7 +140,7 @@ sub run($) : method {
 		$fullcode .= _to_shell($name,$value)."\n";
 	}
 	$fullcode .= "\n\n\n$code";
-	runCommandOrFailFromInput($fullcode, 'bash');
+	$self->_run_script($fullcode, [ 'bash', '-c', $WORKER, 'bash' ], 'bash');
 }
 
 
@@ -68,6 +68,7 @@ use Class::Struct;
 use File::Basename;
 use File::Spec;
 use Carp;
+use Digest::MD5 qw(md5_base64);
 
 use AutoLaTeX::Core::Util;
 use AutoLaTeX::Core::IntUtils;
@@ -81,6 +82,13 @@ use AutoLaTeX::TeX::GlossaryAnalyzer;
 
 our $VERSION = '34.0';
 
+# Extensions of the files that are written by a run of the LaTeX tool
+# and read by the next run. The runs are stopped when they are unchanged.
+my @AUXILIARY_FILE_EXTENSIONS = ( '.aux', '.toc', '.lof', '.lot', '.out', '.nav' );
+
+# Maximal number of runs of the LaTeX tool when the auxiliary files are changing
+my $MAX_NUMBER_OF_LATEX_RUNS = 5;
+
 my $EXTENDED_WARNING_CODE = <<'ENDOFTEX';
 	%*************************************************************
 	% CODE ADDED BY AUTOLATEX TO CHANGE THE OUPUT OF THE WARNINGS
@@ -151,6 +159,8 @@ ENDOFTEX
 my %COMMAND_DEFINITIONS = (
 	'pdflatex' => {
 		'cmd' => 'pdflatex',
+		'draft' => ['-draftmode'],
+		'ini_format' => '&pdflatex',
 		'flags' => ['-halt-on-error', '-interaction', 'batchmode', '-file-line-error'],
 		'to_dvi' => ['-output-format=dvi'],
 		'to_ps' => undef,
@@ -161,6 +171,7 @@ my %COMMAND_DEFINITIONS = (
 	},
 	'latex' => {
 		'cmd' => 'latex',
+		'ini_format' => '&latex',
 		'flags' => ['-halt-on-error', '-interaction', 'batchmode', '-file-line-error'],
 		'to_dvi' => ['-output-format=dvi'],
 		'to_ps' => undef,
@@ -171,6 +182,8 @@ my %COMMAND_DEFINITIONS = (
 	},
 	'xelatex' => {
 		'cmd' => 'xelatex',
+		'draft' => ['-no-pdf'],
+		'ini_format' => '&xelatex',
 		'flags' => ['-halt-on-error', '-interaction', 'batchmode', '-file-line-error'],
 		'to_dvi' => ['-no-pdf'],
 		'to_ps' => undef,
@@ -181,6 +194,7 @@ my %COMMAND_DEFINITIONS = (
 	},
 	'lualatex' => {
 		'cmd' => 'lualatex',
+		'draft' => ['-draftmode'],
 		'flags' => ['-halt-on-error', '-interaction', 'batchmode', '-file-line-error'],
 		'to_dvi' => ['-output-format=dvi'],
 		'to_ps' => undef,
@@ -245,6 +259,8 @@ sub new(\%) : method {
 			'files' => {},
 			'rootFiles' => [],
 			'is_extended_warning_enable' => 0,
+			'is_precompiled_preamble_enable' => 0,
+			'is_draft_mode_enable' => 0,
 			'is_biblio_enable' => 1,
 			'is_makeindex_enable' => 1,
 			'is_makeglossaries_enable' => 1,
@@ -299,6 +315,26 @@ sub new(\%) : method {
 		push @{$self->{'latex_cmd'}}, @params;
 	}
 
+	# Support of the draft mode for the intermediate runs
+	if (cfgBoolean($_[0]->{'generation.draft mode'})) {
+		if (!$_[0]->{'generation.latex_cmd'} && $def->{'draft'}) {
+			$self->{'is_draft_mode_enable'} = 1;
+		}
+		else {
+			printDbgFor(2, formatText(_T("The draft mode is not supported by {}."), $compiler));
+		}
+	}
+
+	# Support of the precompiled preamble
+	if (cfgBoolean($_[0]->{'generation.precompiled preamble'})) {
+		if (!$_[0]->{'generation.latex_cmd'} && $def->{'ini_format'}) {
+			$self->{'is_precompiled_preamble_enable'} = 1;
+		}
+		else {
+			printDbgFor(2, formatText(_T("The preamble cannot be precompiled with {}."), $compiler));
+		}
+	}
+
 	# Change the warning level
 	if (defined($_[0]->{'__private__'}{'CLI.warning level'})) {
 		$self->{'warning_level'} = int($_[0]->{'__private__'}{'CLI.warning level'});
@@ -457,6 +493,26 @@ sub addTeXFile($) : method {
 	return undef;
 }
 
+=pod
+
+=item * getSourceFiles()
+
+Replies the source files that were detected as dependencies
+of the built documents, eg. TeX, style, class and BibTeX files.
+The dependencies are computed by the build functions, eg. build().
+
+=cut
+sub getSourceFiles() : method {
+	my $self = shift;
+	my @sources = ();
+	while (my ($file, $desc) = each(%{$self->{'files'}})) {
+		if ($desc->{'type'} =~ /^(?:tex|sty|cls|bib|bst|bbc|cbx)$/) {
+			push @sources, "$file";
+		}
+	}
+	return @sources;
+}
+
 sub _computeDependenciesForRootFile($) : method {
 	my $self = shift;
 	my $pdfFile = shift;
@@ -677,48 +733,50 @@ Launch pdfLaTeX once time.
 
 =item * C<buffering_warnings> (optional boolean) indicates if the warnings are buffered or not.
 
+=item * C<intermediate> (optional boolean) indicates if the runs are followed by another run of the LaTeX tool, eg. with runFinalLaTeX(). If the draft mode is enabled, the intermediate runs do not produce the output document.
+
 =back
 
 =cut
-sub runLaTeX($;$$) : method {
+sub runLaTeX($;$$$) : method {
 	my $self = shift;
 	my $file = shift;
 	my $linenumber = 0;
 	my $enableLoop = shift;
 	my $buffering_warnings = shift;
+	my $isDraft = (shift && $self->{'is_draft_mode_enable'});
 	if ($self->{'files'}{$file}{'mainFile'}) {
 		$file = $self->{'files'}{$file}{'mainFile'};
 	}
 	my $logFile = File::Spec->catfile(dirname($file), basename($file, '.tex').'.log');
 	my $minNumberOfLaunchs = $self->{'configuration'}{'generation.post compilation runs'} || 1;
+	my $maxNumberOfLaunchs = ($minNumberOfLaunchs > $MAX_NUMBER_OF_LATEX_RUNS) ? $minNumberOfLaunchs : $MAX_NUMBER_OF_LATEX_RUNS;
+	my $auxDigest = ($enableLoop ? _computeAuxiliaryDigest($file) : undef);
 	my $numberOfRuns = 0;
 	my $continueToCompile;
 	do {
-		printDbg(formatText(_T('{}: {}'), 'PDFLATEX', basename($file))); 
+		if ($isDraft) {
+			printDbg(formatText(_T('{}: {} (draft)'), 'PDFLATEX', basename($file))); 
+		}
+		else {
+			printDbg(formatText(_T('{}: {}'), 'PDFLATEX', basename($file))); 
+		}
 		$continueToCompile = 0;
 		$self->{'buffered_warnings'} = [];
 		$self->{'warnings'} = {};
 		unlink($logFile);
-		my $exitcode;
-		if ($self->{'is_extended_warning_enable'}) {
-			local *OUTFILE;
-			open(*OUTFILE, ">autolatex_autogenerated.tex") or printErr("autolatex_ewarnings.tex: $!");
-			my $code = $self->{'latex_warning_code'};
-			$code =~ s/\Q::::REALFILENAME::::\E/$file/sg;
-			print OUTFILE $code."\n";
-			print OUTFILE readFileLines($file);
-			close(*OUTFILE);
-			$exitcode = runCommandSilently(
-				@{$self->{'latex_cmd'}},
-				$self->{'compiler_definition'}{'jobname'},
-				basename($file, '.tex'),
-				'autolatex_autogenerated.tex');
-			unlink('autolatex_autogenerated.tex') if ($exitcode==0);
-		}
-		else {
-			$exitcode = runCommandSilently(@{$self->{'latex_cmd'}},
-				$self->makeRelativePath($file));
+		my $format = $self->_preparePrecompiledPreamble($file);
+		$self->_startPhase(formatText($isDraft ? '{} {} (draft)' : '{} {}', 'latex', basename($file)));
+		my $exitcode = $self->_runLaTeXCommand($file, $format, $isDraft);
+		if ($exitcode!=0 && $format && _isPrecompiledPreambleError($logFile)) {
+			# The format is not usable, eg. the TeX distribution was upgraded
+			printDbg(formatText(_T("{}: Unable to use the precompiled preamble {}"), 'PDFLATEX', $format));
+			$self->_invalidatePrecompiledPreamble($file);
+			unlink($logFile);
+			$exitcode = $self->_runLaTeXCommand($file, undef, $isDraft);
 		}
+		$self->_endPhase();
+		$self->{'is_draft_output'}{$file} = $isDraft;
 		
 		local *LOGFILE;
 
@@ -870,15 +928,25 @@ sub runLaTeX($;$$) : method {
 		}
 		elsif ($enableLoop) {
 			$numberOfRuns ++;
+			# The warnings are not used to decide if a new run is needed
+			$self->_testLaTeXWarningInFile($logFile, 0, 0);
+			my $newAuxDigest = _computeAuxiliaryDigest($file);
 			if ($numberOfRuns < $minNumberOfLaunchs) {
 				# Force a new run of the LaTeX tool.
 				printDbg(formatText(_T('{}: Forcing a new launch to reach {} on {}'), 'PDFLATEX', ($numberOfRuns + 1), $minNumberOfLaunchs)); 
 				$continueToCompile = 1;
 			}
+			elsif ($newAuxDigest eq $auxDigest) {
+				printDbgFor(2, formatText(_T('{}: The auxiliary files of {} are unchanged'), 'PDFLATEX', basename($file)));
+			}
+			elsif ($numberOfRuns >= $maxNumberOfLaunchs) {
+				printDbg(formatText(_T('{}: The auxiliary files of {} are still changing after {} launches'), 'PDFLATEX', basename($file), $numberOfRuns));
+			}
 			else {
-				($continueToCompile,$enableLoop) = $self->_testLaTeXWarningInFile(
-					$logFile,$continueToCompile,$enableLoop);
+				printDbgFor(2, formatText(_T('{}: The auxiliary files of {} have changed'), 'PDFLATEX', basename($file)));
+				$continueToCompile = 1;
 			}
+			$auxDigest = $newAuxDigest;
 		}
 	}
 	while ($continueToCompile);
@@ -893,6 +961,36 @@ sub runLaTeX($;$$) : method {
 	return 0;
 }
 
+=pod
+
+=item * runFinalLaTeX()
+
+Launch pdfLaTeX once time if the last run on the given file
+was done in draft mode, ie. if the output document was not produced.
+
+=over 4
+
+=item * C<file> is the name of the PDF or the TeX file to compile.
+
+=item * C<buffering_warnings> (optional boolean) indicates if the warnings are buffered or not.
+
+=back
+
+=cut
+sub runFinalLaTeX($;$) : method {
+	my $self = shift;
+	my $file = shift;
+	my $buffering_warnings = shift;
+	my $texFile = $file;
+	if ($self->{'files'}{$texFile}{'mainFile'}) {
+		$texFile = $self->{'files'}{$texFile}{'mainFile'};
+	}
+	if ($self->{'is_draft_output'}{$texFile}) {
+		return $self->runLaTeX($file, 0, $buffering_warnings, 0);
+	}
+	return 0;
+}
+
 sub _printWarning($$$$) : method {
 	my $self = shift;
 	my $filename = shift;
@@ -1010,6 +1108,7 @@ Build all the root files.
 sub build(;$) : method {
 	my $self = shift;
 	my $progress = shift;
+	$self->{'progress'} = $progress;
 
 	my $progValue;
 	if ($progress) {
@@ -1032,8 +1131,10 @@ sub build(;$) : method {
 
 		$sprogress->setValue(10) if ($sprogress);
 
-		# Launch at least one LaTeX compilation
-		$self->runLaTeX($rootFile,0,1);
+		# Launch at least one LaTeX compilation.
+		# When the output document does not exist, other
+		# compilations will follow this one.
+		$self->runLaTeX($rootFile,0,1,(! -e "$rootFile"));
 
 		$sprogress->setValue(210) if ($sprogress);
 
@@ -1059,6 +1160,9 @@ sub build(;$) : method {
 			}
 		}
 
+		# Produce the output document if the last LaTeX compilation was a draft
+		$self->runFinalLaTeX($rootFile,1);
+
 		# Output the warnings from the last TeX builds
 		if ($self->{'buffered_warnings'}) {
 			foreach my $w (@{$self->{'buffered_warnings'}}) {
@@ -1086,8 +1190,10 @@ sub build(;$) : method {
 						$sprogress->setComment(formatText(_T("Generating {}"), basename($psFile)));
 					}
 					printDbg(formatText(_T('{}: {}'), 'DVI2PS', basename($dviFile))); 
+					$self->_startPhase(formatText('{} {}', 'dvi2ps', basename($dviFile)));
 					runCommandOrFail(@{$self->{'dvi2ps_cmd'}}, 
 						$self->makeRelativePath($dviFile));
+					$self->_endPhase();
 				}
 			}
 		}
@@ -1171,6 +1277,7 @@ Launch the Biblio only.
 sub buildBiblio(;$) : method {
 	my $self = shift;
 	my $progress = shift;
+	$self->{'progress'} = $progress;
 
 	my $progValue;
 	if ($progress) {
@@ -1251,6 +1358,7 @@ Launch the MakeGlossaries only.
 sub buildMakeGlossaries(;$) : method {
 	my $self = shift;
 	my $progress = shift;
+	$self->{'progress'} = $progress;
 
 	my $progValue;
 	if ($progress) {
@@ -1332,6 +1440,7 @@ Launch the MakeIndex only.
 sub buildMakeIndex(;$) : method {
 	my $self = shift;
 	my $progress = shift;
+	$self->{'progress'} = $progress;
 
 	my $progValue;
 	if ($progress) {
@@ -1397,6 +1506,271 @@ sub buildMakeIndex(;$) : method {
 	return undef;
 }
 
+# Static function that replies a digest of the auxiliary files that
+# are produced by a run of the LaTeX tool on the given file, including
+# the auxiliary files of the included TeX files.
+# Parameter:
+# $_[0] = path to the TeX file.
+# Result: the digest.
+sub _computeAuxiliaryDigest($) {
+	my $file = shift;
+	my $dirname = dirname($file);
+	my $basename = basename($file, '.tex');
+	my @files = map { File::Spec->catfile($dirname, "$basename$_") } @AUXILIARY_FILE_EXTENSIONS;
+	my %treated = ();
+	my $digest = Digest::MD5->new();
+	while (@files) {
+		my $auxFile = shift @files;
+		next if ($treated{$auxFile});
+		$treated{$auxFile} = 1;
+		$digest->add("$auxFile\0");
+		local *FILE;
+		if (open(*FILE, "< $auxFile")) {
+			binmode(*FILE);
+			my $content = do { local $/; <FILE> };
+			close(*FILE);
+			$digest->add($content) if (defined($content));
+			if ($auxFile =~ /\.aux$/) {
+				while ($content =~ /\\\@input\{([^}]+)\}/g) {
+					push @files, File::Spec->rel2abs("$1", $dirname);
+				}
+			}
+		}
+	}
+	return $digest->b64digest();
+}
+
+# Run the LaTeX tool once on the given file.
+# Parameters:
+# $_[0] = path to the TeX file to compile.
+# $_[1] = name of the format of the precompiled preamble, or undef.
+# $_[2] = indicates if the LaTeX tool is run in draft mode.
+# Result: the exit code of the LaTeX tool.
+sub _runLaTeXCommand($$$) : method {
+	my $self = shift;
+	my $file = shift;
+	my $format = shift;
+	my $isDraft = shift;
+	my @cmd = @{$self->{'latex_cmd'}};
+	push @cmd, "-fmt=$format" if ($format);
+	push @cmd, @{$self->{'compiler_definition'}{'draft'}} if ($isDraft);
+	my $exitcode;
+	if ($self->{'is_extended_warning_enable'}) {
+		local *OUTFILE;
+		open(*OUTFILE, ">autolatex_autogenerated.tex") or printErr("autolatex_ewarnings.tex: $!");
+		my $code = $self->{'latex_warning_code'};
+		$code =~ s/\Q::::REALFILENAME::::\E/$file/sg;
+		print OUTFILE $code."\n";
+		print OUTFILE readFileLines($file);
+		close(*OUTFILE);
+		$exitcode = runCommandSilently(
+			@cmd,
+			$self->{'compiler_definition'}{'jobname'},
+			basename($file, '.tex'),
+			'autolatex_autogenerated.tex');
+		unlink('autolatex_autogenerated.tex') if ($exitcode==0);
+	}
+	else {
+		$exitcode = runCommandSilently(@cmd,
+			$self->makeRelativePath($file));
+	}
+	return $exitcode;
+}
+
+# Replies the format that contains the precompiled preamble
+# of the given TeX file. The format is generated with the
+# mylatexformat tool when it does not exist, or when the
+# preamble or one of the files read by the preamble has changed.
+# The format is checked once by instance of the make tool.
+# Parameter:
+# $_[0] = path to the TeX file.
+# Result: the name of the format, or undef if the preamble
+#         is not precompiled.
+sub _preparePrecompiledPreamble($) : method {
+	my $self = shift;
+	my $file = shift;
+	return undef unless ($self->{'is_precompiled_preamble_enable'});
+	if (!exists $self->{'preamble_formats'}{$file}) {
+		$self->{'preamble_formats'}{$file} = $self->_buildPrecompiledPreamble($file);
+	}
+	return $self->{'preamble_formats'}{$file};
+}
+
+# Generate the format of the precompiled preamble if necessary.
+# Parameter:
+# $_[0] = path to the TeX file.
+# Result: the name of the format, or undef if the preamble
+#         cannot be precompiled.
+sub _buildPrecompiledPreamble($) : method {
+	my $self = shift;
+	my $file = shift;
+	my $preamble = _readPreamble($file);
+	return undef unless (defined($preamble));
+	my $formatName = basename($file, '.tex').'_preamble';
+	my $formatFile = File::Spec->catfile(dirname($file), "$formatName.fmt");
+
+	# Test if the format is up-to-date
+	my $stamp = $self->{'stamps'}{'fmt'}{$formatFile};
+	if ($stamp && ($stamp->{'failed'} || -f "$formatFile")) {
+		my $key = _computePreambleKey($preamble, @{$stamp->{'inputs'}});
+		if ($key eq $stamp->{'key'}) {
+			if ($stamp->{'failed'}) {
+				printDbgFor(2, formatText(_T('{}: The preamble of {} cannot be precompiled.'), 'FMT', basename($file)));
+				return undef;
+			}
+			printDbgFor(2, formatText(_T('{} is up-to-date.'), basename($formatFile)));
+			return $formatName;
+		}
+	}
+
+	# Generate the format
+	printDbg(formatText(_T('{}: {}'), 'FMT', basename($formatFile)));
+	unlink("$formatFile");
+	$self->_startPhase(formatText('{} {}', 'fmt', basename($file)));
+	my $exitcode = runCommandSilently(
+			@{$self->{'latex_cmd'}},
+			'-ini', '-recorder',
+			$self->{'compiler_definition'}{'jobname'},
+			$formatName,
+			$self->{'compiler_definition'}{'ini_format'},
+			'mylatexformat.ltx',
+			$self->makeRelativePath($file));
+	$self->_endPhase();
+
+	my @inputs = _readRecordedInputs(File::Spec->catfile(dirname($file), "$formatName.fls"), $file);
+	my $failed = ($exitcode!=0 || ! -f "$formatFile");
+	$self->{'stamps'}{'fmt'}{$formatFile} = {
+		'key' => _computePreambleKey($preamble, @inputs),
+		'inputs' => \@inputs,
+		'failed' => $failed,
+	};
+	if ($failed) {
+		printDbg(formatText(_T('{}: Unable to precompile the preamble of {}. See {} for details.'), 'FMT', basename($file), "$formatName.log"));
+		return undef;
+	}
+	return $formatName;
+}
+
+# Remove the format of the precompiled preamble of the given file.
+# Parameter:
+# $_[0] = path to the TeX file.
+# Result: nothing.
+sub _invalidatePrecompiledPreamble($) : method {
+	my $self = shift;
+	my $file = shift;
+	my $formatFile = File::Spec->catfile(dirname($file), basename($file, '.tex').'_preamble.fmt');
+	unlink("$formatFile");
+	delete $self->{'stamps'}{'fmt'}{$formatFile};
+	$self->{'preamble_formats'}{$file} = undef;
+	return undef;
+}
+
+# Static function that replies the preamble of the given TeX file,
+# ie. the text before \begin{document} or \endofdump.
+# Parameter:
+# $_[0] = path to the TeX file.
+# Result: the text of the preamble, or undef if the document has no body.
+sub _readPreamble($) {
+	my $file = shift;
+	my $preamble = '';
+	local *FILE;
+	open(*FILE, "< $file") or return undef;
+	while (my $line = <FILE>) {
+		if ($line =~ /^((?:[^%\\]|\\.)*?)\\(?:begin\s*\{document\}|endofdump)/) {
+			$preamble .= $1;
+			close(*FILE);
+			return $preamble;
+		}
+		$preamble .= $line;
+	}
+	close(*FILE);
+	return undef;
+}
+
+# Static function that replies the files that were read by the
+# generation of a format, according to the recorder file of TeX.
+# Parameters:
+# $_[0] = path to the recorder file (.fls).
+# $_[1] = path to the TeX file from which the format was generated.
+# Result: the list of the absolute paths of the files.
+sub _readRecordedInputs($$) {
+	my $flsFile = shift;
+	my $texFile = File::Spec->rel2abs(shift);
+	my %inputs = ();
+	local *FILE;
+	if (open(*FILE, "< $flsFile")) {
+		my $pwd = dirname($flsFile);
+		while (my $line = <FILE>) {
+			if ($line =~ /^PWD\s+(.+?)\s*$/) {
+				$pwd = $1;
+			}
+			elsif ($line =~ /^INPUT\s+(.+?)\s*$/) {
+				my $input = File::Spec->rel2abs($1, $pwd);
+				# The main file is represented by its preamble
+				$inputs{$input} = 1 if ($input ne $texFile);
+			}
+		}
+		close(*FILE);
+	}
+	return sort keys %inputs;
+}
+
+# Static function that replies the key of a precompiled preamble.
+# Parameters:
+# $_[0] = text of the preamble.
+# $_[1..n] = paths to the files read by the preamble.
+# Result: the key.
+sub _computePreambleKey($@) {
+	my $preamble = shift;
+	my @data = ( $preamble );
+	foreach my $input (@_) {
+		my @stats = stat("$input");
+		push @data, join(':', $input, ($stats[7]||0), ($stats[9]||0));
+	}
+	return md5_base64(@data);
+}
+
+# Static function that is testing if the log file of a failed
+# LaTeX run is reporting that the format cannot be loaded.
+# Parameter:
+# $_[0] = path to the log file.
+# Result: true if the format is the cause of the failure.
+sub _isPrecompiledPreambleError($) {
+	my $logFile = shift;
+	local *FILE;
+	# TeX does not create the log when the format cannot be loaded
+	open(*FILE, "< $logFile") or return 1;
+	while (my $line = <FILE>) {
+		if ($line =~ /(?:Fatal\s+format\s+file\s+error|---!.*?was\s+written\s+by|can't\s+find\s+the\s+format\s+file)/i) {
+			close(*FILE);
+			return 1;
+		}
+	}
+	close(*FILE);
+	return 0;
+}
+
+# Notify the start of a phase of the building process
+# to the progress indicator, if one was given.
+# Parameters:
+# $_[0] = name of the phase.
+# Result: nothing.
+sub _startPhase($) : method {
+	my $self = shift;
+	my $name = shift;
+	$self->{'progress'}->startPhase($name) if ($self->{'progress'});
+	return undef;
+}
+
+# Notify the end of the last started phase of the building
+# process to the progress indicator, if one was given.
+# Result: nothing.
+sub _endPhase() : method {
+	my $self = shift;
+	$self->{'progress'}->endPhase() if ($self->{'progress'});
+	return undef;
+}
+
 # Read the building stamps.
 # This function puts the stamps in $self->{'stamps'}.
 # Parameter:
@@ -1425,6 +1799,16 @@ sub _readBuildStamps($) : method {
 				my ($k,$n) = ($1,$2);
 				$self->{'stamps'}{'gls'}{$n} = $k;
 			}
+			if ($line =~ /^FMT(ERR)?\(([^)]+?)\)\:(.+)$/) {
+				my ($f,$k,$n) = ($1,$2,$3);
+				$self->{'stamps'}{'fmt'}{$n}{'key'} = $k;
+				$self->{'stamps'}{'fmt'}{$n}{'failed'} = ($f ? 1 : 0);
+				$self->{'stamps'}{'fmt'}{$n}{'inputs'} ||= [];
+			}
+			if ($line =~ /^FMTINPUT\(([^)]+?)\)\:(.+)$/) {
+				my ($n,$i) = ($1,$2);
+				push @{$self->{'stamps'}{'fmt'}{$n}{'inputs'}}, $i;
+			}
 		}
 		close(*FILE);
 	}
@@ -1456,6 +1840,15 @@ sub _writeBuildStamps($) : method {
 			print FILE "GLS($v):$k\n";
 		}
 	}
+	if ($self->{'stamps'}{'fmt'}) {
+		while (my ($k,$v) = each(%{$self->{'stamps'}{'fmt'}})) {
+			my $tag = ($v->{'failed'} ? 'FMTERR' : 'FMT');
+			print FILE "$tag(".$v->{'key'}."):$k\n";
+			foreach my $input (@{$v->{'inputs'}}) {
+				print FILE "FMTINPUT($k):$input\n";
+			}
+		}
+	}
 	close(*FILE);
 }
 
@@ -1651,8 +2044,10 @@ sub __build_bbl($$$) : method {
 			# BIBER
 			####################################
 			printDbg(formatText(_T('{}: {}'), 'BIBER', basename($basename))); 
+			$self->_startPhase(formatText('{} {}', 'biber', basename($basename)));
 			my $retcode = runCommandRedirectToInternalLogs(
 					@{$self->{'biber_cmd'}}, "$basename");
+			$self->_endPhase();
 			# Output the log from the bibliography tool
 			if ($retcode!=0) {
 				printDbg(formatText(_T("{}: Error when processing {}"), 'BIBER', $basename));
@@ -1686,9 +2081,11 @@ sub __build_bbl($$$) : method {
 			####################################
 			my $auxFile = File::Spec->catfile(dirname($file),"$basename.aux");
 			printDbg(formatText(_T('{}: {}'), 'BIBTEX', basename($auxFile))); 
+			$self->_startPhase(formatText('{} {}', 'bibtex', basename($auxFile)));
 			my $retcode = runCommandRedirectToInternalLogs(
 					@{$self->{'bibtex_cmd'}},
 						$self->makeRelativePath("$auxFile"));
+			$self->_endPhase();
 
 			# Output the log from the bibliography tool
 			if ($retcode!=0) {
@@ -1764,8 +2161,10 @@ sub __build_ind($$$) : method {
 				printDbgFor(2, formatText(_T('Style file: {}'), $istFile)); 
 				push @styleArgs, '-s', "$istFile";
 			}
+			$self->_startPhase(formatText('{} {}', 'makeindex', basename($idxFile)));
 			runCommandOrFail(@{$self->{'makeindex_cmd'}}, @styleArgs, 
 				$self->makeRelativePath("$idxFile"));
+			$self->_endPhase();
 		}
 	}
 }
@@ -1785,7 +2184,9 @@ sub __build_gls($$$) : method {
 		my $filename = File::Spec->catfile(dirname($rootFile), basename($rootFile,'.pdf'));
 		$filename = $self->makeRelativePath("$filename");
 		printDbg(formatText(_T('{}: {}'), 'MAKEGLOSSARIES', basename($rootFile))); 
+		$self->_startPhase(formatText('{} {}', 'makeglossaries', basename($rootFile)));
 		runCommandOrFail(@{$self->{'makeglossaries_cmd'}}, "$filename");
+		$self->_endPhase();
 	}
 }
 
@@ -1800,16 +2201,9 @@ sub __build_pdf($$$) : method {
 	my $rootFile = shift;
 	my $file = shift;
 	my $filedesc = shift;
-	my $runs = 2;
-	my $majorFailure = 0;
-	do {
-		$runs--;
-		$self->runLaTeX($file,1,1);
-		$majorFailure = (exists $self->{'warnings'}{'multiple_definition'}) ||
-				(exists $self->{'warnings'}{'undefined_reference'}) ||
-				(exists $self->{'warnings'}{'undefined_citation'});
-	}
-	while ($majorFailure && $runs>0);
+	# The LaTeX tool is run until its auxiliary files are unchanged.
+	# Another run cannot fix the remaining undefined references.
+	$self->runLaTeX($file,1,1,1);
 }
 
 =pod
@@ -39,7 +39,7 @@ package AutoLaTeX::TeX::TeXDependencyAnalyzer;
 
 $VERSION = '7.0';
 @ISA = ('Exporter');
-@EXPORT = qw( &getDependenciesOfTeX ) ;
+@EXPORT = qw( &getDependenciesOfTeX &getPictureReferencesOfTeX ) ;
 @EXPORT_OK = qw();
 
 require 5.014;
@@ -64,6 +64,18 @@ my %MACROS = (
 	'RequirePackage'	=> '![]!{}',
 	'documentclass'		=> '![]!{}',
 	'addbibresource'	=> '![]!{}',
+	'includegraphics'	=> '![]!{}',
+	'includegraphicswtex'	=> '![]!{}',
+	'includefigurewtex'	=> '![]!{}',
+	'includeanimatedfigure'	=> '![]!{}',
+	'includeanimatedfigurewtex'	=> '![]!{}',
+	'graphicspath'		=> '![]!{}',
+	'mfigure'		=> '![]!{}!{}!{}!{}',
+	'mfigure*'		=> '![]!{}!{}!{}!{}',
+	'msubfigure'		=> '![]!{}!{}!{}',
+	'msubfigure*'		=> '![]!{}!{}!{}',
+	'mfiguretex'		=> '![]!{}!{}!{}!{}',
+	'mfiguretex*'		=> '![]!{}!{}!{}!{}',
 	);
 
 =pod
@@ -108,7 +120,7 @@ sub getDependenciesOfTeX($$) {
 
 	my %analysis = ( %{$listener->{'dependencies'}} );
 
-	foreach my $cat ('sty', 'tex') {
+	foreach my $cat ('sty', 'tex', 'img') {
 		if ($analysis{$cat}) {
 			my @t = keys %{$analysis{$cat}};
 			$analysis{$cat} = \@t;
@@ -129,6 +141,81 @@ sub getDependenciesOfTeX($$) {
 	return %analysis;
 }
 
+=pod
+
+=item B<getPictureReferencesOfTeX($$)>
+
+Parse a TeX file and the TeX files that it includes, and detect
+the pictures that are referenced, eg. with C<\includegraphics>,
+C<\includeanimatedfigure> or C<\input>.
+
+=over 4
+
+=item * C<file> is the name of the main TeX file to parse.
+
+=item * C<dir> is the reference directory for the relative path.
+
+=back
+
+I<Returns:> the absolute names of the referenced pictures, without
+a search for their extensions. Each reference is replied for the reference
+directory and for each directory given to C<\graphicspath>.
+
+=cut
+sub getPictureReferencesOfTeX($$) {
+	my $input = shift;
+	my $rootdir = File::Spec->rel2abs(shift);
+	my @files = ( File::Spec->rel2abs($input, $rootdir) );
+	my %parsed = ();
+	my %references = ();
+	my @paths = ( '' );
+	while (@files) {
+		my $file = shift @files;
+		next if ($parsed{$file} || ! -f "$file");
+		$parsed{$file} = 1;
+		my %deps = getDependenciesOfTeX($file, $rootdir);
+		push @files, @{$deps{'tex'}} if ($deps{'tex'});
+		push @paths, @{$deps{'graphicspath'}} if ($deps{'graphicspath'});
+		if ($deps{'img'}) {
+			foreach my $ref (@{$deps{'img'}}) {
+				$references{$ref} = 1;
+			}
+		}
+	}
+	my %pictures = ();
+	foreach my $ref (keys %references) {
+		if (File::Spec->file_name_is_absolute($ref)) {
+			$pictures{File::Spec->canonpath($ref)} = 1;
+		}
+		else {
+			foreach my $path (@paths) {
+				my $dir = File::Spec->rel2abs($path, $rootdir);
+				$pictures{_normalizePath(File::Spec->catfile($dir, $ref))} = 1;
+			}
+		}
+	}
+	my @pictures = keys %pictures;
+	return @pictures;
+}
+
+# Remove the "." and ".." components of a path.
+# Parameters:
+# $_[0] = the absolute path.
+# Result: the normalized path.
+sub _normalizePath($) {
+	my ($volume, $directories, $file) = File::Spec->splitpath(shift);
+	my @components = ();
+	foreach my $component (File::Spec->splitdir($directories)) {
+		if ($component eq File::Spec->updir()) {
+			pop @components if (@components>1);
+		}
+		elsif ($component ne File::Spec->curdir()) {
+			push @components, $component;
+		}
+	}
+	return File::Spec->catpath($volume, File::Spec->catdir(@components), $file);
+}
+
 sub _expandMacro($$@) : method {
 	my $self = shift;
 	my $parser = shift;
@@ -145,9 +232,32 @@ sub _expandMacro($$@) : method {
 				if (-f "$texFile") {
 					$self->{'dependencies'}{'tex'}{$texFile} = 1;
 				}
+				else {
+					# The included file may be generated from a picture, eg. a .pdftex_t file
+					$self->{'dependencies'}{'img'}{$value} = 1;
+				}
 			}
 		}
 	}
+	elsif (	$macro eq '\\includegraphics' || $macro eq '\\includegraphicswtex' ||
+		$macro eq '\\includefigurewtex' || $macro eq '\\includeanimatedfigure' ||
+		$macro eq '\\includeanimatedfigurewtex') {
+		my $value = $_[1]{'text'};
+		$self->{'dependencies'}{'img'}{$value} = 1 if ($value);
+	}
+	elsif (	$macro eq '\\mfigure' || $macro eq '\\mfigure*' ||
+		$macro eq '\\mfiguretex' || $macro eq '\\mfiguretex*' ||
+		$macro eq '\\msubfigure' || $macro eq '\\msubfigure*') {
+		my $value = $_[2]{'text'};
+		$self->{'dependencies'}{'img'}{$value} = 1 if ($value);
+	}
+	elsif ( $macro eq '\\graphicspath' ) {
+		my $t = $_[1]{'text'};
+		while ($t && $t =~ /^\s*(?:(?:\{([^\}]+)\})|([^,]+))\s*[,;]?\s*(.*)$/s) {
+			(my $path, $t) = (($1||$2), $3);
+			push @{$self->{'dependencies'}{'graphicspath'}}, "$path";
+		}
+	}
 	elsif ( $macro eq '\\makeindex' || $macro eq '\\printindex' ) {
 		$self->_addidxreference(@_);
 	}
@@ -365,6 +475,8 @@ sub _new($$) : method {
 				'sty' => {},
 				'cls' => [],
 				'idx' => [],
+				'img' => {},
+				'graphicspath' => [],
 			},
 		};
 	}